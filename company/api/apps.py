@@ -0,0 +1,12 @@
+"""The configuration of the API app."""
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    """Connects the signal handlers keeping the caches of the API in sync."""
+
+    name = "api"
+
+    def ready(self) -> None:  # noqa: D102
+        # Connect the signal handlers.
+        from api import signals  # noqa: F401, PLC0415
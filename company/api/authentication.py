@@ -0,0 +1,266 @@
+"""JWT authentication with the users cached between the requests.
+
+The issued tokens carry the role claims ('employee_id', 'restaurant_id',
+'is_staff'), so the hot write endpoints authorize by the token without
+loading the user ('StatelessJWTAuthentication'). The revoked tokens are
+kept in the cache deny-list until they expire.
+"""
+import datetime
+import time
+import uuid
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_CACHE_KEY = "auth:user:{user_id}:{jti}"
+# Changes when the user or its employee/restaurant changes,
+# the users cached with another generation are stale.
+GENERATION_CACHE_KEY = "auth:user:{user_id}:generation"
+# The deny-list of the revoked tokens.
+REVOKED_TOKEN_CACHE_KEY = "auth:revoked:{jti}"  # noqa: S105
+# The time of the last change of the user or its roles, the role claims
+# of the tokens issued before it are stale.
+CLAIMS_REVOKED_CACHE_KEY = "auth:user:{user_id}:claims_revoked"
+
+ROLE_CLAIMS = ("employee_id", "restaurant_id", "is_staff")
+
+
+def _timeout() -> int:
+    return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60)
+
+
+def _role_access_token_lifetime() -> datetime.timedelta:
+    return getattr(settings, "AUTH_ROLE_ACCESS_TOKEN_LIFETIME",
+                   datetime.timedelta(minutes=5))
+
+
+def _max_token_lifetime() -> int:
+    """Return the seconds the issued tokens are valid at most."""
+    return int(max(api_settings.ACCESS_TOKEN_LIFETIME,
+                   api_settings.REFRESH_TOKEN_LIFETIME).total_seconds())
+
+
+def revoke_token(token: Token) -> None:
+    """Add the token to the deny-list until it expires."""
+    timeout = int(token["exp"] - time.time())
+    if timeout > 0:
+        cache.set(REVOKED_TOKEN_CACHE_KEY.format(jti=token[api_settings.JTI_CLAIM]),
+                  value=True, timeout=timeout)
+
+
+def is_revoked(token: Token) -> bool:
+    """Check whether the token is denied or carries the stale role claims."""
+    key = REVOKED_TOKEN_CACHE_KEY.format(jti=token.get(api_settings.JTI_CLAIM))
+    claims_key = CLAIMS_REVOKED_CACHE_KEY.format(
+        user_id=token.get(api_settings.USER_ID_CLAIM),
+    )
+    cached = cache.get_many([key, claims_key])
+    if cached.get(key):
+        return True
+    revoked_at = cached.get(claims_key)
+    return (revoked_at is not None and has_role_claims(token)
+            and token.get("iat", 0) < revoked_at)
+
+
+def has_role_claims(token: Token) -> bool:
+    """Check whether the token is issued with the role claims."""
+    return all(claim in token for claim in ROLE_CLAIMS)
+
+
+class RoleRefreshToken(RefreshToken):
+    """The refresh token with the role claims of the user.
+
+    The claims are copied to its access tokens, which live for
+    'AUTH_ROLE_ACCESS_TOKEN_LIFETIME' (5 minutes by default): the revocation
+    of the claims reaches only the processes sharing the cache, the short
+    lifetime bounds how long the stale claims are accepted by the rest.
+    """
+
+    @classmethod
+    def for_user(cls, user: AbstractBaseUser) -> "RoleRefreshToken":  # noqa: D102
+        token = super().for_user(user)
+        employee = getattr(user, "employee", None)
+        restaurant = getattr(user, "restaurant", None)
+        token["employee_id"] = employee.id if employee else None
+        token["restaurant_id"] = restaurant.id if restaurant else None
+        token["is_staff"] = user.is_staff
+        return token
+
+    @property
+    def access_token(self) -> AccessToken:  # noqa: D102
+        access = super().access_token
+        access.set_exp(from_time=self.current_time,
+                       lifetime=_role_access_token_lifetime())
+        return access
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issue the tokens with the role claims."""
+
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuse to refresh the revoked tokens and the tokens with stale claims."""
+
+    token_class = RoleRefreshToken
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:  # noqa: D102
+        if is_revoked(self.token_class(attrs["refresh"])):
+            raise InvalidToken(_("Token is revoked"))
+        return super().validate(attrs)
+
+
+class RoleTokenUser(TokenUser):
+    """The user backed by the role claims of the token, no DB lookups."""
+
+    @property
+    def employee_id(self) -> int | None:  # noqa: D102
+        return self.token.get("employee_id")
+
+    @property
+    def restaurant_id(self) -> int | None:  # noqa: D102
+        return self.token.get("restaurant_id")
+
+
+def get_employee_id(user: object) -> int | None:
+    """Return the ID of the employee of the user, 'None' if it's not an employee."""
+    if isinstance(user, RoleTokenUser):
+        return user.employee_id
+    employee = getattr(user, "employee", None)
+    return employee.id if employee else None
+
+
+def get_restaurant_id(user: object) -> int | None:
+    """Return the ID of the restaurant of the user, 'None' if it's not a restaurant."""
+    if isinstance(user, RoleTokenUser):
+        return user.restaurant_id
+    restaurant = getattr(user, "restaurant", None)
+    return restaurant.id if restaurant else None
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """'JWTAuthentication' loading the user with its employee and restaurant.
+
+    The user and its roles are loaded by one query, so the role checks
+    (e.g. 'hasattr(request.user, "employee")') don't query the DB.
+    The user (without the password hash) is cached by its ID and the token
+    'jti' for 'AUTH_USER_CACHE_TIMEOUT' seconds (0 disables the cache),
+    the repeated requests with the same token don't query the DB at all.
+    The revoked tokens are rejected.
+    """
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        """Validate the token and check that it isn't revoked."""
+        token = super().get_validated_token(raw_token)
+        if is_revoked(token):
+            raise InvalidToken(_("Token is revoked"))
+        return token
+
+    def get_user(self, validated_token: Token) -> AbstractBaseUser:
+        """Return the user of the token from the cache or the DB."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"),
+            ) from e
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        timeout = _timeout()
+        if not timeout or jti is None:
+            return self._load_user(user_id, validated_token)
+
+        key = USER_CACHE_KEY.format(user_id=user_id, jti=jti)
+        generation_key = GENERATION_CACHE_KEY.format(user_id=user_id)
+        cached = cache.get_many([key, generation_key])
+        generation = cached.get(generation_key)
+        entry = cached.get(key)
+        if entry is not None and entry["generation"] == generation:
+            return entry["user"]
+
+        user = self._load_user(user_id, validated_token)
+        # The generation is read before the user, so the concurrent change
+        # can't be cached as the current one.
+        cache.set(key, {"user": user, "generation": generation}, timeout=timeout)
+        return user
+
+    def _load_user(self, user_id: object, validated_token: Token) -> AbstractBaseUser:
+        """Load the user with its employee and restaurant, check the token.
+
+        The password hash isn't loaded, so it doesn't get to the cache.
+        """
+        try:
+            user = (
+                self.user_model.objects.select_related("employee", "restaurant")
+                .defer("password")
+                .get(**{api_settings.USER_ID_FIELD: user_id})
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"),
+                                       code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+                != get_md5_hash_password(
+                    self.user_model.objects.filter(pk=user.pk)
+                    .values_list("password", flat=True).get(),
+                )):
+            raise AuthenticationFailed(_("The user's password has been changed."),
+                                       code="password_changed")
+        return user
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    """Authenticate by the role claims of the token without loading the user.
+
+    The user is a 'RoleTokenUser', use 'get_employee_id'/'get_restaurant_id'
+    for the role checks. The tokens without the role claims (issued before
+    the claims were added) fall back to loading the user.
+    """
+
+    def get_user(self, validated_token: Token) -> AbstractBaseUser:
+        """Return the user backed by the token claims."""
+        if has_role_claims(validated_token):
+            return RoleTokenUser(validated_token)  # pyright: ignore[reportReturnType]
+        return super().get_user(validated_token)
+
+
+def user_changed(user_id: int, *, claims_changed: bool = False,
+                 deactivated: bool = False) -> None:
+    """Drop the cached users with the ID once the transaction commits.
+
+    'claims_changed' - the role claims of the tokens issued before the change
+    are revoked. 'deactivated' - the user is deactivated or deleted, its tokens
+    issued within the second of the change are revoked too.
+    """
+    def drop() -> None:
+        # The users cached before the change expire within the timeout,
+        # the generation must outlive them, as the revocation must outlive
+        # the tokens.
+        cache.set(GENERATION_CACHE_KEY.format(user_id=user_id), uuid.uuid4().hex,
+                  timeout=_timeout() or None)
+        if claims_changed or deactivated:
+            # The tokens issued within the second of the change are kept
+            # ('iat' has the precision of seconds), unless the user can't
+            # obtain the new ones anyway.
+            revoked_at = int(time.time()) + deactivated
+            cache.set(CLAIMS_REVOKED_CACHE_KEY.format(user_id=user_id), revoked_at,
+                      timeout=_max_token_lifetime())
+
+    transaction.on_commit(drop)
@@ -0,0 +1,225 @@
+"""Read-only serializers building the representation straight from the DB rows.
+
+They produce the same data as the model serializers from 'api.serializers',
+but skip the fields introspection and the model instances. Used by
+the read endpoints, where serialization dominates the CPU time.
+"""
+from collections.abc import Callable, Iterable, Mapping
+from functools import wraps
+from typing import Any, Self
+
+from django.db.models import Model, QuerySet
+from django.http import Http404
+from rest_framework import serializers, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from base.models import Employee, Menu, MenuItem, Restaurant
+
+# The representation of the dates must match the model serializers,
+# so the formatting is delegated to the DRF fields.
+_date = serializers.DateField().to_representation
+_datetime = serializers.DateTimeField().to_representation
+
+
+class RowSerializer:
+    """Serialize the rows of a queryset into dicts with the given fields.
+
+    The fields are in the same order as in the output of the model
+    serializer, 'formatters' convert the values of the date fields.
+    """
+
+    def __init__(self, model: type[Model], fields: tuple[str, ...],  # noqa: D107
+                 formatters: dict[str, Callable[[Any], Any]] | None = None) -> None:
+        self.model = model
+        self.fields = fields
+        self.formatters = formatters = formatters or {}
+        self._formatters = tuple(
+            (i, formatters[f]) for i, f in enumerate(fields) if f in formatters
+        )
+
+    def to_representation(self, row: tuple) -> dict:
+        """Convert the row from 'values_list' of the fields to a dict."""
+        if not self._formatters:
+            return dict(zip(self.fields, row, strict=True))
+        values = list(row)
+        for i, formatter in self._formatters:
+            if values[i] is not None:
+                values[i] = formatter(values[i])
+        return dict(zip(self.fields, values, strict=True))
+
+    def serialize(self, queryset: QuerySet) -> list[dict]:
+        """Return the representation of the objects of the queryset."""
+        return [self.to_representation(row)
+                for row in queryset.values_list(*self.fields)]
+
+    def get_or_404(self, pk: int) -> dict:
+        """Return the representation of the object, raise Http404 if it's missing."""
+        row = self.model.objects.filter(pk=pk).values_list(*self.fields).first()  # pyright: ignore[reportAttributeAccessIssue]
+        if row is None:
+            msg = f"No {self.model._meta.object_name} matches the given query."  # noqa: SLF001
+            raise Http404(msg)
+        return self.to_representation(row)
+
+    def _subset(self, fields: Iterable[str], prefix: str = "") -> tuple[str, ...]:
+        """Return the given fields and 'id' in the order of the serializer.
+
+        Raise ValueError if some of the fields are unknown.
+        """
+        fields = set(fields)
+        if unknown := fields.difference(self.fields):
+            unknown = ", ".join(repr(prefix + f) for f in sorted(unknown))
+            msg = (f"Unknown fields - {unknown}. "
+                   f"Allowed values are: {', '.join(prefix + f for f in self.fields)}")
+            raise ValueError(msg)
+        return tuple(f for f in self.fields if f == "id" or f in fields)
+
+    def only(self, fields: Iterable[str]) -> Self:
+        """Return the serializer of the subset of the fields, 'id' is always included.
+
+        Only the columns of the fields are selected from the DB.
+        """
+        return type(self)(self.model, self._subset(fields), self.formatters)
+
+    def sparse(self, params: Mapping[str, str]) -> Self | None:
+        """Return the serializer of the fieldset requested by '?fields=a,b'.
+
+        'None' if the fieldset isn't requested, i.e. all the fields are returned.
+        Raise ValueError if some of the fields are unknown.
+        """
+        fields = _split(params.get("fields"))
+        return None if fields is None else self.only(fields)
+
+
+def _split(value: str | None) -> set[str] | None:
+    """Split the comma-separated query parameter, 'None' if it's missing."""
+    if value is None:
+        return None
+    return {f.strip() for f in value.split(",") if f.strip()}
+
+
+employee_serializer = RowSerializer(
+    Employee, ("id", "first_name", "last_name", "date_joined"),
+    {"date_joined": _datetime},
+)
+restaurant_serializer = RowSerializer(
+    Restaurant, ("id", "name", "date_joined"), {"date_joined": _datetime},
+)
+menu_item_serializer = RowSerializer(MenuItem, ("id", "title", "description"))
+
+
+class MenuRowSerializer(RowSerializer):
+    """Serialize the menus with their items loaded by one more query.
+
+    'items' is the serializer of the items, 'None' - the items are omitted.
+    """
+
+    def __init__(self,  # noqa: D107
+                 fields: tuple[str, ...] = ("id", "title", "notes", "launch_date",
+                                            "date_created", "last_modified",
+                                            "restaurant"),
+                 items: RowSerializer | None = menu_item_serializer) -> None:
+        super().__init__(
+            Menu, fields,
+            {"launch_date": _date, "date_created": _datetime,
+             "last_modified": _datetime},
+        )
+        self.items = items
+
+    def serialize(self, queryset: QuerySet) -> list[dict]:
+        """Return the representation of the menus of the queryset."""
+        menus = super().serialize(queryset)
+        if self.items is None:
+            return menus
+        items = self._get_items([m["id"] for m in menus])
+        return [{"id": m["id"], "items": items.get(m["id"], []), **m} for m in menus]
+
+    def get_or_404(self, pk: int) -> dict:
+        """Return the representation of the menu, raise Http404 if it's missing."""
+        menu = super().get_or_404(pk)
+        if self.items is None:
+            return menu
+        return {"id": pk, "items": self._get_items([pk]).get(pk, []), **menu}
+
+    def only(self, fields: Iterable[str],
+             items: RowSerializer | None = None) -> "MenuRowSerializer":
+        """Return the serializer of the subset of the fields, 'id' is always included.
+
+        'items' is the serializer of the items, 'None' - the items are omitted.
+        """
+        return MenuRowSerializer(self._subset(fields), items)
+
+    def sparse(self, params: Mapping[str, str]) -> "MenuRowSerializer | None":
+        """Return the serializer of the fieldset requested by the query parameters.
+
+        '?fields=' lists the fields of the menus and 'items.<field>' the fields
+        of the items, '?expand=items' includes the items with all their fields.
+        With '?fields=' the items are included only if they are requested.
+        'None' if the fieldset isn't requested, i.e. all the fields are returned.
+        Raise ValueError if some of the fields are unknown.
+        """
+        fields = _split(params.get("fields"))
+        expand = _split(params.get("expand")) or set()
+        if unknown := expand - {"items"}:
+            msg = (f"Unknown expand - {', '.join(repr(f) for f in sorted(unknown))}. "
+                   "Allowed values are: items")
+            raise ValueError(msg)
+        if fields is None:
+            return None
+
+        item_fields = {f.removeprefix("items.") for f in fields
+                       if f.startswith("items.")}
+        items = None
+        if item_fields:
+            items = menu_item_serializer.only(
+                menu_item_serializer._subset(item_fields, prefix="items."),  # noqa: SLF001
+            )
+        elif expand or "items" in fields:
+            items = menu_item_serializer
+        menu_fields = {f for f in fields if f != "items" and not f.startswith("items.")}
+        return self.only(menu_fields, items)
+
+    def including(self, *fields: str) -> "MenuRowSerializer":
+        """Return the serializer with the additional fields of the menus."""
+        return MenuRowSerializer().only({*self.fields, *fields}, self.items)
+
+    def _get_items(self, menu_ids: list[int]) -> dict[int, list[dict]]:
+        """Return the items of the menus, the same order as 'Menu.for_read'."""
+        items: dict[int, list[dict]] = {}
+        if not menu_ids or self.items is None:
+            return items
+        rows = (
+            MenuItem.menu.through.objects.filter(menu_id__in=menu_ids)
+            .order_by("menuitem_id")
+            .values_list("menu_id",
+                         *(f"menuitem__{f}" if f != "id" else "menuitem_id"
+                           for f in self.items.fields))
+        )
+        for menu_id, *item in rows:
+            items.setdefault(menu_id, []).append(
+                self.items.to_representation(tuple(item)),
+            )
+        return items
+
+
+menu_serializer = MenuRowSerializer()
+
+
+def with_fieldset(serializer: RowSerializer) -> Callable[..., Callable[..., Response]]:
+    """Pass the serializer of the requested sparse fieldset to the view.
+
+    The view gets it as the 'fieldset' argument ('None' if all the fields are
+    requested), the unknown fields are answered with '400 Bad Request'.
+    """
+    def decorator(view: Callable[..., Response]) -> Callable[..., Response]:
+        @wraps(view)
+        def wrapper(request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: ANN401
+            try:
+                fieldset = serializer.sparse(request.query_params)
+            except ValueError as e:
+                return Response({"details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return view(request, *args, fieldset=fieldset, **kwargs)
+
+        return wrapper
+
+    return decorator
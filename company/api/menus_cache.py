@@ -0,0 +1,88 @@
+"""The cache of the rendered menus of a date."""
+import datetime
+import threading
+import uuid
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_KEY = "menus:{date}:{generation}"
+# Changes when the menus of the date change, the menus cached with another
+# generation are stale (even if they are stored after the change).
+GENERATION_CACHE_KEY = "menus:{date}:generation"
+# How long the menus are cached, the changes made bypassing the signals
+# (e.g. the queryset updates) are picked up after it.
+CACHE_TIMEOUT = 60 * 60
+
+
+class _Counters:
+    """Thread-safe hit/miss counters of the cache in the current process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / (total or 1), 3),
+            }
+
+
+counters = _Counters()
+
+
+def get_cached(date: datetime.date) -> tuple[dict | None, str | None]:
+    """Return the cached response of the menus for the date and its generation.
+
+    The entry is a dict with the rendered 'content' and the 'headers'.
+    The generation is the one to store the response rendered on a miss with.
+    """
+    generation = cache.get(GENERATION_CACHE_KEY.format(date=date))
+    entry = cache.get(CACHE_KEY.format(date=date, generation=generation))
+    if entry is None:
+        counters.miss()
+    else:
+        counters.hit()
+    return entry, generation
+
+
+def store(date: datetime.date, generation: str | None,
+          content: bytes, headers: dict[str, str]) -> None:
+    """Cache the rendered response of the menus for the date."""
+    cache.set(CACHE_KEY.format(date=date, generation=generation),
+              {"content": content, "headers": headers}, timeout=CACHE_TIMEOUT)
+
+
+def menus_changed(dates: Iterable[datetime.date]) -> None:
+    """Drop the cached menus of the given dates once the transaction commits.
+
+    The menus are dropped by the new generations of the dates, so the menus
+    rendered before the change and stored after it aren't served.
+    """
+    dates = set(dates)
+
+    def drop() -> None:
+        # The generation must outlive the menus cached before it.
+        cache.set_many({GENERATION_CACHE_KEY.format(date=date): uuid.uuid4().hex
+                        for date in dates}, timeout=2 * CACHE_TIMEOUT)
+
+    transaction.on_commit(drop)
+
+
+def stats() -> dict:
+    """Return the counters of the cache."""
+    return counters.stats()
@@ -0,0 +1,38 @@
+"""The parsers of the API requests."""
+import codecs
+from collections.abc import Mapping
+from typing import IO, Any
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """JSON parser using 'orjson' if it's installed.
+
+    Like the DRF 'JSONParser' in the strict mode it rejects 'NaN' and 'Infinity'.
+    Falls back to the DRF parser without 'orjson'.
+    """
+
+    def parse(self, stream: IO[bytes], media_type: str | None = None,
+              parser_context: Mapping[str, Any] | None = None) -> Any:  # noqa: ANN401
+        """Parse the incoming JSON bytes."""
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, LookupError) as exc:
+            msg = f"JSON parse error - {exc}"
+            raise ParseError(msg) from exc
@@ -0,0 +1,83 @@
+"""In-process publish/subscribe for notifying the async views.
+
+It doesn't require any external services, so the messages are delivered
+only to the subscribers of the same process.
+"""
+import asyncio
+import contextlib
+import threading
+from collections import defaultdict
+from types import TracebackType
+from typing import Self
+
+
+class Subscription:
+    """A subscription of an asyncio task to a topic.
+
+    Only the fact that something was published is kept,
+    so a burst of messages is coalesced into a single wake up.
+    """
+
+    def __init__(self, hub: "Hub", topic: str) -> None:  # noqa: D107
+        self._hub = hub
+        self._topic = topic
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake up the subscriber, it's safe to call it from any thread."""
+        # The loop can be already closed if the subscriber is gone.
+        with contextlib.suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self) -> None:
+        """Wait for a message.
+
+        Use 'asyncio.timeout' to stop waiting.
+        """
+        await self._event.wait()
+        self._event.clear()
+
+    def close(self) -> None:
+        """Unsubscribe from the topic."""
+        self._hub.unsubscribe(self._topic, self)
+
+    def __enter__(self) -> Self:  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,  # noqa: D105
+                 exc: BaseException | None, tb: TracebackType | None) -> None:
+        self.close()
+
+
+class Hub:
+    """Thread-safe registry of the subscriptions.
+
+    Messages can be published from any thread (e.g. from sync views).
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Subscribe the current asyncio task to the topic."""
+        subscription = Subscription(self, topic)
+        with self._lock:
+            self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, topic: str, subscription: Subscription) -> None:
+        """Remove the subscription from the topic."""
+        with self._lock:
+            self._subscriptions[topic].discard(subscription)
+
+    def publish(self, topic: str) -> None:
+        """Notify all subscribers of the topic."""
+        with self._lock:
+            subscriptions = tuple(self._subscriptions[topic])
+        for subscription in subscriptions:
+            subscription.notify()
+
+
+hub = Hub()
@@ -0,0 +1,42 @@
+"""The renderers of the API responses."""
+from collections.abc import Mapping
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# 'orjson' formats the dates differently, so they are passed to the DRF encoder.
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+                  if orjson else 0)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer using 'orjson' if it's installed.
+
+    The output is the same as of the DRF 'JSONRenderer': compact, not ASCII
+    only and with the dates and the other non JSON types converted by
+    the DRF encoder (the only difference - 'NaN' is rendered as 'null').
+    Falls back to the DRF renderer without 'orjson' or when the indentation
+    or the other output format is requested.
+    """
+
+    def render(self, data: Any, accepted_media_type: str | None = None,  # noqa: ANN401
+               renderer_context: Mapping[str, Any] | None = None) -> bytes:
+        """Render the data into JSON bytes."""
+        if (orjson is None or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        ret = orjson.dumps(data, default=self.encoder_class().default,
+                           option=ORJSON_OPTIONS)
+        # The same as the DRF renderer does for the JavaScript compatibility.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = (ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+                   .replace(b"\xe2\x80\xa9", b"\\u2029"))
+        return ret
@@ -1,11 +1,16 @@
 # ruff: noqa: D100, D101, D102, D106
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db import connections, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from api import menus_cache, snapshots
 from base import models
 
+ITEMS_REQUIRED_MSG = ("'items' is the required parameter. "
+                      "It can't be null or an empty array")
+
 
 class EmployeeSerializer(serializers.ModelSerializer):
     username = serializers.CharField(write_only=True)
@@ -71,7 +76,7 @@ class RestaurantSerializer(serializers.ModelSerializer):
 class MenuItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.MenuItem
-        exclude = ("menu", "restaurant")
+        exclude = ("menu", "restaurant", "last_modified", "search_vector")
 
 
 class MenuSerializer(serializers.ModelSerializer):
@@ -79,39 +84,137 @@ class MenuSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = models.Menu
-        fields = "__all__"
+        exclude = ("snapshot",)
 
     def create(self, validated_data: dict) -> models.Menu:
         menu_items_data = validated_data.pop("items", None)
         if not menu_items_data:
-            err_msg = {
-                "details": ("'items' is the required parameter. "
-                            "It can't be null or an empty array"),
-            }
-            raise ValidationError(detail=err_msg)
+            raise ValidationError(detail={"details": ITEMS_REQUIRED_MSG})
+
+        return create_menus([{**validated_data, "items": menu_items_data}])[0]
 
-        with transaction.atomic():
-            menu = models.Menu.objects.create(**validated_data)
-            for item in menu_items_data:
-                # Check if a menu item exists for the given restaurant.
-                menu_item = models.MenuItem.objects.filter(
-                    title=item["title"], restaurant=validated_data["restaurant"],
-                ).first()
-                if menu_item:
-                    # If received description differs from the existing one,
-                    # then updating the description of the menu item in the DB.
-                    if menu_item.description != item["description"]:
-                        menu_item.description = item["description"]
-                        menu_item.save()
-                    menu.items.add(menu_item)
-                else:
-                    menu.items.create(
-                        restaurant=validated_data["restaurant"],
-                        title=item["title"],
-                        description=item["description"],
-                    )
-        return menu
+
+class BatchMenuSerializer(serializers.Serializer):
+    menus = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    atomic = serializers.BooleanField(default=True)
+
+
+def _insert_links(links: list[tuple[int, int]], *, copy: bool) -> None:
+    """Insert the '(menu_id, menuitem_id)' rows of the menus-items table.
+
+    With 'copy' on PostgreSQL the rows are streamed by 'COPY', which is
+    several times faster than 'INSERT' for the large imports.
+    """
+    through = models.MenuItem.menu.through
+    connection = connections[through.objects.db]
+    if not copy or connection.vendor != "postgresql":
+        through.objects.bulk_create(
+            through(menu_id=menu_id, menuitem_id=item_id) for menu_id, item_id in links
+        )
+        return
+    table = connection.ops.quote_name(through._meta.db_table)  # noqa: SLF001
+    sql = f"COPY {table} (menu_id, menuitem_id) FROM STDIN"
+    with connection.cursor() as cursor, cursor.cursor.copy(sql) as rows:
+        for link in links:
+            rows.write_row(link)
+
+
+def _select_item_ids(keys: list[tuple[int, str]]) -> dict[tuple[int, str], int]:
+    """Return the IDs of the items by their '(restaurant ID, title)'."""
+    wanted = set(keys)
+    return {
+        (restaurant_id, title): item_id
+        for restaurant_id, title, item_id in models.MenuItem.objects.filter(
+            restaurant_id__in={key[0] for key in wanted},
+            title__in={key[1] for key in wanted},
+        ).values_list("restaurant_id", "title", "id")
+        if (restaurant_id, title) in wanted
+    }
+
+
+def create_menus(menus_data: list[dict], *, copy: bool = False) -> list[models.Menu]:
+    """Create the menus with their items using a fixed number of queries.
+
+    The items are unique in a restaurant by the title. The existing ones are
+    reused (their descriptions are updated), the missing ones are created.
+    For the repeated titles the last description wins.
+    The snapshots of the new menus are built, the snapshots of the other menus
+    of the updated items are cleared (they are serialized on read).
+    'copy' - insert the links of the menus and the items by 'COPY'
+    on PostgreSQL (see '_insert_links').
+    """
+    descriptions = {
+        (data["restaurant"].id, item["title"]): item["description"]
+        for data in menus_data for item in data["items"]
+    }
+
+    with transaction.atomic():
+        menus = models.Menu.objects.bulk_create(
+            models.Menu(**{k: v for k, v in data.items() if k != "items"})
+            for data in menus_data
+        )
+        existing = {
+            (menu_item.restaurant_id, menu_item.title): menu_item
+            for menu_item in models.MenuItem.objects.filter(
+                restaurant_id__in={key[0] for key in descriptions},
+                title__in={key[1] for key in descriptions},
+            )
+        }
+        # If received description differs from the existing one,
+        # then updating the description of the menu item in the DB.
+        # 'bulk_update' doesn't touch 'auto_now' fields, so it's set explicitly.
+        now = timezone.now()
+        changed = []
+        for key, menu_item in existing.items():
+            if key in descriptions and menu_item.description != descriptions[key]:
+                menu_item.description = descriptions[key]
+                menu_item.last_modified = now
+                changed.append(menu_item)
+        if changed:
+            models.MenuItem.objects.bulk_update(changed,
+                                                ["description", "last_modified"])
+        item_ids = {key: menu_item.id for key, menu_item in existing.items()}
+        if missing := [key for key in descriptions if key not in existing]:
+            # A concurrent request can create the same items after the lookup,
+            # they are skipped and reused as the existing ones.
+            models.MenuItem.objects.bulk_create(
+                (models.MenuItem(restaurant_id=key[0], title=key[1],
+                                 description=descriptions[key])
+                 for key in missing),
+                ignore_conflicts=True,
+            )
+            item_ids.update(_select_item_ids(missing))
+        _insert_links(
+            [(menu.id, item_id)
+             for menu, data in zip(menus, menus_data, strict=True)
+             for item_id in {item_ids[menu.restaurant_id, item["title"]]
+                             for item in data["items"]}],
+            copy=copy,
+        )
+
+        models.MenuItem.objects.filter(
+            pk__in=[*(menu_item.pk for menu_item in changed),
+                    *(item_ids[key] for key in missing)],
+        ).update_search_vector()
+        # The updated items are shown by the other menus too, any number
+        # of them, so their snapshots are cleared rather than rebuilt here.
+        dates = {menu.launch_date for menu in menus}
+        if changed:
+            stale = models.Menu.objects.filter(items__in=changed)
+            dates.update(stale.values_list("launch_date", flat=True).distinct())
+            stale.update(snapshot=None)
+        snapshots.rebuild(
+            models.Menu.objects.filter(id__in=[menu.id for menu in menus]),
+        )
+        menus_cache.menus_changed(dates)
+    return menus
 
 
 class DoVoteSerializer(serializers.Serializer):
     like = serializers.BooleanField()
+
+
+class BatchVoteSerializer(serializers.Serializer):
+    employee_id = serializers.IntegerField()
+    menu_id = serializers.IntegerField()
+    like = serializers.BooleanField()
@@ -0,0 +1,136 @@
+"""Signal handlers keeping the caches of the API in sync with the models.
+
+The cached menus of a date are dropped when the menus of the date or their
+items change, 'api.serializers.create_menus' drops them itself.
+The cached authenticated users are dropped when the users or their roles change.
+"""
+import datetime
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from api import authentication, menus_cache
+from base.models import Employee, Menu, MenuItem, Restaurant
+
+
+def _launch_dates(menus: QuerySet[Menu]) -> list[datetime.date]:
+    return list(menus.values_list("launch_date", flat=True).distinct())
+
+
+@receiver(pre_save, sender=Menu)
+def remember_previous_launch_date(sender: type[Menu], instance: Menu,
+                                  **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Keep the stored date of the updated menu to drop its cached menus too."""
+    if not instance._state.adding:  # noqa: SLF001
+        instance._previous_launch_date = (  # pyright: ignore[reportAttributeAccessIssue]  # noqa: SLF001
+            sender.objects.filter(pk=instance.pk)
+            .values_list("launch_date", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def drop_cached_menus(sender: type[Menu], instance: Menu,  # noqa: ARG001
+                      **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached menus of the date of the saved or deleted menu."""
+    dates = [instance.launch_date]
+    if (previous := instance.__dict__.pop("_previous_launch_date", None)) is not None:
+        dates.append(previous)
+    menus_cache.menus_changed(dates)
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(pre_delete, sender=MenuItem)
+def drop_item_cached_menus(sender: type[MenuItem], instance: MenuItem,  # noqa: ARG001
+                           **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached menus of the dates the saved or deleted item is shown at."""
+    menus_cache.menus_changed(_launch_dates(Menu.objects.filter(items=instance)))
+
+
+@receiver(m2m_changed, sender=MenuItem.menu.through)
+def drop_linked_cached_menus(sender: type, instance: Menu | MenuItem,  # noqa: ARG001
+                             action: str, pk_set: set[int] | None,
+                             **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached menus of the menus which items were added or removed."""
+    if action == "pre_clear" and isinstance(instance, MenuItem):
+        # The menus of the item are unknown after the clearing.
+        menus_cache.menus_changed(_launch_dates(Menu.objects.filter(items=instance)))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if isinstance(instance, Menu):
+            menus_cache.menus_changed([instance.launch_date])
+        elif pk_set:
+            menus_cache.menus_changed(_launch_dates(Menu.objects.filter(pk__in=pk_set)))
+
+
+# The fields of the user the role claims of its tokens depend on.
+USER_CLAIMS_FIELDS = ("is_active", "is_staff")
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_claims(sender: type[User], instance: User,
+                             update_fields: frozenset[str] | None,
+                             **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Keep the stored claims fields of the updated user to compare after saving."""
+    if instance._state.adding or (  # noqa: SLF001
+            update_fields is not None
+            and update_fields.isdisjoint(USER_CLAIMS_FIELDS)):
+        return
+    instance._previous_claims = (  # pyright: ignore[reportAttributeAccessIssue]  # noqa: SLF001
+        sender.objects.filter(pk=instance.pk)
+        .values_list(*USER_CLAIMS_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def drop_cached_user(sender: type[User], instance: User,  # noqa: ARG001
+                     **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached authenticated user.
+
+    The tokens are revoked only if the user is activated/deactivated
+    or gets/loses the staff status, e.g. the login doesn't revoke them.
+    """
+    previous = instance.__dict__.pop("_previous_claims", None)
+    claims_changed = previous is not None and previous != tuple(
+        getattr(instance, field) for field in USER_CLAIMS_FIELDS
+    )
+    authentication.user_changed(
+        instance.pk, claims_changed=claims_changed,
+        deactivated=claims_changed and not instance.is_active,
+    )
+
+
+@receiver(post_delete, sender=User)
+def drop_deleted_user(sender: type[User], instance: User,  # noqa: ARG001
+                      **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached authenticated user, revoke its tokens."""
+    authentication.user_changed(instance.pk, deactivated=True)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Restaurant)
+def drop_cached_role_user(sender: type[Employee | Restaurant],  # noqa: ARG001
+                          instance: Employee | Restaurant, created: bool,  # noqa: FBT001
+                          **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached authenticated user of the employee or the restaurant.
+
+    The role claims are revoked only when the role is created.
+    """
+    authentication.user_changed(instance.user_id, claims_changed=created)  # pyright: ignore[reportAttributeAccessIssue]
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Restaurant)
+def drop_deleted_role_user(sender: type[Employee | Restaurant],  # noqa: ARG001
+                           instance: Employee | Restaurant,
+                           **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Drop the cached authenticated user of the deleted role, revoke the claims."""
+    authentication.user_changed(instance.user_id, claims_changed=True)  # pyright: ignore[reportAttributeAccessIssue]
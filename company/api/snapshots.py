@@ -0,0 +1,63 @@
+"""The pre-rendered representations of the menus stored in 'Menu.snapshot'.
+
+The snapshot is written when the menu is created. The changes of its items
+(by 'create_menus' for the other menus, or e.g. in the admin) clear
+the snapshots (see 'base.signals'), such menus are serialized on read
+until the snapshots are rebuilt by the 'rebuild_menu_snapshots' command.
+"""
+from django.db.models import QuerySet
+from django.http import Http404
+
+from api.fast_serializers import menu_item_serializer, menu_serializer
+from base.models import Menu
+
+# The keys in the order of the menu serializer output. PostgreSQL 'jsonb'
+# doesn't keep the order of the keys, so it's restored on read.
+MENU_KEYS = ("id", "items", *(f for f in menu_serializer.fields if f != "id"))
+ITEM_KEYS = menu_item_serializer.fields
+
+
+def rebuild(menus: QuerySet[Menu]) -> int:
+    """Store the current representation of the menus in their snapshots.
+
+    Return the number of the rebuilt snapshots.
+    """
+    data = menu_serializer.serialize(menus.order_by())
+    Menu.objects.bulk_update([Menu(id=menu["id"], snapshot=menu) for menu in data],
+                             ["snapshot"])
+    return len(data)
+
+
+def _ordered(snapshot: dict) -> dict:
+    """Restore the order of the keys of the snapshot."""
+    menu = {key: snapshot[key] for key in MENU_KEYS}
+    menu["items"] = [{key: item[key] for key in ITEM_KEYS} for item in menu["items"]]
+    return menu
+
+
+def read(menus: QuerySet[Menu]) -> list[dict]:
+    """Return the representation of the menus from their snapshots.
+
+    It's a single-table read, only the menus without the snapshots
+    are serialized.
+    """
+    rows = list(menus.values_list("id", "snapshot"))
+    missing = [menu_id for menu_id, snapshot in rows if snapshot is None]
+    serialized = {}
+    if missing:
+        serialized = {m["id"]: m for m in menu_serializer.serialize(
+            Menu.objects.filter(id__in=missing),
+        )}
+    return [serialized[menu_id] if snapshot is None else _ordered(snapshot)
+            for menu_id, snapshot in rows]
+
+
+def get_or_404(pk: int) -> dict:
+    """Return the representation of the menu, raise Http404 if it's missing."""
+    rows = Menu.objects.filter(pk=pk).values_list("snapshot", flat=True)[:1]
+    if not rows:
+        msg = "No Menu matches the given query."
+        raise Http404(msg)
+    if rows[0] is None:
+        return menu_serializer.get_or_404(pk)
+    return _ordered(rows[0])
@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.response import Response
 from rest_framework.test import APIClient
@@ -30,6 +31,11 @@ class _JsonAPIClient(APIClient):
         )  # pyright: ignore[reportReturnType]
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
 @pytest.fixture
 def admin(db):
     return User.objects.create_superuser(
@@ -0,0 +1,169 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_403_FORBIDDEN,
+    HTTP_404_NOT_FOUND,
+)
+
+from api.tests.tools import get_jwt_for_user
+from api.views import asynchronous
+from base.models import Vote
+
+
+def call_async(view, path, jwt=None, method="get", headers=None, **kwargs):  # noqa: ANN003
+    headers = dict(headers or {})
+    if jwt:
+        headers["Authorization"] = "Bearer " + jwt["access"]
+    request = getattr(AsyncRequestFactory(), method)(path, headers=headers)
+    return async_to_sync(view)(request, **kwargs)
+
+
+def assert_same_response(sync_resp, async_resp):
+    assert async_resp.status_code == sync_resp.status_code
+    assert async_resp.content == sync_resp.content
+    assert async_resp["Content-Type"] == sync_resp["Content-Type"]
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_menus(client, multiple_menus):
+    menu = multiple_menus[0]
+
+    assert_same_response(
+        client.get(f"/api/menu/{menu.id}/"),
+        call_async(asynchronous.get_menu_by_id, "/", pk=menu.id),
+    )
+    assert_same_response(
+        client.get("/api/menu/2025-10-16/"),
+        call_async(asynchronous.get_menus_by_date, "/",
+                   year=2025, month=10, day=16),
+    )
+    assert_same_response(
+        client.get("/api/menu/2025-13-16/"),
+        call_async(asynchronous.get_menus_by_date, "/",
+                   year=2025, month=13, day=16),
+    )
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+@pytest.mark.parametrize("query", [
+    "?fields=title,items.title",
+    "?expand=items",
+    "?fields=launch_date",
+    "?fields=unknown",
+])
+def test_menus_sparse_fieldset(client, multiple_menus, query):
+    menu = multiple_menus[0]
+
+    assert_same_response(
+        client.get(f"/api/menu/{menu.id}/{query}"),
+        call_async(asynchronous.get_menu_by_id, f"/{query}", pk=menu.id),
+    )
+    assert_same_response(
+        client.get(f"/api/menu/2025-10-16/{query}"),
+        call_async(asynchronous.get_menus_by_date, f"/{query}",
+                   year=2025, month=10, day=16),
+    )
+
+
+def test_restaurant_and_employee_sparse_fieldset(client, admin, employee, restaurant):
+    admin_jwt = get_jwt_for_user(admin)
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + admin_jwt["access"])
+
+    for query in ("?fields=name", "?fields=unknown"):
+        assert_same_response(
+            client.get(f"/api/restaurant/{restaurant.id}/{query}"),
+            call_async(asynchronous.get_restaurant, f"/{query}", pk=restaurant.id),
+        )
+    for query in ("?fields=first_name,last_name", "?fields=unknown"):
+        assert_same_response(
+            client.get(f"/api/employee/{employee.id}/{query}"),
+            call_async(asynchronous.get_employee, f"/{query}", admin_jwt,
+                       pk=employee.id),
+        )
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_menus_conditional_get(client, multiple_menus):
+    menu = multiple_menus[0]
+    views = [
+        (f"/api/menu/{menu.id}/", asynchronous.get_menu_by_id, {"pk": menu.id}),
+        ("/api/menu/2025-10-16/", asynchronous.get_menus_by_date,
+         {"year": 2025, "month": 10, "day": 16}),
+    ]
+
+    for url, view, kwargs in views:
+        sync_resp = client.get(url)
+        resp = call_async(view, "/", **kwargs)
+        not_modified = call_async(view, "/", headers={"If-None-Match": resp["ETag"]},
+                                  **kwargs)
+        not_modified_since = call_async(
+            view, "/", headers={"If-Modified-Since": resp["Last-Modified"]}, **kwargs,
+        )
+
+        assert resp["ETag"] == sync_resp["ETag"]
+        assert resp["Last-Modified"] == sync_resp["Last-Modified"]
+        assert not_modified.status_code == HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+        assert not_modified["ETag"] == resp["ETag"]
+        assert not_modified_since.status_code == HTTP_304_NOT_MODIFIED
+
+
+def test_menu_not_found(client, db):
+    resp = call_async(asynchronous.get_menu_by_id, "/", pk=1000)
+
+    assert resp.status_code == HTTP_404_NOT_FOUND
+    assert_same_response(client.get("/api/menu/1000/"), resp)
+
+
+def test_restaurant(client, restaurant):
+    assert_same_response(
+        client.get(f"/api/restaurant/{restaurant.id}/"),
+        call_async(asynchronous.get_restaurant, "/", pk=restaurant.id),
+    )
+
+
+def test_employee(client, admin, user, employee):
+    url = f"/api/employee/{employee.id}/"
+    admin_jwt = get_jwt_for_user(admin)
+    user_jwt = get_jwt_for_user(user)
+
+    resp_anonymous = call_async(asynchronous.get_employee, url, pk=employee.id)
+    resp_user = call_async(asynchronous.get_employee, url, user_jwt,
+                           pk=employee.id)
+    resp_admin = call_async(asynchronous.get_employee, url, admin_jwt,
+                            pk=employee.id)
+
+    assert resp_anonymous.status_code == HTTP_401_UNAUTHORIZED
+    assert resp_anonymous["WWW-Authenticate"] == 'Bearer realm="api"'
+    assert_same_response(client.get(url), resp_anonymous)
+    assert resp_user.status_code == HTTP_403_FORBIDDEN
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + user_jwt["access"])
+    assert_same_response(client.get(url), resp_user)
+    assert resp_admin.status_code == HTTP_200_OK
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + admin_jwt["access"])
+    assert_same_response(client.get(url), resp_admin)
+
+
+def test_vote_results(client, menu, employee):
+    Vote.objects.create(menu=menu, employee=employee, like=True)
+
+    resp = call_async(asynchronous.get_vote_results, "/")
+
+    assert resp.text == '[{"menu_id":1,"likes":1,"dislikes":0,"result":1}]'
+    assert resp["Age"] == "0"
+    assert_same_response(client.get("/api/vote/results/"), resp)
+    assert_same_response(
+        client.get("/api/vote/results/?ordering=likes"),
+        call_async(asynchronous.get_vote_results, "/?ordering=likes"),
+    )
+
+
+def test_method_not_allowed(client, restaurant):
+    resp = call_async(asynchronous.get_restaurant, "/", method="post",
+                      pk=restaurant.id)
+
+    assert_same_response(client.post(f"/api/restaurant/{restaurant.id}/"), resp)
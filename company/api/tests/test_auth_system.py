@@ -1,7 +1,15 @@
+from datetime import timedelta
+
 import pytest
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 
-from api.tests.tools import get_jwt_for_user
+from api.authentication import USER_CACHE_KEY
+from api.tests.tools import auth_client, de_json, get_jwt_for_user
 
 
 def test_obtaining_tokens(admin, client):
@@ -37,3 +45,152 @@ def test_refresh_token(admin, client):
 
     assert "access" in resp.text
     assert "refresh" not in resp.text
+
+
+def test_authenticated_user_is_cached(admin, employee, client,
+                                      django_assert_num_queries,
+                                      django_capture_on_commit_callbacks):
+    # The token without the role claims, the deactivation doesn't revoke it,
+    # the dropped cached user is checked.
+    client = auth_client(client, {"access": str(AccessToken.for_user(admin))})
+    url = f"/api/employee/{employee.id}/"
+
+    # The user and the employee.
+    with django_assert_num_queries(2):
+        client.get(url)
+    # The user is taken from the cache.
+    with django_assert_num_queries(1):
+        resp = client.get(url)
+
+    assert resp.status_code == status.HTTP_200_OK
+
+    with django_capture_on_commit_callbacks(execute=True):
+        admin.is_active = False
+        admin.save()
+    resp = client.get(url)
+
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    assert de_json(resp.text)["code"] == "user_inactive"
+
+
+def test_cached_user_has_no_password_hash(admin, employee, client, settings):
+    settings.SIMPLE_JWT = settings.SIMPLE_JWT | {"CHECK_REVOKE_TOKEN": True}
+    jwt = get_jwt_for_user(admin)
+    client = auth_client(client, jwt)
+
+    resp = client.get(f"/api/employee/{employee.id}/")
+
+    assert resp.status_code == status.HTTP_200_OK
+    token = AccessToken(jwt["access"])
+    entry = cache.get(USER_CACHE_KEY.format(user_id=admin.id, jti=token["jti"]))
+    assert "password" in entry["user"].get_deferred_fields()
+
+
+def test_role_is_loaded_with_user(user, menu, client, django_assert_num_queries):
+    # The token issued without the role claims.
+    client = auth_client(client, {"access": str(AccessToken.for_user(user))})
+
+    # The user without the employee is rejected without querying the employee.
+    with django_assert_num_queries(1):
+        resp = client.post(f"/api/menu/{menu.id}/vote/", {"like": True})
+
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_obtained_tokens_have_role_claims(employee, restaurant, client):
+    for obj in (employee, restaurant):
+        obj.user.set_password("password")
+        obj.user.save()
+
+    employee_jwt = de_json(client.post("/api/token/", {
+        "username": "employee", "password": "password",
+    }).text)
+    restaurant_jwt = de_json(client.post("/api/token/", {
+        "username": "restaurant_user", "password": "password",
+    }).text)
+    refreshed = de_json(client.post("/api/token/refresh/", {
+        "refresh": employee_jwt["refresh"],
+    }).text)
+
+    claims = ("employee_id", "restaurant_id", "is_staff")
+    assert [AccessToken(employee_jwt["access"])[c] for c in claims] == [
+        employee.id, None, False,
+    ]
+    assert [AccessToken(restaurant_jwt["access"])[c] for c in claims] == [
+        None, restaurant.id, False,
+    ]
+    assert AccessToken(refreshed["access"])["employee_id"] == employee.id
+
+
+def test_vote_without_loading_user(employee, menu, client):
+    client = auth_client(client, get_jwt_for_user(employee))
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post(f"/api/menu/{menu.id}/vote/", {"like": True})
+
+    assert resp.status_code == status.HTTP_200_OK
+    # The employee is taken from the token claims.
+    assert not [q for q in ctx.captured_queries
+                if "auth_user" in q["sql"] or "base_employee" in q["sql"]]
+
+
+def test_revoke_tokens(employee, menu, client):
+    jwt = get_jwt_for_user(employee)
+    client = auth_client(client, jwt)
+
+    resp = client.post("/api/token/revoke/", {"refresh": jwt["refresh"]})
+
+    assert resp.status_code == status.HTTP_204_NO_CONTENT
+    resp = client.post(f"/api/menu/{menu.id}/vote/", {"like": True})
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    resp = client.post("/api/token/refresh/", {"refresh": jwt["refresh"]})
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_role_change_revokes_claims(employee, menu, client, freezer,
+                                    django_capture_on_commit_callbacks):
+    client = auth_client(client, get_jwt_for_user(employee))
+    freezer.tick(1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        employee.delete()
+    resp = client.post(f"/api/menu/{menu.id}/vote/", {"like": True})
+
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    assert de_json(resp.text)["code"] == "token_not_valid"
+
+
+def test_deactivation_revokes_tokens(employee, menu, client, freezer,
+                                     django_capture_on_commit_callbacks):
+    # The token is issued within the same second as the deactivation.
+    client = auth_client(client, get_jwt_for_user(employee))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        employee.user.is_active = False
+        employee.user.save()
+    resp = client.post(f"/api/menu/{menu.id}/vote/", {"like": True})
+
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    assert de_json(resp.text)["code"] == "token_not_valid"
+
+
+def test_login_keeps_tokens(employee, menu, client, freezer,
+                            django_capture_on_commit_callbacks):
+    client = auth_client(client, get_jwt_for_user(employee))
+    freezer.tick(1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        update_last_login(None, employee.user)
+        employee.user.first_name = "Renamed"
+        employee.user.save()
+    resp = client.post(f"/api/menu/{menu.id}/vote/", {"like": True})
+
+    assert resp.status_code == status.HTTP_200_OK
+
+
+def test_role_access_tokens_are_short_lived(employee, settings):
+    settings.AUTH_ROLE_ACCESS_TOKEN_LIFETIME = timedelta(minutes=2)
+
+    access = AccessToken(get_jwt_for_user(employee)["access"])
+
+    assert access["exp"] - access["iat"] == 120  # noqa: PLR2004
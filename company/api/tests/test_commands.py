@@ -0,0 +1,220 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+
+from base.management.commands import import_menus
+from base.models import (
+    DailyMenuResult,
+    Menu,
+    MenuVoteTally,
+    RestaurantDailyVoteTally,
+    RestaurantVoteTally,
+    Vote,
+)
+
+
+def test_vote_creates_tally(menu, employee):
+    Vote.objects.create(menu=menu, employee=employee, like=True)
+
+    menu.tally.refresh_from_db()
+    assert (menu.tally.likes, menu.tally.dislikes) == (1, 0)
+
+    Vote.objects.filter(menu=menu).delete()
+
+    menu.tally.refresh_from_db()
+    assert (menu.tally.likes, menu.tally.dislikes) == (0, 0)
+
+
+def test_vote_update_moves_tally(multiple_menus, employee):
+    m1, m2, _, _ = multiple_menus
+    vote = Vote.objects.create(menu=m1, employee=employee, like=True)
+
+    vote.like = False
+    vote.save()
+
+    tally = MenuVoteTally.objects.get(menu=m1)
+    assert (tally.likes, tally.dislikes) == (0, 1)
+    restaurant = RestaurantVoteTally.objects.get(restaurant=m1.restaurant)
+    assert (restaurant.likes, restaurant.dislikes) == (0, 1)
+
+    vote.menu = m2
+    vote.save()
+
+    tallies = MenuVoteTally.objects.filter(menu__in=[m1, m2]).order_by("menu_id")
+    assert [(t.likes, t.dislikes) for t in tallies] == [(0, 0), (0, 1)]
+
+
+def test_rebuild_vote_tallies(multiple_menus, employee):
+    m1, m2, _, _ = multiple_menus
+    Vote.objects.create(menu=m1, employee=employee, like=True)
+    Vote.objects.create(menu=m2, employee=employee, like=False)
+    # Simulate the drift: the first tally is wrong, the second one is lost.
+    MenuVoteTally.objects.filter(menu=m1).update(likes=10, dislikes=3)
+    MenuVoteTally.objects.filter(menu=m2).delete()
+
+    out = StringIO()
+    call_command("rebuild_vote_tallies", "--check", stdout=out)
+
+    assert out.getvalue() == "Found 1 missing and 1 drifted tallies\n"
+    assert MenuVoteTally.objects.get(menu=m1).likes == 10  # noqa: PLR2004
+
+    out = StringIO()
+    call_command("rebuild_vote_tallies", stdout=out)
+
+    assert out.getvalue() == "Fixed 1 missing and 1 drifted tallies\n"
+    tallies = MenuVoteTally.objects.order_by("menu_id")
+    assert [(t.menu_id, t.likes, t.dislikes) for t in tallies] == [
+        (m1.id, 1, 0), (m2.id, 0, 1),
+    ]
+
+
+def test_rebuild_restaurant_vote_tallies(multiple_menus, employee):
+    m1, m2, _, _ = multiple_menus
+    Vote.objects.create(menu=m1, employee=employee, like=True)
+    Vote.objects.create(menu=m2, employee=employee, like=False)
+    RestaurantVoteTally.objects.filter(restaurant=m1.restaurant).update(likes=5)
+    RestaurantDailyVoteTally.objects.filter(restaurant=m2.restaurant).delete()
+
+    out = StringIO()
+    call_command("rebuild_vote_tallies", stdout=out)
+
+    assert out.getvalue() == "Fixed 1 missing and 1 drifted tallies\n"
+    assert RestaurantVoteTally.objects.get(restaurant=m1.restaurant).likes == 1
+    daily = RestaurantDailyVoteTally.objects.get(restaurant=m2.restaurant)
+    assert (daily.date, daily.likes, daily.dislikes) == (m2.launch_date, 0, 1)
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_finalize_daily_results(multiple_menus, employee):
+    m1, m2, _, _ = multiple_menus
+    Vote.objects.create(menu=m1, employee=employee, like=True)
+    Vote.objects.create(menu=m2, employee=employee, like=False)
+
+    out = StringIO()
+    call_command("finalize_daily_results", "--date", "2025-10-15", "--days", "3",
+                 stdout=out)
+
+    assert out.getvalue() == ("Finalized results of 1 menus "
+                              "from 2025-10-13 to 2025-10-15\n")
+    result = DailyMenuResult.objects.get()
+    assert (result.menu_id, result.date) == (m2.id, m2.launch_date)
+    assert (result.likes, result.dislikes) == (0, 1)
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+@pytest.mark.django_db
+def test_finalize_daily_results_for_today():
+    with pytest.raises(CommandError, match="The day 2025-10-16 is not over yet"):
+        call_command("finalize_daily_results", "--date", "2025-10-16")
+
+
+def test_rebuild_menu_snapshots(multiple_menus):
+    m1, *_ = multiple_menus
+    Menu.objects.filter(id=m1.id).update(snapshot={"id": m1.id})
+
+    out = StringIO()
+    call_command("rebuild_menu_snapshots", "--batch-size", "2", stdout=out)
+
+    assert out.getvalue() == "Rebuilt the snapshots of 3 menus\n"
+    assert Menu.objects.get(id=m1.id).snapshot == {"id": m1.id}
+    assert Menu.objects.filter(snapshot__isnull=True).count() == 0
+
+    out = StringIO()
+    call_command("rebuild_menu_snapshots", "--all", stdout=out)
+
+    assert out.getvalue() == "Rebuilt the snapshots of 4 menus\n"
+    assert Menu.objects.get(id=m1.id).snapshot["items"] == [
+        {"id": 1, "title": "Item#1_1", "description": "Descr#1_1"},
+        {"id": 2, "title": "Item#1_2", "description": "Descr#1_2"},
+    ]
+
+
+def test_import_menus_jsonl(menu):
+    restaurant = menu.restaurant
+    lines = [
+        {"restaurant": restaurant.id, "launch_date": "2025-10-20", "title": "Monday",
+         "items": [{"title": "Soup", "description": "Tomato soup"},
+                   {"title": menu.items.first().title, "description": "Updated"}]},
+        {"restaurant": restaurant.id, "launch_date": "2025-10-21",
+         "items": [{"title": "Soup", "description": "Tomato soup"}]},
+        {"restaurant": 999, "launch_date": "2025-10-21",
+         "items": [{"title": "Soup", "description": "Tomato soup"}]},
+        {"restaurant": restaurant.id, "launch_date": "2025-10-22", "items": []},
+    ]
+    stdin = StringIO("\n".join([*map(json.dumps, lines), "not json"]))
+    out, err = StringIO(), StringIO()
+
+    call_command("import_menus", "-", "--batch-size", "2",
+                 stdin=stdin, stdout=out, stderr=err)
+
+    assert out.getvalue().startswith("Imported 2 menus from 5 rows in ")
+    assert out.getvalue().endswith("skipped 3 menus\n")
+    assert err.getvalue().splitlines() == [
+        "Line 3: Restaurant 999 doesn't exist",
+        "Line 4: 'items' is the required parameter. It can't be null or an empty array",
+        "Line 5: Expecting value: line 1 column 1 (char 0)",
+    ]
+    monday, tuesday = Menu.objects.exclude(id=menu.id).order_by("launch_date")
+    # The items are reused by the title within the restaurant.
+    assert monday.title == "Monday"
+    assert {i.id for i in tuesday.items.all()} < {i.id for i in monday.items.all()}
+    assert menu.items.get().description == "Updated"
+    assert monday.snapshot["items"][0]["title"] == menu.items.get().title
+
+
+def test_import_menus_csv(restaurant, tmp_path):
+    path = tmp_path / "menus.csv"
+    path.write_text(
+        "menu,restaurant,launch_date,title,notes,item_title,item_description\n"
+        f"10,{restaurant.id},2025-10-20,Monday,,Soup,Tomato soup\n"
+        f"10,{restaurant.id},2025-10-20,Monday,,Salad,Greek salad\n"
+        f"11,{restaurant.id},2025-13-21,Tuesday,,Soup,Tomato soup\n"
+        f"12,{restaurant.id},2025-10-22,Wednesday,Vegan,Salad,Greek salad\n",
+    )
+    out, err = StringIO(), StringIO()
+
+    call_command("import_menus", str(path), stdout=out, stderr=err)
+
+    assert out.getvalue().startswith("Imported 2 menus from 4 rows in ")
+    assert err.getvalue().startswith("Line 4: Invalid restaurant or launch date")
+    assert [(m.title, m.notes, sorted(i.title for i in m.items.all()))
+            for m in Menu.objects.order_by("launch_date")] == [
+        ("Monday", "", ["Salad", "Soup"]),
+        ("Wednesday", "Vegan", ["Salad"]),
+    ]
+
+
+def test_import_menus_with_conflicting_menu(restaurant, monkeypatch):
+    create_menus = import_menus.create_menus
+
+    def create_menus_with_conflict(menus_data, **kwargs) -> list[Menu]:  # noqa: ANN003
+        if any(data["title"] == "Conflicting" for data in menus_data):
+            msg = "FOREIGN KEY constraint failed"
+            raise IntegrityError(msg)
+        return create_menus(menus_data, **kwargs)
+
+    monkeypatch.setattr(import_menus, "create_menus", create_menus_with_conflict)
+    lines = [
+        {"restaurant": restaurant.id, "launch_date": f"2025-10-2{day}", "title": title,
+         "items": [{"title": "Soup", "description": "Tomato soup"}]}
+        for day, title in enumerate(("Monday", "Conflicting", "Wednesday"))
+    ]
+    stdin = StringIO("\n".join(map(json.dumps, lines)))
+    out, err = StringIO(), StringIO()
+
+    call_command("import_menus", "-", stdin=stdin, stdout=out, stderr=err)
+
+    assert out.getvalue().startswith("Imported 2 menus from 3 rows in ")
+    assert out.getvalue().endswith("skipped 1 menus\n")
+    assert err.getvalue() == "Line 2: FOREIGN KEY constraint failed\n"
+    assert list(Menu.objects.values_list("title", flat=True).order_by("id")) == [
+        "Monday", "Wednesday",
+    ]
+
+
+def test_import_menus_missing_file(tmp_path):
+    with pytest.raises(CommandError, match="No such file"):
+        call_command("import_menus", str(tmp_path / "menus.jsonl"))
@@ -141,6 +141,14 @@ def test_retrieving_employee_by_admin(admin, employee, client):
                          "date_joined": "2025-10-26T14:00:00Z"}
 
 
+def test_retrieving_employee_sparse_fieldset(admin, employee, client):
+    client = auth_client(client, get_jwt_for_user(admin))
+
+    resp = client.get(endpoint + f"{employee.id}/?fields=first_name,last_name")
+
+    assert de_json(resp.text) == {"id": 1, "first_name": "John", "last_name": "Doe"}
+
+
 def test_retrieving_non_existing_employee(admin, client):
     jwt = get_jwt_for_user(admin)
     client = auth_client(client, jwt)
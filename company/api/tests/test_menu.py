@@ -1,15 +1,20 @@
 from copy import deepcopy
+from datetime import date, timedelta
 
 import pytest
+from django.utils import timezone
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
 )
 
+from api import menus_cache, snapshots
+from api.serializers import ITEMS_REQUIRED_MSG
 from api.tests.tools import (
     AUTH_REQUIRED_401,
     PERMISSION_ERROR_403,
@@ -17,6 +22,7 @@ from api.tests.tools import (
     de_json,
     get_jwt_for_user,
 )
+from base.models import Menu, MenuItem
 
 MENU_ITEMS = (
     {
@@ -160,6 +166,81 @@ def test_create_with_item_without_description(client, restaurant):
     assert resp.status_code == HTTP_400_BAD_REQUEST
 
 
+def test_create_reuses_existing_items(client, restaurant):
+    kept = MenuItem.objects.create(restaurant=restaurant, title="Tiramisu",
+                                   description="Old description")
+    updated = MenuItem.objects.create(restaurant=restaurant,
+                                      title="Spaghetti Carbonara",
+                                      description="Old description")
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    payload = deepcopy(MENU_REQUEST_BODY)
+    payload["items"] = [*MENU_ITEMS, {"title": "Tiramisu",
+                                      "description": "Old description"}]
+
+    resp = client.post(ENDPOINT, payload)
+
+    assert resp.status_code == HTTP_201_CREATED
+    menu = Menu.objects.get()
+    assert menu.items.count() == len(MENU_ITEMS)
+    assert MenuItem.objects.count() == len(MENU_ITEMS)
+    kept.refresh_from_db()
+    updated.refresh_from_db()
+    # The last description wins for the repeated title.
+    assert kept.description == "Old description"
+    assert updated.description == MENU_ITEMS[2]["description"]
+    assert set(menu.items.all()) >= {kept, updated}
+
+
+def _insert_concurrently(monkeypatch, item: MenuItem) -> None:
+    """Insert the item right before the items of the request are inserted.
+
+    As a concurrent request would do after the lookup of the existing items.
+    """
+    bulk_create = MenuItem.objects.bulk_create
+
+    def bulk_create_after_insert(objs, **kwargs) -> list[MenuItem]:  # noqa: ANN003
+        monkeypatch.setattr(MenuItem.objects, "bulk_create", bulk_create)
+        item.save()
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(MenuItem.objects, "bulk_create", bulk_create_after_insert)
+
+
+def test_create_with_concurrently_created_item(client, restaurant, monkeypatch):
+    concurrent = MenuItem(restaurant=restaurant, title=MENU_ITEMS[0]["title"],
+                          description="Concurrent description")
+    _insert_concurrently(monkeypatch, concurrent)
+    client = auth_client(client, get_jwt_for_user(restaurant))
+
+    resp = client.post(ENDPOINT, MENU_REQUEST_BODY)
+
+    assert resp.status_code == HTTP_201_CREATED
+    assert MenuItem.objects.count() == len(MENU_ITEMS)
+    assert concurrent in Menu.objects.get().items.all()
+
+
+@pytest.mark.parametrize("items_count", [2, 40])
+def test_create_query_count_is_constant(client, restaurant, items_count,
+                                        django_assert_num_queries):
+    MenuItem.objects.create(restaurant=restaurant, title="Item#0",
+                            description="Old description")
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    payload = deepcopy(MENU_REQUEST_BODY)
+    payload["items"] = [{"title": f"Item#{i}", "description": "Description"}
+                        for i in range(items_count)]
+
+    # The restaurant is taken from the token claims. The serializer validation,
+    # the savepoint pair and the menu insert, the items lookup, update, insert,
+    # the IDs of the inserted items and linking, the dates of the menus with
+    # the updated items and clearing their snapshots, the menus and the items
+    # for the snapshots, the snapshots update, the items of the response.
+    with django_assert_num_queries(15):
+        resp = client.post(ENDPOINT, payload)
+
+    assert resp.status_code == HTTP_201_CREATED
+    assert Menu.objects.get().items.count() == items_count
+
+
 def test_create_without_title(client, restaurant):
     client = auth_client(client, get_jwt_for_user(restaurant))
     payload = deepcopy(MENU_REQUEST_BODY)
@@ -193,6 +274,94 @@ def test_create_without_launch_date(client, restaurant):
     assert resp.status_code == HTTP_400_BAD_REQUEST
 
 
+BATCH_ENDPOINT = ENDPOINT + "batch/"
+
+
+def _week_of_menus(items: tuple = MENU_ITEMS) -> list[dict]:
+    return [{**MENU_REQUEST_BODY, "launch_date": f"2025-10-2{i}", "items": items}
+            for i in range(5)]
+
+
+def test_batch_create(client, restaurant, django_assert_max_num_queries):
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    menus = _week_of_menus()
+    menus[1] = {**menus[1], "items": [*MENU_ITEMS[:2],
+                                      {"title": "Pizza", "description": "Pizza"}]}
+
+    # The validation of the restaurant of each menu and a fixed number
+    # of queries for saving the whole batch.
+    with django_assert_max_num_queries(len(menus) + 13):
+        resp = client.post(BATCH_ENDPOINT, {"menus": menus})
+
+    assert resp.status_code == HTTP_201_CREATED
+    assert de_json(resp.text) == {"menu_ids": [1, 2, 3, 4, 5]}
+    # The items are shared by all the menus.
+    assert MenuItem.objects.count() == len(MENU_ITEMS) + 1
+    assert Menu.objects.get(id=2).items.count() == 3  # noqa: PLR2004
+    assert Menu.objects.get(id=5).items.count() == len(MENU_ITEMS)
+
+
+def test_batch_create_with_concurrently_created_item(client, restaurant, monkeypatch):
+    concurrent = MenuItem(restaurant=restaurant, title=MENU_ITEMS[0]["title"],
+                          description="Concurrent description")
+    _insert_concurrently(monkeypatch, concurrent)
+    client = auth_client(client, get_jwt_for_user(restaurant))
+
+    resp = client.post(BATCH_ENDPOINT, {"menus": _week_of_menus()})
+
+    assert resp.status_code == HTTP_201_CREATED
+    assert MenuItem.objects.count() == len(MENU_ITEMS)
+    assert all(concurrent in menu.items.all() for menu in Menu.objects.all())
+
+
+def test_batch_create_atomic(client, restaurant):
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    menus = _week_of_menus()
+    menus[1] = {**menus[1], "items": []}
+    menus[3] = {**menus[3], "launch_date": "bad date"}
+
+    resp = client.post(BATCH_ENDPOINT, {"menus": menus})
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    details = de_json(resp.text)["details"]
+    assert details[1] == {"items": [ITEMS_REQUIRED_MSG]}
+    assert list(details[3]) == ["launch_date"]
+    assert details[0] == details[2] == details[4] == {}
+    assert not Menu.objects.exists()
+
+
+def test_batch_create_non_atomic(client, restaurant):
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    menus = _week_of_menus()
+    menus[1] = {**menus[1], "items": []}
+
+    resp = client.post(BATCH_ENDPOINT, {"menus": menus, "atomic": False})
+
+    assert resp.status_code == HTTP_201_CREATED
+    result = de_json(resp.text)
+    assert result["menu_ids"] == [1, None, 2, 3, 4]
+    assert result["details"][1] == {"items": [ITEMS_REQUIRED_MSG]}
+    assert Menu.objects.count() == len(menus) - 1
+
+
+def test_batch_create_by_user(client, user):
+    client = auth_client(client, get_jwt_for_user(user))
+
+    resp = client.post(BATCH_ENDPOINT, {"menus": _week_of_menus()})
+
+    assert resp.text == PERMISSION_ERROR_403
+    assert resp.status_code == HTTP_403_FORBIDDEN
+
+
+def test_batch_create_without_menus(client, restaurant):
+    client = auth_client(client, get_jwt_for_user(restaurant))
+
+    resp = client.post(BATCH_ENDPOINT, {"menus": []})
+
+    assert resp.text == '{"details":{"menus":["This list may not be empty."]}}'
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.freeze_time("2025-10-16T11:00:00Z")
 def test_retrieve_by_id_by_user(client, user, restaurant, menu):
     client = auth_client(client, get_jwt_for_user(user))
@@ -255,6 +424,98 @@ def test_with_today_date(client, multiple_menus):
     assert de_json(resp.text) == MULTIPLE_MENUS_STRUCTURE
     assert resp.status_code == HTTP_200_OK
 
+
+@pytest.mark.parametrize("menus_count", [1, 500])
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_list_query_count_is_constant(client, restaurant, menus_count,
+                                      django_assert_num_queries):
+    today = timezone.now().date()
+    menus = Menu.objects.bulk_create(
+        Menu(restaurant=restaurant, launch_date=today) for _ in range(menus_count)
+    )
+    items = MenuItem.objects.bulk_create(
+        MenuItem(restaurant=restaurant, title=f"Item#{i}", description="Descr")
+        for i in range(2)
+    )
+    for item in items:
+        item.menu.add(*menus)
+    snapshots.rebuild(Menu.objects.all())
+
+    # The validators query and the single-table read of the snapshots.
+    with django_assert_num_queries(2):
+        resp = client.get(ENDPOINT + "2025-10-16/")
+
+    assert resp.status_code == HTTP_200_OK
+    assert len(de_json(resp.text)) == menus_count
+
+
+def test_retrieve_by_id_query_count(client, menu, django_assert_num_queries):
+    snapshots.rebuild(Menu.objects.all())
+
+    with django_assert_num_queries(2):
+        resp = client.get(ENDPOINT + f"{menu.id}/")
+
+    assert resp.status_code == HTTP_200_OK
+
+
+@pytest.mark.freeze_time("2025-10-16T11:00:00Z")
+def test_retrieve_by_id_not_modified(client, menu, django_assert_num_queries):
+    resp = client.get(ENDPOINT + f"{menu.id}/")
+    etag = resp.headers["ETag"]
+
+    assert resp.headers["Last-Modified"] == "Thu, 16 Oct 2025 11:00:00 GMT"
+
+    # Only the validators query, without loading the menu.
+    with django_assert_num_queries(1):
+        resp = client.get(ENDPOINT + f"{menu.id}/", headers={"If-None-Match": etag})
+
+    assert resp.status_code == HTTP_304_NOT_MODIFIED
+    assert resp.content == b""
+
+    resp = client.get(ENDPOINT + f"{menu.id}/",
+                      headers={"If-Modified-Since": "Thu, 16 Oct 2025 11:00:00 GMT"})
+
+    assert resp.status_code == HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_retrieve_by_id_modified_item(client, multiple_menus, freezer):
+    menu = multiple_menus[0]
+    etag = client.get(ENDPOINT + f"{menu.id}/").headers["ETag"]
+
+    # Another menu of the restaurant updates the description of the shared item.
+    freezer.move_to("2025-10-16T20:00:00Z")
+    client = auth_client(client, get_jwt_for_user(menu.restaurant))
+    client.post(ENDPOINT, MENU_REQUEST_BODY | {
+        "restaurant": menu.restaurant.id,
+        "items": [{"title": "Item#1_1", "description": "New description"}],
+    })
+    resp = client.get(ENDPOINT + f"{menu.id}/", headers={"If-None-Match": etag})
+
+    assert resp.status_code == HTTP_200_OK
+    assert resp.headers["ETag"] != etag
+    assert resp.headers["Last-Modified"] == "Thu, 16 Oct 2025 20:00:00 GMT"
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_list_not_modified(client, multiple_menus,
+                           django_capture_on_commit_callbacks):
+    etag = client.get(ENDPOINT).headers["ETag"]
+
+    resp = client.get(ENDPOINT + "2025-10-16/", headers={"If-None-Match": etag})
+
+    assert resp.status_code == HTTP_304_NOT_MODIFIED
+
+    restaurant = multiple_menus[0].restaurant
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(ENDPOINT, MENU_REQUEST_BODY | {"restaurant": restaurant.id,
+                                                   "launch_date": "2025-10-16"})
+    resp = client.get(ENDPOINT, headers={"If-None-Match": etag})
+
+    assert resp.status_code == HTTP_200_OK
+
+
 @pytest.mark.freeze_time("2025-10-16T19:00:00Z")
 def test_with_date_in_future(client, multiple_menus):
     resp = client.get(ENDPOINT + "2026-10-16/")  # 1 year in the future.
@@ -269,3 +530,294 @@ def test_with_bad_date(client, multiple_menus):
     assert resp.status_code == HTTP_400_BAD_REQUEST
     assert resp.text == ('{"details":"Invalid date - \'9999-99-99\'. '
                          'Correct format is YYYY-MM-DD"}')
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_menus_cache(client, multiple_menus, django_assert_num_queries):
+    before = menus_cache.stats()
+    resp = client.get(ENDPOINT)
+
+    # The cache hit touches neither the DB nor the serializer.
+    with django_assert_num_queries(0):
+        cached = client.get(ENDPOINT + "2025-10-16/")
+
+    assert cached.content == resp.content
+    for header in ("ETag", "Vary", "Allow"):
+        assert cached.headers[header] == resp.headers[header]
+    assert de_json(cached.text) == MULTIPLE_MENUS_STRUCTURE
+
+    with django_assert_num_queries(0):
+        resp = client.get(ENDPOINT, headers={"If-None-Match": resp.headers["ETag"]})
+
+    assert resp.status_code == HTTP_304_NOT_MODIFIED
+    stats = menus_cache.stats()
+    assert stats["hits"] - before["hits"] == 2  # noqa: PLR2004
+    assert stats["misses"] - before["misses"] == 1
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_menus_cache_invalidation(client, multiple_menus,
+                                  django_capture_on_commit_callbacks):
+    menu2 = multiple_menus[1]  # The menu of 2 days ago.
+    client.get(ENDPOINT)
+    client.get(ENDPOINT + "2025-10-14/")
+
+    # The new menu for tomorrow updates the item of the menu#2.
+    client = auth_client(client, get_jwt_for_user(menu2.restaurant))
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(ENDPOINT, MENU_REQUEST_BODY | {
+            "restaurant": menu2.restaurant.id,
+            "launch_date": "2025-10-17",
+            "items": [{"title": "Item#2_1", "description": "New description"}],
+        })
+
+    resp = client.get(ENDPOINT + "2025-10-14/")
+
+    assert de_json(resp.text)[0]["items"][0]["description"] == "New description"
+    assert menus_cache.get_cached(timezone.now().date())[0] is not None
+
+
+def test_menus_cache_bypassed_by_format(client, multiple_menus):
+    resp = client.get(ENDPOINT + "?format=api")
+
+    assert resp["Content-Type"].startswith("text/html")
+    assert menus_cache.get_cached(timezone.now().date())[0] is None
+
+
+def test_menus_cache_bypassed_by_accept(client, multiple_menus):
+    client.get(ENDPOINT)
+
+    resp = client.get(ENDPOINT, headers={"Accept": "application/json; indent=4"})
+
+    assert resp.text.startswith("[\n    {")
+
+
+def test_menus_cache_bypassed_by_credentials(client, multiple_menus):
+    client.get(ENDPOINT)
+
+    resp = client.get(ENDPOINT, headers={"Authorization": "Bearer invalid"})
+
+    assert resp.status_code == HTTP_401_UNAUTHORIZED
+
+
+def test_menus_cache_invalidated_by_signals(client, multiple_menus,
+                                            django_capture_on_commit_callbacks):
+    menu1, menu2 = multiple_menus[:2]
+    today, two_days_ago = menu1.launch_date, menu2.launch_date
+    client.get(ENDPOINT)
+    assert menus_cache.get_cached(today)[0] is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        item = menu1.items.first()
+        item.description = "New description"
+        item.save()
+    assert menus_cache.get_cached(today)[0] is None
+
+    client.get(ENDPOINT)
+    client.get(ENDPOINT + f"{two_days_ago}/")
+    with django_capture_on_commit_callbacks(execute=True):
+        menu2.launch_date = today
+        menu2.save()
+    assert menus_cache.get_cached(today)[0] is None
+    assert menus_cache.get_cached(two_days_ago)[0] is None
+
+    client.get(ENDPOINT)
+    with django_capture_on_commit_callbacks(execute=True):
+        menu1.items.remove(item)
+    assert menus_cache.get_cached(today)[0] is None
+
+
+def test_menus_stored_after_invalidation_are_stale(client, multiple_menus,
+                                                   django_capture_on_commit_callbacks):
+    today = multiple_menus[0].launch_date
+    stale = client.get(ENDPOINT)
+    _, generation = menus_cache.get_cached(today)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        item = multiple_menus[0].items.first()
+        item.description = "New description"
+        item.save()
+    # A concurrent request stores the menus it rendered before the change.
+    menus_cache.store(today, generation, stale.content, {"ETag": stale["ETag"]})
+    resp = client.get(ENDPOINT)
+
+    assert resp.content != stale.content
+    assert "New description" in resp.text
+
+
+@pytest.mark.parametrize("days", [1, 7])
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_range(client, multiple_menus, days, django_assert_num_queries):
+    first_day = date(2025, 10, 16) - timedelta(days=days - 1)
+    snapshots.rebuild(Menu.objects.all())
+
+    # The snapshots of the menus.
+    with django_assert_num_queries(1):
+        resp = client.get(ENDPOINT + f"?from={first_day}&to=2025-10-16")
+
+    assert resp.status_code == HTTP_200_OK
+    grouped = de_json(resp.text)
+    assert grouped["2025-10-16"] == MULTIPLE_MENUS_STRUCTURE
+    if days == 1:
+        assert list(grouped) == ["2025-10-16"]
+    else:
+        # The menu#2 of 2 days ago, the days without menus are omitted.
+        assert list(grouped) == ["2025-10-14", "2025-10-16"]
+        assert [m["id"] for m in grouped["2025-10-14"]] == [2]
+
+
+@pytest.mark.parametrize(("query", "details"), [
+    ("?from=2025-10-16", "Both 'from' and 'to' are required for the date range"),
+    ("?from=2025-10-16&to=2025-13-01",
+     "Invalid date - '2025-13-01'. Correct format is YYYY-MM-DD"),
+    ("?from=2025-10-16&to=2025-10-15", "'from' can't be after 'to'"),
+    ("?from=2025-10-01&to=2025-11-01",
+     "The date range can't be longer than 31 days"),
+])
+@pytest.mark.django_db
+def test_range_with_bad_params(client, query, details):
+    resp = client.get(ENDPOINT + query)
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(resp.text) == {"details": details}
+
+
+SEARCH_ENDPOINT = ENDPOINT + "search/"
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_search(client, multiple_menus):
+    m1, m2, m3, _ = multiple_menus
+    m1.items.create(restaurant=m1.restaurant, title="Vegan soup",
+                    description="Tomato soup")
+    m3.items.create(restaurant=m3.restaurant, title="Borscht",
+                    description="Beetroot SOUP, vegan")
+    tomorrow = Menu.objects.create(restaurant=m2.restaurant,
+                                   launch_date=date(2025, 10, 17))
+    tomorrow.items.create(restaurant=m2.restaurant, title="Chicken soup",
+                          description="Soup")
+
+    resp = client.get(SEARCH_ENDPOINT + "?q=vegan soup")
+
+    assert resp.status_code == HTTP_200_OK
+    grouped = de_json(resp.text)
+    assert {d: [m["id"] for m in menus] for d, menus in grouped.items()} == {
+        "2025-10-16": [m1.id, m3.id],
+    }
+    # The whole menus are returned, not only the matching items.
+    assert len(grouped["2025-10-16"][0]["items"]) == 3  # noqa: PLR2004
+
+    resp = client.get(SEARCH_ENDPOINT + "?q=soup&from=2025-10-17&to=2025-10-17")
+
+    assert [m["id"] for m in de_json(resp.text)["2025-10-17"]] == [tomorrow.id]
+
+
+@pytest.mark.parametrize(("query", "details"), [
+    ("", "'q' is the required parameter"),
+    ("?q=+", "'q' is the required parameter"),
+    ("?q=soup&from=2025-10-16", "Both 'from' and 'to' are required for the date range"),
+])
+@pytest.mark.django_db
+def test_search_with_bad_params(client, query, details):
+    resp = client.get(SEARCH_ENDPOINT + query)
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(resp.text) == {"details": details}
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_snapshots(client, multiple_menus, django_assert_num_queries):
+    m1, _, m3, _ = multiple_menus
+    snapshots.rebuild(Menu.objects.filter(id__in=[m1.id, m3.id]))
+    # Changing the items clears the snapshots of their menus.
+    m3.items.first().save()
+    m1.refresh_from_db()
+    m3.refresh_from_db()
+
+    assert m1.snapshot == de_json(client.get(ENDPOINT + f"{m1.id}/").text)
+    assert m3.snapshot is None
+    # The menus without the snapshots are serialized.
+    with django_assert_num_queries(3):
+        resp = client.get(ENDPOINT + "?from=2025-10-16&to=2025-10-16")
+
+    assert de_json(resp.text)["2025-10-16"] == MULTIPLE_MENUS_STRUCTURE
+
+
+def test_create_builds_snapshots(client, restaurant, menu,
+                                 django_capture_on_commit_callbacks):
+    snapshots.rebuild(Menu.objects.all())
+    client = auth_client(client, get_jwt_for_user(restaurant))
+    payload = MENU_REQUEST_BODY | {
+        "restaurant": menu.restaurant.id,
+        "items": [{"title": "Menu item", "description": "New description"}],
+    }
+
+    resp = client.post(ENDPOINT, payload)
+
+    new_menu = Menu.objects.get(id=de_json(resp.text)["menu_id"])
+    menu.refresh_from_db()
+    assert new_menu.snapshot["items"][0]["description"] == "New description"
+    # The snapshot of the old menu with the same item is cleared,
+    # it's serialized on read.
+    assert menu.snapshot is None
+    resp = client.get(ENDPOINT + f"{menu.id}/")
+    assert de_json(resp.text)["items"][0]["description"] == "New description"
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_sparse_fieldset(client, multiple_menus, django_assert_num_queries):
+    m1, *_ = multiple_menus
+
+    # Only the requested columns of the menus and their items.
+    with django_assert_num_queries(3):
+        resp = client.get(ENDPOINT + "2025-10-16/?fields=title,items.title")
+
+    assert resp.status_code == HTTP_200_OK
+    menus = de_json(resp.text)
+    assert menus[0] == {
+        "id": m1.id,
+        "items": [{"id": 1, "title": "Item#1_1"}, {"id": 2, "title": "Item#1_2"}],
+        "title": "",
+    }
+    assert [m["id"] for m in menus] == [m["id"] for m in MULTIPLE_MENUS_STRUCTURE]
+    # Without the items the menus are loaded by one query.
+    with django_assert_num_queries(2):
+        resp = client.get(ENDPOINT + f"{m1.id}/?fields=title,launch_date")
+
+    assert de_json(resp.text) == {"id": m1.id, "title": "", "launch_date": "2025-10-16"}
+
+    resp = client.get(ENDPOINT + f"{m1.id}/?fields=title&expand=items")
+
+    assert de_json(resp.text)["items"] == MULTIPLE_MENUS_STRUCTURE[0]["items"]
+    # The full representation isn't affected by the sparse requests.
+    assert de_json(client.get(ENDPOINT).text) == MULTIPLE_MENUS_STRUCTURE
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_sparse_fieldset_range(client, multiple_menus):
+    resp = client.get(ENDPOINT + "?from=2025-10-14&to=2025-10-16&fields=notes")
+
+    assert resp.status_code == HTTP_200_OK
+    # The menus are grouped by the launch date, even if it isn't requested.
+    assert de_json(resp.text) == {
+        "2025-10-14": [{"id": 2, "notes": ""}],
+        "2025-10-16": [{"id": 1, "notes": ""}, {"id": 3, "notes": ""},
+                       {"id": 4, "notes": ""}],
+    }
+
+
+@pytest.mark.parametrize(("query", "details"), [
+    ("?fields=title,price",
+     ("Unknown fields - 'price'. Allowed values are: "
+      "id, title, notes, launch_date, date_created, last_modified, restaurant")),
+    ("?fields=items.price",
+     ("Unknown fields - 'items.price'. "
+      "Allowed values are: items.id, items.title, items.description")),
+    ("?expand=restaurant", "Unknown expand - 'restaurant'. Allowed values are: items"),
+])
+@pytest.mark.django_db
+def test_sparse_fieldset_with_bad_params(client, query, details):
+    resp = client.get(ENDPOINT + "2025-10-16/" + query)
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(resp.text) == {"details": details}
@@ -0,0 +1,68 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+DATA = {
+    "id": 1,
+    "title": "Café\u2028ünïcode\u2029",
+    "launch_date": datetime.date(2025, 10, 16),
+    "date_created": datetime.datetime(2025, 10, 16, 11, 0, 0, 123456,
+                                      tzinfo=datetime.UTC),
+    "naive": datetime.datetime(2025, 10, 16, 11, 0, 0),  # noqa: DTZ001
+    "time": datetime.time(11, 30),
+    "price": Decimal("10.50"),
+    "results": {1: [True, None, 1.5]},
+    "tuple": (1, 2),
+}
+
+
+def test_renderer_output_is_identical():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_renderer_with_indent():
+    rendered = ORJSONRenderer().render(DATA, "application/json; indent=4")
+
+    assert rendered == JSONRenderer().render(DATA, "application/json; indent=4")
+
+
+def test_renderer_without_orjson(monkeypatch):
+    monkeypatch.setattr(renderers, "orjson", None)
+
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+@pytest.mark.parametrize("orjson_installed", [True, False])
+def test_parser(monkeypatch, orjson_installed):
+    if not orjson_installed:
+        monkeypatch.setattr(parsers, "orjson", None)
+    body = '{"like": true, "items": [{"title": "Café"}]}'.encode()
+
+    parsed = ORJSONParser().parse(io.BytesIO(body))
+
+    assert parsed == JSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.parametrize("body", [b"{bad json", b'{"value": NaN}'])
+def test_parser_rejects_invalid_json(body):
+    with pytest.raises(ParseError, match="JSON parse error"):
+        ORJSONParser().parse(io.BytesIO(body))
+
+
+def test_parser_with_other_encoding():
+    body = '{"title": "Café"}'.encode("utf-16")
+
+    parsed = ORJSONParser().parse(io.BytesIO(body),
+                                  parser_context={"encoding": "utf-16"})
+
+    assert parsed == {"title": "Café"}
@@ -1,3 +1,4 @@
+from datetime import date, timedelta
 from types import MappingProxyType
 
 import pytest
@@ -10,12 +11,15 @@ from rest_framework.status import (
     HTTP_404_NOT_FOUND,
 )
 
+from api import snapshots
 from api.tests.tools import (
     AUTH_REQUIRED_401,
     PERMISSION_ERROR_403,
     auth_client,
+    de_json,
     get_jwt_for_user,
 )
+from base.models import Employee, Menu, Vote
 
 PAYLOAD = MappingProxyType({
     "name": "RESTaurant's name",
@@ -121,8 +125,151 @@ def test_retrieve_by_anonymous(client, restaurant):
                          '"date_joined":"2025-10-26T14:00:00Z"}')
 
 
+def test_retrieve_sparse_fieldset(client, restaurant):
+    resp = client.get(ENDPOINT + f"{restaurant.id}/?fields=name")
+
+    assert resp.status_code == HTTP_200_OK
+    assert resp.text == '{"id":1,"name":"Restaurant"}'
+
+
 def test_retrieve_non_existing(client, restaurant):
     resp = client.get(ENDPOINT + f"{restaurant.id+999}/")
 
     assert resp.status_code == HTTP_404_NOT_FOUND
     assert resp.text == '{"detail":"No Restaurant matches the given query."}'
+
+
+LEADERBOARD_ENDPOINT = "/api/restaurant/leaderboard/"
+
+
+@pytest.fixture
+def voted_menus(multiple_menus, employee, admin):
+    """Menu#1 (today) - 1 like, menu#2 (2 days ago) - 2 likes,
+    menu#3 (today) - 2 dislikes and a 40 days old menu#5 - 2 likes."""
+    m1, m2, m3, _ = multiple_menus
+    old_menu = Menu.objects.create(restaurant=m3.restaurant,
+                                   launch_date=m3.launch_date - timedelta(days=40))
+    admin_employee = Employee.objects.create(user=admin, first_name="Admin",
+                                             last_name="Admin")
+    Vote.objects.create(menu=m1, employee=employee, like=True)
+    for e in (employee, admin_employee):
+        Vote.objects.create(menu=m2, employee=e, like=True)
+        Vote.objects.create(menu=m3, employee=e, like=False)
+        Vote.objects.create(menu=old_menu, employee=e, like=True)
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_leaderboard_for_week(client, voted_menus, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        resp = client.get(LEADERBOARD_ENDPOINT)
+
+    assert resp.status_code == HTTP_200_OK
+    assert de_json(resp.text) == [
+        {"restaurant_id": 2, "name": "Restaurant#2",
+         "likes": 2, "dislikes": 0, "result": 2},
+        {"restaurant_id": 1, "name": "Restaurant#1",
+         "likes": 1, "dislikes": 0, "result": 1},
+        {"restaurant_id": 3, "name": "Restaurant#3",
+         "likes": 0, "dislikes": 2, "result": -2},
+    ]
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_leaderboard_for_all_time(client, voted_menus):
+    resp = client.get(LEADERBOARD_ENDPOINT + "?period=all&limit=2")
+
+    assert de_json(resp.text) == [
+        {"restaurant_id": 2, "name": "Restaurant#2",
+         "likes": 2, "dislikes": 0, "result": 2},
+        {"restaurant_id": 1, "name": "Restaurant#1",
+         "likes": 1, "dislikes": 0, "result": 1},
+    ]
+    # The votes for the old menu#5 are counted for the restaurant#3.
+    resp = client.get(LEADERBOARD_ENDPOINT + "?period=all")
+
+    assert de_json(resp.text)[2] == {"restaurant_id": 3, "name": "Restaurant#3",
+                                     "likes": 2, "dislikes": 2, "result": 0}
+
+
+@pytest.mark.parametrize(("query", "details"), [
+    ("?period=year",
+     "Invalid period - 'year'. Allowed values are: week, month, all"),
+    ("?limit=0", "Invalid limit - '0'. It must be a number from 1 to 100"),
+    ("?limit=ten", "Invalid limit - 'ten'. It must be a number from 1 to 100"),
+])
+@pytest.mark.django_db
+def test_leaderboard_with_bad_params(client, query, details):
+    resp = client.get(LEADERBOARD_ENDPOINT + query)
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(resp.text) == {"details": details}
+
+
+@pytest.fixture
+def menus_history(restaurant):
+    """5 days of menus, 2 menus on the last day."""
+    first_day = date(2025, 10, 1)
+    menus = Menu.objects.bulk_create(
+        Menu(restaurant=restaurant, launch_date=first_day + timedelta(days=i))
+        for i in range(5)
+    )
+    menus.append(Menu.objects.create(restaurant=restaurant,
+                                     launch_date=first_day + timedelta(days=4)))
+    snapshots.rebuild(Menu.objects.all())
+    return menus
+
+
+def test_restaurant_menus_pages(client, restaurant, menus_history,
+                                django_assert_num_queries):
+    url = f"{ENDPOINT}{restaurant.id}/menus/?limit=2"
+    pages = []
+    while url:
+        # The restaurant and the snapshots of the menus page.
+        with django_assert_num_queries(2):
+            page = de_json(client.get(url).text)
+        pages.append([(m["id"], m["launch_date"]) for m in page["results"]])
+        url = page["next"]
+
+    assert pages == [
+        [(6, "2025-10-05"), (5, "2025-10-05")],
+        [(4, "2025-10-04"), (3, "2025-10-03")],
+        [(2, "2025-10-02"), (1, "2025-10-01")],
+    ]
+
+
+def test_restaurant_menus_sparse_fieldset(client, restaurant, menus_history):
+    url = f"{ENDPOINT}{restaurant.id}/menus/?limit=4&fields=title"
+
+    page = de_json(client.get(url).text)
+    # The cursor is built even though the launch date isn't requested.
+    next_page = de_json(client.get(page["next"]).text)
+
+    assert page["results"] == [{"id": i, "title": ""} for i in (6, 5, 4, 3)]
+    assert next_page["results"] == [{"id": i, "title": ""} for i in (2, 1)]
+    assert "fields=title" in page["next"]
+
+
+def test_restaurant_menus_default_page(client, restaurant, menus_history):
+    resp = client.get(f"{ENDPOINT}{restaurant.id}/menus/")
+
+    page = de_json(resp.text)
+    assert resp.status_code == HTTP_200_OK
+    assert page["next"] is None
+    assert len(page["results"]) == len(menus_history)
+
+
+@pytest.mark.parametrize(("query", "details"), [
+    ("?cursor=bad", "Invalid cursor - 'bad'"),
+    ("?limit=101", "Invalid limit - '101'. It must be a number from 1 to 100"),
+])
+def test_restaurant_menus_with_bad_params(client, restaurant, query, details):
+    resp = client.get(f"{ENDPOINT}{restaurant.id}/menus/{query}")
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(resp.text) == {"details": details}
+
+
+def test_restaurant_menus_of_non_existing(client, restaurant):
+    resp = client.get(f"{ENDPOINT}{restaurant.id + 1}/menus/")
+
+    assert resp.status_code == HTTP_404_NOT_FOUND
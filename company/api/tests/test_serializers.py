@@ -1,6 +1,15 @@
 from types import MappingProxyType
 
-from api.serializers import MenuSerializer
+import pytest
+from django.http import Http404
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import (
+    employee_serializer,
+    menu_serializer,
+    restaurant_serializer,
+)
+from api.serializers import EmployeeSerializer, MenuSerializer, RestaurantSerializer
 from base.models import Menu, MenuItem, Restaurant
 
 
@@ -109,3 +118,25 @@ class TestMenuSerializerWithDuplicatedItems:
         item1, item2 = MenuItem.objects.all()
         assert item1.description == "New description #1"
         assert item2.description == "New description #2"
+
+
+def test_fast_menu_serializer_is_identical(multiple_menus):
+    menus = Menu.objects.order_by("id")
+    expected = JSONRenderer().render(MenuSerializer(menus.for_read(), many=True).data)
+
+    assert JSONRenderer().render(menu_serializer.serialize(menus)) == expected
+    assert (JSONRenderer().render(menu_serializer.get_or_404(multiple_menus[0].id))
+            == JSONRenderer().render(MenuSerializer(multiple_menus[0]).data))
+
+
+def test_fast_restaurant_and_employee_serializers_are_identical(restaurant, employee):
+    assert (JSONRenderer().render(restaurant_serializer.get_or_404(restaurant.id))
+            == JSONRenderer().render(RestaurantSerializer(restaurant).data))
+    assert (JSONRenderer().render(employee_serializer.get_or_404(employee.id))
+            == JSONRenderer().render(EmployeeSerializer(employee).data))
+
+
+@pytest.mark.django_db
+def test_fast_serializer_not_found():
+    with pytest.raises(Http404, match="No Menu matches the given query."):
+        menu_serializer.get_or_404(1)
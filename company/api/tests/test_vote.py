@@ -1,10 +1,31 @@
+import asyncio
 import random
+from io import StringIO
 from string import ascii_letters
 
 import pytest
-from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
-
-from api.tests.tools import auth_client, de_json, get_jwt_for_user
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.test import AsyncClient
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_403_FORBIDDEN,
+    HTTP_404_NOT_FOUND,
+)
+
+from api import vote_buffer, vote_results
+from api.tests.tools import (
+    PERMISSION_ERROR_403,
+    auth_client,
+    de_json,
+    get_jwt_for_user,
+)
+from api.vote_buffer import VoteBuffer
 from base.models import Employee, User, Vote
 
 ENDPOINT_RESULTS = "/api/vote/results/"
@@ -108,6 +129,28 @@ def test_vote_multiple_times(client, menu, employee):
 
 
 
+def test_duplicated_vote_rejected_by_db(menu, employee):
+    Vote.objects.create(menu=menu, employee=employee, like=True)
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Vote.objects.create(menu=menu, employee=employee, like=False)
+
+    menu.tally.refresh_from_db()
+    assert (menu.tally.likes, menu.tally.dislikes) == (1, 0)
+
+
+def test_duplicated_vote_keeps_tally(client, menu, employee):
+    auth_client(client, get_jwt_for_user(employee.user))
+
+    client.post(ENDPOINT_VOTE % menu.id, {"like": True})
+    resp = client.post(ENDPOINT_VOTE % menu.id, {"like": False})
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(client.get(ENDPOINT_RESULTS).text) == [
+        {"menu_id": 1, "likes": 1, "dislikes": 0, "result": 1},
+    ]
+
+
 def test_vote_set_like_then_dislike_for_same_menu(client, employee, menu):
     auth_client(client, get_jwt_for_user(employee.user))
 
@@ -153,3 +196,427 @@ def test_with_non_existing_employee(client, user, menu):
 
     assert resp.text == '{"details":"Employee not found"}'
     assert resp.status_code == HTTP_404_NOT_FOUND
+
+
+def _vote_for_multiple_menus(multiple_menus) -> None:
+    employees = generate_employees(4)
+    m1, _, _, m4 = multiple_menus
+
+    # Menu #1 - 1 like, 3 dislikes; Menu #3 - no votes; Menu #4 - 2 likes.
+    for i, e in enumerate(employees):
+        Vote.objects.create(menu=m1, employee=e, like=i == 0)
+    for e in employees[:2]:
+        Vote.objects.create(menu=m4, employee=e, like=True)
+
+
+def test_retrieve_results_in_single_query(client, multiple_menus,
+                                         django_assert_num_queries):
+    _vote_for_multiple_menus(multiple_menus)
+
+    with django_assert_num_queries(1):
+        resp = client.get(ENDPOINT_RESULTS)
+
+    assert de_json(resp.text) == [
+        {"menu_id": 1, "likes": 1, "dislikes": 3, "result": -2},
+        {"menu_id": 3, "likes": 0, "dislikes": 0, "result": 0},
+        {"menu_id": 4, "likes": 2, "dislikes": 0, "result": 2},
+    ]
+
+
+def test_retrieve_results_ordered_by_result(client, multiple_menus):
+    _vote_for_multiple_menus(multiple_menus)
+
+    resp = client.get(ENDPOINT_RESULTS + "?ordering=-result")
+
+    assert [r["menu_id"] for r in de_json(resp.text)] == [4, 3, 1]
+
+    resp = client.get(ENDPOINT_RESULTS + "?ordering=result")
+
+    assert [r["menu_id"] for r in de_json(resp.text)] == [1, 3, 4]
+
+
+def test_retrieve_results_without_empty_menus(client, multiple_menus):
+    _vote_for_multiple_menus(multiple_menus)
+
+    resp = client.get(ENDPOINT_RESULTS + "?include_empty=false")
+
+    assert [r["menu_id"] for r in de_json(resp.text)] == [1, 4]
+
+
+@pytest.mark.django_db
+def test_retrieve_results_with_bad_params(client):
+    resp = client.get(ENDPOINT_RESULTS + "?ordering=likes")
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert resp.text == ('{"details":"Invalid ordering - \'likes\'. '
+                         'Allowed values are: menu_id, result, -result"}')
+
+    resp = client.get(ENDPOINT_RESULTS + "?include_empty=maybe")
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert resp.text == ('{"details":"Invalid include_empty - \'maybe\'. '
+                         'Allowed values are: true, false"}')
+
+
+@pytest.mark.freeze_time("2025-10-16T11:00:00Z")
+def test_results_served_from_cache(client, menu, employee, freezer,
+                                   django_assert_num_queries):
+    client.get(ENDPOINT_RESULTS)
+    # A vote that bypasses 'do_vote' doesn't invalidate the cache.
+    Vote.objects.create(menu=menu, employee=employee, like=True)
+    freezer.tick(5)
+
+    with django_assert_num_queries(0):
+        resp = client.get(ENDPOINT_RESULTS)
+
+    assert resp.text == '[{"menu_id":1,"likes":0,"dislikes":0,"result":0}]'
+    assert resp["Age"] == "5"
+
+
+@pytest.fixture
+def vote_by_employee(client, menu, employee, django_capture_on_commit_callbacks):
+    """Return a function voting by the employee for the menu."""
+    auth_client(client, get_jwt_for_user(employee.user))
+
+    def vote(*, like: bool = True) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(ENDPOINT_VOTE % menu.id, {"like": like})
+
+    return vote
+
+
+def test_vote_invalidates_cached_results(client, vote_by_employee):
+    client.get(ENDPOINT_RESULTS)
+
+    vote_by_employee()
+    resp = client.get(ENDPOINT_RESULTS)
+
+    assert resp.text == '[{"menu_id":1,"likes":1,"dislikes":0,"result":1}]'
+    assert resp["Age"] == "0"
+
+
+def test_results_stored_after_invalidation_are_stale(menu, employee,
+                                                    django_capture_on_commit_callbacks):
+    date = menu.launch_date
+    generation = cache.get(vote_results.GENERATION_CACHE_KEY.format(date=date))
+    key = vote_results.CACHE_KEY.format(date=date, generation=generation)
+    stale = vote_results.compute_vote_results(date)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Vote.objects.create(menu=menu, employee=employee, like=True)
+        vote_results.vote_results_changed(date)
+    # A concurrent request stores the results it read before the vote.
+    cache.set(key, (0, stale))
+    results, _ = vote_results.get_vote_results(date)
+
+    assert results == [{"menu_id": menu.id, "likes": 1, "dislikes": 0, "result": 1}]
+
+
+@pytest.mark.freeze_time("2025-10-16T11:00:00Z")
+def test_results_with_max_staleness(client, settings, freezer, vote_by_employee):
+    settings.VOTE_RESULTS_MAX_STALENESS = 10
+    client.get(ENDPOINT_RESULTS)
+
+    vote_by_employee()
+    freezer.tick(9)
+    resp_stale = client.get(ENDPOINT_RESULTS)
+    freezer.tick(2)
+    resp_fresh = client.get(ENDPOINT_RESULTS)
+
+    assert resp_stale.text == '[{"menu_id":1,"likes":0,"dislikes":0,"result":0}]'
+    assert resp_stale["Age"] == "9"
+    assert resp_fresh.text == '[{"menu_id":1,"likes":1,"dislikes":0,"result":1}]'
+    assert resp_fresh["Age"] == "0"
+
+
+ENDPOINT_BATCH = "/api/vote/batch/"
+
+
+def test_batch_vote(client, admin, multiple_menus,
+                    django_assert_num_queries, django_capture_on_commit_callbacks):
+    e1, e2 = generate_employees(2)
+    m1, _, m3, _ = multiple_menus
+    Vote.objects.create(menu=m3, employee=e1, like=False)
+    client.get(ENDPOINT_RESULTS)
+    auth_client(client, get_jwt_for_user(admin))
+    payload = [
+        {"employee_id": e1.id, "menu_id": m1.id, "like": True},
+        {"employee_id": e2.id, "menu_id": m1.id, "like": False},
+        {"employee_id": e1.id, "menu_id": m3.id, "like": True},
+        {"employee_id": e2.id, "menu_id": m1.id, "like": True},
+        {"employee_id": e2.id, "menu_id": 1000, "like": True},
+        {"employee_id": 1000, "menu_id": m1.id, "like": True},
+    ]
+
+    # Auth + menus + employees + existing votes + savepoint/insert/release
+    # + update/savepoint/insert/release for each of the menu, restaurant
+    # and restaurant daily tallies (there are no tallies for menu#1 yet).
+    with django_assert_num_queries(19), \
+         django_capture_on_commit_callbacks(execute=True):
+        resp = client.post(ENDPOINT_BATCH, payload)
+
+    assert resp.status_code == HTTP_200_OK
+    assert de_json(resp.text) == [
+        {"status": "created", "vote_id": 2, "action": "liked"},
+        {"status": "created", "vote_id": 3, "action": "disliked"},
+        {"status": "rejected",
+         "details": "The employee has already disliked this menu ''."},
+        {"status": "rejected",
+         "details": "The employee has already disliked this menu ''."},
+        {"status": "rejected", "details": "Menu not found"},
+        {"status": "rejected", "details": "Employee not found"},
+    ]
+    assert de_json(client.get(ENDPOINT_RESULTS).text)[0] == {
+        "menu_id": 1, "likes": 1, "dislikes": 1, "result": 0,
+    }
+
+
+def test_batch_vote_by_employee(client, employee, menu):
+    auth_client(client, get_jwt_for_user(employee.user))
+
+    resp = client.post(ENDPOINT_BATCH, [
+        {"employee_id": employee.id, "menu_id": menu.id, "like": True},
+    ])
+
+    assert resp.status_code == HTTP_403_FORBIDDEN
+    assert resp.text == PERMISSION_ERROR_403
+
+
+def test_batch_vote_with_invalid_entry(client, admin, menu):
+    auth_client(client, get_jwt_for_user(admin))
+
+    resp = client.post(ENDPOINT_BATCH, [{"menu_id": menu.id, "like": True}])
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert Vote.objects.count() == 0
+
+
+ENDPOINT_STREAM = "/api/vote/results/stream/"
+
+
+def test_stream_vote_results(settings, vote_by_employee):
+    settings.VOTE_RESULTS_STREAM_INTERVAL = 0
+
+    async def read_events() -> tuple[StreamingHttpResponse, bytes, bytes]:
+        resp = await AsyncClient().get(ENDPOINT_STREAM)
+        events = aiter(resp.streaming_content)
+        try:
+            initial = await anext(events)
+            await sync_to_async(vote_by_employee)(like=True)
+            updated = await anext(events)
+        finally:
+            await events.aclose()
+        return resp, initial, updated
+
+    resp, initial, updated = async_to_sync(read_events)()
+
+    assert resp["Content-Type"] == "text/event-stream"
+    assert initial == (b"event: results\n"
+                       b'data: [{"menu_id":1,"likes":0,"dislikes":0,"result":0}]\n\n')
+    assert updated == (b"event: results\n"
+                       b'data: [{"menu_id":1,"likes":1,"dislikes":0,"result":1}]\n\n')
+
+
+def test_streams_share_results(settings, monkeypatch, vote_by_employee):
+    settings.VOTE_RESULTS_STREAM_INTERVAL = 0
+    computed = []
+    get_vote_results = vote_results.get_vote_results
+
+    def counting_get_vote_results(date) -> tuple[list[dict], float]:
+        computed.append(date)
+        return get_vote_results(date)
+
+    monkeypatch.setattr(vote_results, "get_vote_results", counting_get_vote_results)
+
+    async def read_events() -> list[bytes]:
+        responses = [await AsyncClient().get(ENDPOINT_STREAM) for _ in range(2)]
+        streams = [aiter(resp.streaming_content) for resp in responses]
+        try:
+            for stream in streams:
+                await anext(stream)
+            computed.clear()
+            await sync_to_async(vote_by_employee)()
+            return await asyncio.gather(*(anext(stream) for stream in streams))
+        finally:
+            for stream in streams:
+                await stream.aclose()
+
+    first, second = async_to_sync(read_events)()
+
+    assert first == second == (
+        b"event: results\n"
+        b'data: [{"menu_id":1,"likes":1,"dislikes":0,"result":1}]\n\n'
+    )
+    assert len(computed) == 1
+
+
+@pytest.fixture
+def write_behind(settings, monkeypatch):
+    settings.VOTE_WRITE_BEHIND = {"ENABLED": True}
+    # The flusher thread never wakes up, the buffer is flushed by the tests.
+    buffer = VoteBuffer(flush_interval=3600, max_batch_size=1000)
+    monkeypatch.setattr(vote_buffer, "_buffer", buffer)
+    return buffer
+
+
+def test_vote_with_write_behind(client, menu, employee, write_behind,
+                                django_capture_on_commit_callbacks):
+    auth_client(client, get_jwt_for_user(employee.user))
+
+    resp = client.post(ENDPOINT_VOTE % menu.id, {"like": True})
+    resp_duplicate = client.post(ENDPOINT_VOTE % menu.id, {"like": False})
+
+    assert resp.status_code == HTTP_202_ACCEPTED
+    assert resp.text == '{"vote_id":null,"action":"liked"}'
+    assert resp_duplicate.status_code == HTTP_400_BAD_REQUEST
+    assert resp_duplicate.text == '{"details":"You\'ve already liked this menu \'\'."}'
+    assert Vote.objects.count() == 0
+    assert write_behind.depth == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert write_behind.flush() == 1
+
+    assert write_behind.depth == 0
+    assert list(Vote.objects.values_list("menu", "employee", "like")) == [
+        (menu.id, employee.id, True),
+    ]
+    assert client.get(ENDPOINT_RESULTS).text == (
+        '[{"menu_id":1,"likes":1,"dislikes":0,"result":1}]'
+    )
+    stats = write_behind.stats()
+    assert stats["flushes"] == 1
+    assert stats["flushed_votes"] == 1
+
+
+def test_write_behind_vote_already_in_db(client, menu, employee, write_behind):
+    Vote.objects.create(menu=menu, employee=employee, like=False)
+    auth_client(client, get_jwt_for_user(employee.user))
+
+    resp = client.post(ENDPOINT_VOTE % menu.id, {"like": True})
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert resp.text == '{"details":"You\'ve already disliked this menu \'\'."}'
+    assert write_behind.depth == 0
+
+
+def test_write_behind_flush_right_after_add(client, menu, employee, write_behind,
+                                            monkeypatch):
+    add = write_behind.add
+
+    def add_and_flush(vote) -> Vote | None:
+        pending = add(vote)
+        write_behind.flush()
+        return pending
+
+    monkeypatch.setattr(write_behind, "add", add_and_flush)
+    auth_client(client, get_jwt_for_user(employee.user))
+
+    resp = client.post(ENDPOINT_VOTE % menu.id, {"like": True})
+
+    # The vote found in the DB is the flushed vote itself.
+    assert resp.status_code == HTTP_202_ACCEPTED
+    assert Vote.objects.get().like is True
+
+
+def test_write_behind_flush_keeps_readded_vote(menu, employee, write_behind,
+                                               monkeypatch):
+    flushed = Vote(menu=menu, employee=employee, like=True)
+    readded = Vote(menu=menu, employee=employee, like=False)
+    write_behind.add(flushed)
+    bulk_create_counted = Vote.objects.bulk_create_counted
+
+    def bulk_create_and_readd(votes) -> list[Vote]:
+        created = bulk_create_counted(votes)
+        # Another vote takes the key while the flush is inserting.
+        pending = write_behind._pending  # noqa: SLF001
+        monkeypatch.setitem(pending, (menu.id, employee.id), readded)
+        return created
+
+    monkeypatch.setattr(Vote.objects, "bulk_create_counted", bulk_create_and_readd)
+
+    assert write_behind.flush() == 1
+    assert write_behind.depth == 1
+
+
+def test_write_behind_flush_skips_duplicates(menu, employee, write_behind):
+    write_behind.add(Vote(menu=menu, employee=employee, like=True))
+    # The vote lands in the DB bypassing the buffer.
+    Vote.objects.create(menu=menu, employee=employee, like=False)
+
+    assert write_behind.flush() == 0
+    assert write_behind.depth == 0
+    assert write_behind.stats()["rejected_votes"] == 1
+    assert Vote.objects.get().like is False
+
+
+def test_stats(client, admin, write_behind):
+    auth_client(client, get_jwt_for_user(admin))
+
+    resp = client.get("/api/stats/")
+
+    assert resp.status_code == HTTP_200_OK
+    assert de_json(resp.text)["vote_buffer"] == {
+        "depth": 0,
+        "flushes": 0,
+        "flushed_votes": 0,
+        "rejected_votes": 0,
+        "last_flush_ms": 0.0,
+        "max_flush_ms": 0.0,
+        "avg_flush_ms": 0.0,
+    }
+    assert set(de_json(resp.text)["menus_cache"]) == {"hits", "misses", "hit_ratio"}
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_results_by_date(client, multiple_menus, freezer):
+    employees = generate_employees(3)
+    m1, m2, _, _ = multiple_menus
+    for i, e in enumerate(employees):
+        Vote.objects.create(menu=m1, employee=e, like=True)
+        Vote.objects.create(menu=m2, employee=e, like=i == 0)
+    call_command("finalize_daily_results", "--date", "2025-10-14",
+                 stdout=StringIO())
+    freezer.move_to("2025-10-17T10:00:00Z")
+
+    resp_past = client.get(ENDPOINT_RESULTS + "2025-10-14/")
+    resp_not_finalized = client.get(ENDPOINT_RESULTS + "2025-10-16/")
+
+    assert resp_past.text == '[{"menu_id":2,"likes":1,"dislikes":2,"result":-1}]'
+    assert resp_past["Age"] == str(15 * 3600)
+    assert de_json(resp_not_finalized.text) == [
+        {"menu_id": 1, "likes": 3, "dislikes": 0, "result": 3},
+        {"menu_id": 3, "likes": 0, "dislikes": 0, "result": 0},
+        {"menu_id": 4, "likes": 0, "dislikes": 0, "result": 0},
+    ]
+
+
+@pytest.mark.freeze_time("2025-10-16T19:00:00Z")
+def test_results_for_date_range(client, multiple_menus, employee,
+                                django_assert_num_queries):
+    m1, m2, _, _ = multiple_menus
+    Vote.objects.create(menu=m1, employee=employee, like=True)
+    Vote.objects.create(menu=m2, employee=employee, like=True)
+    call_command("finalize_daily_results", "--days", "5", stdout=StringIO())
+
+    with django_assert_num_queries(1):
+        resp = client.get(ENDPOINT_RESULTS + "?from=2025-10-01&to=2025-10-31")
+
+    # Today's results are not finalized yet.
+    assert resp.text == ('{"2025-10-14":'
+                         '[{"menu_id":2,"likes":1,"dislikes":0,"result":1}]}')
+
+
+@pytest.mark.parametrize(("query", "details"), [
+    ("?from=2025-10-01", "Both 'from' and 'to' are required for the date range"),
+    ("?from=2025-10-01&to=2025-13-01",
+     "Invalid date - '2025-13-01'. Correct format is YYYY-MM-DD"),
+    ("?from=2025-10-02&to=2025-10-01", "'from' can't be after 'to'"),
+    ("?from=2024-09-30&to=2025-10-01",
+     "The date range can't be longer than 366 days"),
+])
+@pytest.mark.django_db
+def test_results_for_bad_date_range(client, query, details):
+    resp = client.get(ENDPOINT_RESULTS + query)
+
+    assert resp.status_code == HTTP_400_BAD_REQUEST
+    assert de_json(resp.text) == {"details": details}
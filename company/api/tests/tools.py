@@ -2,7 +2,8 @@ import json
 from typing import TypeVar
 
 from rest_framework.test import APIClient
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.authentication import RoleRefreshToken
 
 PERMISSION_ERROR_403 = '{"detail":"You do not have permission to perform this action."}'
 AUTH_REQUIRED_401 = '{"detail":"Authentication credentials were not provided."}'
@@ -13,7 +14,8 @@ def de_json(text: str) -> dict:
 
 
 def get_jwt_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    # The employees and the restaurants are authenticated as their users.
+    refresh = RoleRefreshToken.for_user(getattr(user, "user", user))
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
@@ -1,18 +1,55 @@
-from django.urls import path  # noqa: D100
+from django.conf import settings  # noqa: D100
+from django.urls import path
 
+from api.views import asynchronous
 from api.views.employee import add_employee, get_employee
-from api.views.menu import get_menu_by_id, get_menus_by_date, process_menu
-from api.views.restaurant import create_restaurant, get_restaurant
-from api.views.vote import do_vote, get_vote_results
+from api.views.menu import (
+    create_menus_batch,
+    get_menu_by_id,
+    get_menus_by_date,
+    process_menu,
+    search_menus,
+)
+from api.views.restaurant import (
+    create_restaurant,
+    get_leaderboard,
+    get_restaurant,
+    get_restaurant_menus,
+)
+from api.views.stats import get_stats
+from api.views.vote import (
+    do_batch_vote,
+    do_vote,
+    get_vote_results,
+    get_vote_results_by_date,
+    stream_vote_results,
+)
+
+if getattr(settings, "API_ASYNC_VIEWS", False):
+    get_employee = asynchronous.get_employee
+    get_restaurant = asynchronous.get_restaurant
+    get_menu_by_id = asynchronous.get_menu_by_id
+    get_menus_by_date = asynchronous.get_menus_by_date
+    get_vote_results = asynchronous.get_vote_results
 
 urlpatterns = [
     path("employee/<int:pk>/", get_employee, name="get_employee"),
     path("employee/", add_employee, name="add_employee"),
     path("restaurant/<int:pk>/", get_restaurant, name="get_restaurant"),
     path("restaurant/", create_restaurant, name="create_restaurant"),
+    path("restaurant/leaderboard/", get_leaderboard, name="get_leaderboard"),
+    path("restaurant/<int:pk>/menus/", get_restaurant_menus,
+         name="get_restaurant_menus"),
     path("menu/<int:pk>/", get_menu_by_id, name="get_menu"),
     path("menu/<int:year>-<int:month>-<int:day>/", get_menus_by_date, name="get_menu"),
     path("menu/", process_menu, name="create_menu"),
+    path("menu/batch/", create_menus_batch, name="create_menus_batch"),
+    path("menu/search/", search_menus, name="search_menus"),
     path("menu/<int:menu_id>/vote/", do_vote, name="create_menu"),
     path("vote/results/", get_vote_results, name="create_menu"),
+    path("vote/results/<int:year>-<int:month>-<int:day>/", get_vote_results_by_date,
+         name="get_vote_results_by_date"),
+    path("vote/batch/", do_batch_vote, name="batch_vote"),
+    path("vote/results/stream/", stream_vote_results, name="stream_vote_results"),
+    path("stats/", get_stats, name="get_stats"),
 ]
@@ -0,0 +1,168 @@
+"""Async versions of the read endpoints.
+
+They are built on Django's async ORM, so under ASGI the requests
+don't occupy a thread while waiting for the DB.
+They are enabled by the 'API_ASYNC_VIEWS' setting.
+DRF doesn't support async views, so the requests are handled without
+'APIView', but the responses are the same as the ones of the sync views
+(including the sparse fieldsets, '?fields=' and '?expand=', and the
+conditional GET of the menus by 'ETag'/'Last-Modified').
+"""
+import datetime
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import aget_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated,
+    ParseError,
+    PermissionDenied,
+)
+from rest_framework.views import exception_handler
+
+from api import fast_serializers, vote_results
+from api.authentication import CachedJWTAuthentication
+from api.renderers import ORJSONRenderer
+from api.serializers import EmployeeSerializer, MenuSerializer, RestaurantSerializer
+from api.views.menu import amenu_condition, amenus_by_date_condition
+from base.models import Employee, Menu, Restaurant
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+Fieldset = TypeVar("Fieldset", bound=fast_serializers.RowSerializer)
+
+
+def render(data: object, status_code: int = status.HTTP_200_OK,
+           headers: dict[str, str] | None = None) -> HttpResponse:
+    """Render the data the same way DRF's 'Response' does."""
+    return HttpResponse(ORJSONRenderer().render(data), status=status_code,
+                        headers=headers, content_type="application/json")
+
+
+def async_api_view(view: AsyncView) -> AsyncView:
+    """Allow only GET requests and convert the exceptions to the responses."""
+    @functools.wraps(view)
+    async def wrapper(request: HttpRequest, *args: object,
+                      **kwargs: object) -> HttpResponse:
+        try:
+            if request.method != "GET":
+                raise MethodNotAllowed(request.method)
+            return await view(request, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            if isinstance(exc, NotAuthenticated | AuthenticationFailed):
+                exc.auth_header = CachedJWTAuthentication().authenticate_header(request)  # pyright: ignore[reportAttributeAccessIssue]
+            response = exception_handler(exc, {})
+            if response is None:
+                raise
+            headers = {k: v for k, v in response.headers.items()
+                       if k != "Content-Type"}
+            return render(response.data, response.status_code, headers=headers)
+
+    return wrapper
+
+
+async def _authenticate_admin(request: HttpRequest) -> None:
+    """Check that the request has JWT of an admin user."""
+    auth = await sync_to_async(CachedJWTAuthentication().authenticate)(request)  # pyright: ignore[reportArgumentType]
+    if auth is None:
+        raise NotAuthenticated
+    user, _ = auth
+    if not user.is_staff:
+        raise PermissionDenied
+
+
+def _get_fieldset(request: HttpRequest, serializer: Fieldset) -> Fieldset | None:
+    """Return the serializer of the requested sparse fieldset.
+
+    The same as 'fast_serializers.with_fieldset' does for the sync views.
+    """
+    try:
+        return serializer.sparse(request.GET)
+    except ValueError as e:
+        raise ParseError(detail={"details": str(e)}) from e
+
+
+@async_api_view
+async def get_employee(request: HttpRequest, pk: int) -> HttpResponse:
+    """Return Employee by its 'pk'."""
+    await _authenticate_admin(request)
+    fieldset = _get_fieldset(request, fast_serializers.employee_serializer)
+    if fieldset is not None:
+        return render(await sync_to_async(fieldset.get_or_404)(pk))
+    e = await aget_object_or_404(Employee, pk=pk)
+    return render(EmployeeSerializer(e, many=False).data)
+
+
+@async_api_view
+async def get_restaurant(request: HttpRequest, pk: int) -> HttpResponse:
+    """Return a Restaurant for the given pk."""
+    fieldset = _get_fieldset(request, fast_serializers.restaurant_serializer)
+    if fieldset is not None:
+        return render(await sync_to_async(fieldset.get_or_404)(pk))
+    r = await aget_object_or_404(Restaurant, pk=pk)
+    return render(RestaurantSerializer(r, many=False).data)
+
+
+@async_api_view
+@amenu_condition
+async def get_menu_by_id(request: HttpRequest, pk: int) -> HttpResponse:
+    """Return a menu by its id."""
+    fieldset = _get_fieldset(request, fast_serializers.menu_serializer)
+    if fieldset is not None:
+        return render(await sync_to_async(fieldset.get_or_404)(pk))
+    m = await aget_object_or_404(Menu.objects.for_read(), pk=pk)
+    return render(MenuSerializer(m, many=False).data)
+
+
+@async_api_view
+@amenus_by_date_condition
+async def get_menus_by_date(request: HttpRequest,
+                            year: int, month: int, day: int) -> HttpResponse:
+    """Return menus for the given date."""
+    fieldset = _get_fieldset(request, fast_serializers.menu_serializer)
+    try:
+        date = datetime.date(year=year, month=month, day=day)
+    except ValueError:
+        err_msg = (f"Invalid date - '{year}-{month}-{day}'. "
+                   "Correct format is YYYY-MM-DD")
+        return render({"details": err_msg}, status.HTTP_400_BAD_REQUEST)
+    if fieldset is not None:
+        return render(await sync_to_async(fieldset.serialize)(
+            Menu.objects.filter(launch_date=date),
+        ))
+    menus = [
+        m async for m in Menu.objects.filter(launch_date=date).for_read()
+    ]
+    return render(MenuSerializer(menus, many=True).data)
+
+
+@async_api_view
+async def get_vote_results(request: HttpRequest) -> HttpResponse:
+    """Return results for all today's menus."""
+    try:
+        date_range = vote_results.parse_date_range(request.GET)
+        options = vote_results.parse_results_options(request.GET)
+    except ValueError as e:
+        return render({"details": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    if date_range:
+        daily_results = await vote_results.aget_daily_results(*date_range)
+        return render({
+            date: vote_results.apply_results_options(results, *options)
+            for date, results in daily_results.items()
+        })
+
+    today = timezone.now().date()
+    results, computed_at = await vote_results.aget_vote_results(today)
+
+    age = max(0, int(time.time() - computed_at))
+    return render(vote_results.apply_results_options(results, *options),
+                  headers={"Age": str(age)})
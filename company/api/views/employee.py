@@ -1,4 +1,3 @@
-from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import (
     api_view,
@@ -8,24 +7,28 @@ from rest_framework.decorators import (
 from rest_framework.permissions import IsAdminUser
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from api import fast_serializers
+from api.authentication import CachedJWTAuthentication
 from api.serializers import EmployeeSerializer
-from base.models import Employee
 
 
 @api_view(["GET"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([CachedJWTAuthentication])
 @permission_classes([IsAdminUser])
-def get_employee(request: Request, pk: int) -> Response:  # noqa: ARG001
-    """Return Employee by its 'pk'."""
-    e = get_object_or_404(Employee, pk=pk)
-    serializer = EmployeeSerializer(e, many=False)
-    return Response(serializer.data)
+@fast_serializers.with_fieldset(fast_serializers.employee_serializer)
+def get_employee(request: Request, pk: int,  # noqa: ARG001
+                 fieldset: fast_serializers.RowSerializer | None = None) -> Response:
+    """Return Employee by its 'pk'.
+
+    '?fields=' limits the returned fields, e.g. '?fields=first_name,last_name'.
+    """
+    serializer = fieldset or fast_serializers.employee_serializer
+    return Response(serializer.get_or_404(pk))
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([CachedJWTAuthentication])
 @permission_classes([IsAdminUser])
 def add_employee(request: Request) -> Response:
     """Add new Employee to the DB."""
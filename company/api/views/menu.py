@@ -1,9 +1,20 @@
 import datetime
+import hashlib
+from collections.abc import Awaitable, Callable
+from functools import wraps
 
-from django.http import HttpResponseBase, HttpResponseNotAllowed
-from django.shortcuts import get_object_or_404
+from django.db.models import Count, Max, QuerySet
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    HttpResponseNotAllowed,
+)
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.decorators import (
     api_view,
@@ -14,29 +25,222 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from api.serializers import MenuSerializer
-from base.models import Menu
+from api import menus_cache, snapshots, vote_results
+from api.authentication import StatelessJWTAuthentication, get_restaurant_id
+from api.fast_serializers import MenuRowSerializer, menu_serializer, with_fieldset
+from api.serializers import (
+    ITEMS_REQUIRED_MSG,
+    BatchMenuSerializer,
+    MenuSerializer,
+    create_menus,
+)
+from base.models import Menu, MenuItem
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+# The longest date range of the menus request.
+MENUS_MAX_RANGE_DAYS = 31
+# The 'Accept' headers of the requests served from the menus cache.
+CACHED_ACCEPT = ("*/*", "application/json")
+# The headers of the rendered response restored on a hit.
+CACHED_HEADERS = ("ETag", "Last-Modified", "Vary", "Allow")
+
+
+def _state_aggregates() -> dict:
+    """Return the aggregates of the modification state of the menus."""
+    return {
+        "menus_count": Count("id", distinct=True),
+        "items_count": Count("items"),
+        "menus_modified": Max("last_modified"),
+        "items_modified": Max("items__last_modified"),
+    }
+
+
+def _menus_state(request: Request, **lookup: object) -> dict | None:
+    """Return the modification state of the menus matching the lookup.
+
+    The state is calculated by a single aggregate query over the menus
+    and their items and is cached on the request, as it's used for both
+    'ETag' and 'Last-Modified'.
+    """
+    if not hasattr(request, "_menus_state"):
+        request._menus_state = Menu.objects.filter(  # noqa: SLF001
+            **lookup,
+        ).aggregate(**_state_aggregates())
+    return request._menus_state  # noqa: SLF001
+
+
+def _menu_state(request: Request, pk: int) -> dict | None:
+    """Return the state of the menu, 'None' if it doesn't exist."""
+    state = _menus_state(request, pk=pk)
+    return state if state["menus_count"] else None
+
+
+def _date_menus_state(request: Request,
+                      year: int, month: int, day: int) -> dict | None:
+    """Return the state of the menus for the date, 'None' if the date is invalid."""
+    try:
+        date = datetime.date(year=year, month=month, day=day)
+    except ValueError:
+        return None
+    return _menus_state(request, launch_date=date)
+
+
+def _etag(state: dict | None) -> str | None:
+    if state is None:
+        return None
+    return hashlib.md5(repr(sorted(state.items())).encode(),
+                       usedforsecurity=False).hexdigest()
+
+
+def _last_modified(state: dict | None) -> datetime.datetime | None:
+    if state is None:
+        return None
+    timestamps = [t for t in (state["menus_modified"], state["items_modified"]) if t]
+    return max(timestamps, default=None)
+
+
+# Conditional GET: a client with an up-to-date copy gets '304 Not Modified'
+# after the validators query, without loading and serializing the menus.
+menu_condition = condition(
+    etag_func=lambda request, pk: _etag(_menu_state(request, pk)),
+    last_modified_func=lambda request, pk: _last_modified(_menu_state(request, pk)),
+)
+menus_by_date_condition = condition(
+    etag_func=lambda request, **date: _etag(_date_menus_state(request, **date)),
+    last_modified_func=lambda request, **date: _last_modified(
+        _date_menus_state(request, **date),
+    ),
+)
+
+
+async def _amenu_state(pk: int) -> dict | None:
+    """Async version of the '_menu_state'."""
+    state = await Menu.objects.filter(pk=pk).aaggregate(**_state_aggregates())
+    return state if state["menus_count"] else None
+
+
+async def _adate_menus_state(year: int, month: int, day: int) -> dict | None:
+    """Async version of the '_date_menus_state'."""
+    try:
+        date = datetime.date(year=year, month=month, day=day)
+    except ValueError:
+        return None
+    return await Menu.objects.filter(launch_date=date).aaggregate(**_state_aggregates())
+
+
+def _async_condition(
+        get_state: Callable[..., Awaitable[dict | None]],
+) -> Callable[[AsyncView], AsyncView]:
+    """Conditional GET for the async views by the state of the menus.
+
+    'condition' calls the validator functions synchronously, so they can't
+    query the DB in the async views. The state is read once for both.
+    """
+    def decorator(view: AsyncView) -> AsyncView:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, **kwargs: object) -> HttpResponse:
+            state = await get_state(**kwargs)
+            etag = _etag(state)
+            etag = quote_etag(etag) if etag is not None else None
+            last_modified = _last_modified(state)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(request, etag=etag,
+                                                last_modified=timestamp)
+            if response is None:
+                response = await view(request, **kwargs)
+            if timestamp and not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(timestamp)
+            if etag:
+                response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+amenu_condition = _async_condition(_amenu_state)
+amenus_by_date_condition = _async_condition(_adate_menus_state)
+
 
+def cached_menus(
+        view: Callable[..., HttpResponseBase]) -> Callable[..., HttpResponseBase]:
+    """Serve the rendered JSON of the menus of a date from the cache.
 
+    On a hit neither the DB nor the serializer are touched, the conditional
+    headers are answered from the cached validators. The entry is dropped
+    when the menus of the date change (see 'menus_cache.menus_changed'
+    and 'api.signals'). Only the plain JSON responses are cached, the requests
+    accepting other media types (the browsable API, the indented JSON),
+    the explicit 'format', the sparse fieldset and the authenticated
+    (the credentials must be checked) requests bypass it.
+    """
+    @wraps(view)
+    def wrapper(request: HttpRequest,
+                year: int, month: int, day: int) -> HttpResponseBase:
+        try:
+            date = datetime.date(year=year, month=month, day=day)
+        except ValueError:
+            date = None
+        if (date is None or request.method != "GET"
+                or request.headers.get("Accept", "*/*") not in CACHED_ACCEPT
+                or "Authorization" in request.headers
+                or not {"format", "fields", "expand"}.isdisjoint(request.GET)):
+            return view(request, year=year, month=month, day=day)
+
+        entry, generation = menus_cache.get_cached(date)
+        if entry is None:
+            response = view(request, year=year, month=month, day=day)
+            if (response.status_code == status.HTTP_200_OK
+                    and response.accepted_media_type == "application/json"):  # pyright: ignore[reportAttributeAccessIssue]
+                response.render()  # pyright: ignore[reportAttributeAccessIssue]
+                headers = {h: response[h] for h in CACHED_HEADERS
+                           if response.has_header(h)}
+                menus_cache.store(date, generation, response.content, headers)  # pyright: ignore[reportAttributeAccessIssue]
+            return response
+
+        response = HttpResponse(entry["content"], content_type="application/json")
+        for header, value in entry["headers"].items():
+            response[header] = value
+        return get_conditional_response(
+            request,
+            etag=entry["headers"].get("ETag"),
+            last_modified=parse_http_date_safe(entry["headers"].get("Last-Modified")),
+            response=response,
+        )
+
+    return wrapper
+
+
+@menu_condition
 @api_view(["GET"])
-def get_menu_by_id(request: Request, pk: int) -> Response:  # noqa: ARG001
-    """Return a menu by its id."""
-    m = get_object_or_404(Menu, pk=pk)
-    serializer = MenuSerializer(m, many=False)
-    return Response(serializer.data)
+@with_fieldset(menu_serializer)
+def get_menu_by_id(request: Request, pk: int,  # noqa: ARG001
+                   fieldset: MenuRowSerializer | None = None) -> Response:
+    """Return a menu by its id.
+
+    The sparse fieldset ('?fields=', '?expand=items') is serialized from
+    the requested columns, the full representation is read from the snapshot.
+    """
+    if fieldset is None:
+        return Response(snapshots.get_or_404(pk))
+    return Response(fieldset.get_or_404(pk))
 
 
 @csrf_exempt
 def process_menu(request: Request) -> Response | HttpResponseBase:
     """Based on the method the function delegates the request to the proper handler.
 
-    GET: return menus results for today.
+    GET: return menus for today, or for the date range if 'from' and 'to'
+         query parameters are given.
     POST: create new menu.
     """
     if request.method == "POST":
         return create_menu(request)
+    if request.method == "GET" and ("from" in request.GET or "to" in request.GET):
+        return get_menus_by_range(request)
     if request.method == "GET":
         today = timezone.now()
         return get_menus_by_date(
@@ -47,8 +251,13 @@ def process_menu(request: Request) -> Response | HttpResponseBase:
     return HttpResponseNotAllowed(content=msg, permitted_methods=("GET", "POST"))
 
 
+@cached_menus
+@menus_by_date_condition
 @api_view(["GET"])
-def get_menus_by_date(request: Request, year: int, month: int, day: int) -> Response:  # noqa: ARG001
+@with_fieldset(menu_serializer)
+def get_menus_by_date(request: Request,  # noqa: ARG001
+                      year: int, month: int, day: int,
+                      fieldset: MenuRowSerializer | None = None) -> Response:
     """Return menus for the given date."""
     try:
         date = datetime.date(year=year, month=month, day=day)
@@ -57,16 +266,91 @@ def get_menus_by_date(request: Request, year: int, month: int, day: int) -> Resp
                    "Correct format is YYYY-MM-DD")
         return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
     menus = Menu.objects.filter(launch_date=date)
-    serializer = MenuSerializer(menus, many=True)
-    return Response(serializer.data)
+    if fieldset is None:
+        return Response(snapshots.read(menus))
+    return Response(fieldset.serialize(menus))
+
+
+@api_view(["GET"])
+@with_fieldset(menu_serializer)
+def get_menus_by_range(request: Request,
+                       fieldset: MenuRowSerializer | None = None) -> Response:
+    """Return menus for the days from 'from' to 'to' grouped by date.
+
+    The days without menus are omitted. All the menus are loaded by
+    a fixed number of queries regardless of the length of the range.
+    """
+    try:
+        first_day, last_day = vote_results.parse_date_range(  # pyright: ignore[reportGeneralTypeIssues]
+            request.query_params, max_days=MENUS_MAX_RANGE_DAYS,
+        )
+    except ValueError as e:
+        return Response({"details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    menus = Menu.objects.filter(launch_date__range=(first_day, last_day))
+    return Response(_group_by_launch_date(menus, fieldset))
+
+
+@api_view(["GET"])
+@with_fieldset(menu_serializer)
+def search_menus(request: Request,
+                 fieldset: MenuRowSerializer | None = None) -> Response:
+    """Return the menus with the items matching the text grouped by date.
+
+    The text is searched in the titles and the descriptions of the items.
+
+    Query parameters:
+        q: the text to search, e.g. 'vegan soup'.
+        from, to: the date range, today and the following days by default.
+        fields, expand: the sparse fieldset of the menus
+            (see 'MenuRowSerializer.sparse').
+    """
+    text = request.query_params.get("q", "").strip()
+    if not text:
+        return Response({"details": "'q' is the required parameter"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        dates = vote_results.parse_date_range(request.query_params,
+                                              max_days=MENUS_MAX_RANGE_DAYS)
+    except ValueError as e:
+        return Response({"details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if dates is None:
+        today = timezone.now().date()
+        dates = (today, today + datetime.timedelta(days=MENUS_MAX_RANGE_DAYS - 1))
+
+    menus = Menu.objects.filter(
+        launch_date__range=dates, items__in=MenuItem.objects.search(text),
+    ).distinct()
+    return Response(_group_by_launch_date(menus, fieldset))
+
+
+def _group_by_launch_date(
+        menus: QuerySet[Menu],
+        fieldset: MenuRowSerializer | None = None) -> dict[str, list[dict]]:
+    """Serialize the menus and group them by the launch date.
+
+    The dates without menus are omitted.
+    """
+    grouped: dict[str, list[dict]] = {}
+    menus = menus.order_by("launch_date", "id")
+    if fieldset is None:
+        data = snapshots.read(menus)
+    else:
+        # The menus are grouped by the launch date, even if it isn't requested.
+        data = fieldset.including("launch_date").serialize(menus)
+    keep_date = fieldset is None or "launch_date" in fieldset.fields
+    for menu in data:
+        date = menu["launch_date"] if keep_date else menu.pop("launch_date")
+        grouped.setdefault(date, []).append(menu)
+    return grouped
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def create_menu(request: Request) -> Response:
     """Create new menu."""
-    if not hasattr(request.user, "restaurant"):
+    if get_restaurant_id(request.user) is None:
         raise PermissionDenied
     serializer = MenuSerializer(data=request.data)
 
@@ -79,3 +363,45 @@ def create_menu(request: Request) -> Response:
         result = {"details": serializer.errors}
 
     return Response(result, status=status_code)
+
+
+@api_view(["POST"])
+@authentication_classes([StatelessJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def create_menus_batch(request: Request) -> Response:
+    """Create multiple menus at once.
+
+    Expects '{"menus": [<menu>, ...], "atomic": bool}', each menu has the same
+    structure as for creating a single menu. The items are deduplicated across
+    the whole batch. Returns the IDs of the new menus in the same order.
+    If 'atomic' is true (default) nothing is created when any menu is invalid,
+    otherwise the valid menus are created and the invalid ones get 'null' ID.
+    """
+    if get_restaurant_id(request.user) is None:
+        raise PermissionDenied
+    batch = BatchMenuSerializer(data=request.data)
+    if not batch.is_valid():
+        return Response({"details": batch.errors},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    errors = []
+    valid_menus = []
+    for data in batch.validated_data["menus"]:  # pyright: ignore[reportIndexIssue, reportOptionalSubscript]
+        serializer = MenuSerializer(data=data)
+        if not serializer.is_valid():
+            errors.append(serializer.errors)
+        elif not serializer.validated_data.get("items"):  # pyright: ignore[reportAttributeAccessIssue]
+            errors.append({"items": [ITEMS_REQUIRED_MSG]})
+        else:
+            errors.append({})
+            valid_menus.append(serializer.validated_data)
+
+    failed = any(errors)
+    if failed and (batch.validated_data["atomic"] or not valid_menus):  # pyright: ignore[reportIndexIssue, reportOptionalSubscript]
+        return Response({"details": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    menus = iter(create_menus(valid_menus))
+    result: dict = {"menu_ids": [None if e else next(menus).id for e in errors]}
+    if failed:
+        result["details"] = errors
+    return Response(result, status=status.HTTP_201_CREATED)
@@ -1,4 +1,10 @@
+import base64
+import binascii
+import datetime
+
+from django.db.models import F, Q, Sum
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import (
     api_view,
@@ -8,22 +14,39 @@ from rest_framework.decorators import (
 from rest_framework.permissions import IsAdminUser
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.utils.urls import replace_query_param
 
+from api import fast_serializers, snapshots
+from api.authentication import CachedJWTAuthentication
 from api.serializers import RestaurantSerializer
-from base.models import Restaurant
+from base.models import (
+    Restaurant,
+    RestaurantDailyVoteTally,
+    RestaurantVoteTally,
+)
+
+# The number of days in the leaderboard periods, 'None' - all time.
+LEADERBOARD_PERIODS = {"week": 7, "month": 30, "all": None}
+LEADERBOARD_MAX_LIMIT = 100
+
+MENUS_PAGE_SIZE = 20
+MENUS_MAX_PAGE_SIZE = 100
 
 
 @api_view(["GET"])
-def get_restaurant(request: Request, pk: int) -> Response:  # noqa: ARG001
-    """Return a Restaurant for the given pk."""
-    r = get_object_or_404(Restaurant, pk=pk)
-    serializer = RestaurantSerializer(r, many=False)
-    return Response(serializer.data)
+@fast_serializers.with_fieldset(fast_serializers.restaurant_serializer)
+def get_restaurant(request: Request, pk: int,  # noqa: ARG001
+                   fieldset: fast_serializers.RowSerializer | None = None) -> Response:
+    """Return a Restaurant for the given pk.
+
+    '?fields=' limits the returned fields, e.g. '?fields=name'.
+    """
+    serializer = fieldset or fast_serializers.restaurant_serializer
+    return Response(serializer.get_or_404(pk))
 
 
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([CachedJWTAuthentication])
 @permission_classes([IsAdminUser])
 def create_restaurant(request: Request) -> Response:
     """Add new Restaurant to the DB."""
@@ -38,3 +61,119 @@ def create_restaurant(request: Request) -> Response:
         result = {"details": serializer.errors}
 
     return Response(result, status=status_code)
+
+
+@api_view(["GET"])
+def get_leaderboard(request: Request) -> Response:
+    """Return restaurants ranked by the net likes (likes - dislikes).
+
+    The ranking is read from the restaurant tallies maintained on each vote,
+    so the cost doesn't depend on the number of votes.
+
+    Query parameters:
+        period: 'week' (default), 'month' or 'all'.
+        limit: the number of restaurants, 10 by default.
+    """
+    period = request.query_params.get("period", "week")
+    if period not in LEADERBOARD_PERIODS:
+        err_msg = (f"Invalid period - '{period}'. "
+                   f"Allowed values are: {', '.join(LEADERBOARD_PERIODS)}")
+        return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
+    limit = request.query_params.get("limit", "10")
+    if not limit.isdigit() or not 0 < int(limit) <= LEADERBOARD_MAX_LIMIT:
+        err_msg = (f"Invalid limit - '{limit}'. "
+                   f"It must be a number from 1 to {LEADERBOARD_MAX_LIMIT}")
+        return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
+
+    days = LEADERBOARD_PERIODS[period]
+    if days is None:
+        tallies = RestaurantVoteTally.objects.all()
+    else:
+        today = timezone.now().date()
+        tallies = (
+            RestaurantDailyVoteTally.objects
+            .filter(date__range=(today - datetime.timedelta(days=days - 1), today))
+            .values("restaurant_id")
+            .annotate(likes=Sum("likes"), dislikes=Sum("dislikes"))
+        )
+    leaderboard = (
+        tallies.annotate(result=F("likes") - F("dislikes"))
+        .order_by("-result", "restaurant_id")
+        .values_list("restaurant_id", "restaurant__name",
+                     "likes", "dislikes", "result")[:int(limit)]
+    )
+    keys = ("restaurant_id", "name", "likes", "dislikes", "result")
+    return Response([dict(zip(keys, row, strict=True)) for row in leaderboard])
+
+
+def _encode_cursor(menu: dict) -> str:
+    """Encode the position after the menu as an opaque cursor."""
+    position = f"{menu['launch_date']}:{menu['id']}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime.date, int]:
+    """Return the position encoded in the cursor.
+
+    Raise ValueError if the cursor is invalid.
+    """
+    try:
+        position = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError(cursor) from e
+    date, _, menu_id = position.partition(":")
+    return datetime.date.fromisoformat(date), int(menu_id)
+
+
+@api_view(["GET"])
+@fast_serializers.with_fieldset(fast_serializers.menu_serializer)
+def get_restaurant_menus(
+        request: Request, pk: int,
+        fieldset: fast_serializers.MenuRowSerializer | None = None) -> Response:
+    """Return the menus of the restaurant, the newest first.
+
+    The keyset (cursor) pagination on '(launch_date, id)' is used,
+    so any page costs the same as the first one.
+
+    Query parameters:
+        cursor: the 'next' cursor from the previous page.
+        limit: the number of menus on the page, 20 by default.
+        fields, expand: the sparse fieldset of the menus
+            (see 'MenuRowSerializer.sparse').
+    """
+    restaurant = get_object_or_404(Restaurant, pk=pk)
+    limit = request.query_params.get("limit", str(MENUS_PAGE_SIZE))
+    if not limit.isdigit() or not 0 < int(limit) <= MENUS_MAX_PAGE_SIZE:
+        err_msg = (f"Invalid limit - '{limit}'. "
+                   f"It must be a number from 1 to {MENUS_MAX_PAGE_SIZE}")
+        return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
+
+    menus = restaurant.menus.order_by("-launch_date", "-id")
+    if cursor := request.query_params.get("cursor"):
+        try:
+            launch_date, menu_id = _decode_cursor(cursor)
+        except ValueError:
+            err_msg = f"Invalid cursor - '{cursor}'"
+            return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
+        menus = menus.filter(Q(launch_date__lt=launch_date)
+                             | Q(launch_date=launch_date, id__lt=menu_id))
+    # One extra menu tells whether there is the next page.
+    menus = menus[:int(limit) + 1]
+    if fieldset is None:
+        page = snapshots.read(menus)
+    else:
+        # The cursor is built from the launch date, even if it isn't requested.
+        page = fieldset.including("launch_date").serialize(menus)
+    next_url = None
+    if len(page) > int(limit):
+        page = page[:-1]
+        next_url = replace_query_param(request.build_absolute_uri(), "cursor",
+                                       _encode_cursor(page[-1]))
+    if fieldset is not None and "launch_date" not in fieldset.fields:
+        for menu in page:
+            del menu["launch_date"]
+
+    return Response({
+        "next": next_url,
+        "results": page,
+    })
@@ -0,0 +1,22 @@
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api import menus_cache, vote_buffer
+from api.authentication import CachedJWTAuthentication
+
+
+@api_view(["GET"])
+@authentication_classes([CachedJWTAuthentication])
+@permission_classes([IsAdminUser])
+def get_stats(request: Request) -> Response:  # noqa: ARG001
+    """Return the counters of the current process."""
+    return Response({
+        "vote_buffer": vote_buffer.get_buffer().stats(),
+        "menus_cache": menus_cache.stats(),
+    })
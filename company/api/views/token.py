@@ -0,0 +1,37 @@
+from rest_framework import status
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from api import authentication
+
+
+@api_view(["POST"])
+@authentication_classes([authentication.StatelessJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def revoke_tokens(request: Request) -> Response:
+    """Revoke the access token of the request (e.g. on logout).
+
+    Accepts '{"refresh": "<token>"}' to revoke the refresh token
+    of the same user too.
+    """
+    refresh = request.data.get("refresh") if isinstance(request.data, dict) else None
+    if refresh:
+        try:
+            token = authentication.RoleRefreshToken(refresh)
+        except TokenError as e:
+            return Response({"details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        user_claim = api_settings.USER_ID_CLAIM
+        if str(token.get(user_claim)) != str(request.auth[user_claim]):  # pyright: ignore[reportOptionalSubscript]
+            return Response({"details": "The refresh token belongs to another user"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        authentication.revoke_token(token)
+    authentication.revoke_token(request.auth)  # pyright: ignore[reportArgumentType]
+    return Response(status=status.HTTP_204_NO_CONTENT)
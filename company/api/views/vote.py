@@ -1,3 +1,18 @@
+import asyncio
+import datetime
+import threading
+import time
+from collections.abc import AsyncIterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import (
+    HttpRequest,
+    HttpResponseBase,
+    HttpResponseNotAllowed,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -8,69 +23,293 @@ from rest_framework.decorators import (
     permission_classes,
 )
 from rest_framework.exceptions import NotFound
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from api.serializers import DoVoteSerializer
-from base.models import Menu, Vote
+from api import pubsub, vote_buffer, vote_results
+from api.authentication import (
+    CachedJWTAuthentication,
+    StatelessJWTAuthentication,
+    get_employee_id,
+)
+from api.renderers import ORJSONRenderer
+from api.serializers import BatchVoteSerializer, DoVoteSerializer
+from base.models import Employee, Menu, Vote
+
+# Seconds between the keep-alive comments of the idle event stream.
+STREAM_KEEPALIVE = 15
 
 
 @api_view(["GET"])
-def get_vote_results(request: Request) -> Response:  # noqa: ARG001
-    """Return results for all today's menus."""
-    today = timezone.now().date()
-    today_menus = Menu.objects.filter(launch_date=today)
-
-    result = []
-    for menu in today_menus:
-        likes = menu.votes.filter(like=True).count()
-        dislikes = menu.votes.filter(like=False).count()
-        diff = likes - dislikes
-
-        result.append({
-            "menu_id": menu.id,
-            "likes": likes,
-            "dislikes": dislikes,
-            "result": diff,
+def get_vote_results(request: Request) -> Response:
+    """Return results for all today's menus.
+
+    The results are cached, the 'Age' header tells how many seconds ago
+    they were read from the DB.
+
+    Query parameters:
+        ordering: 'menu_id' (default), 'result' or '-result'.
+        include_empty: 'false' excludes menus without votes (default 'true').
+        from, to: return the finalized results of the date range
+            grouped by date instead (YYYY-MM-DD).
+    """
+    try:
+        date_range = vote_results.parse_date_range(request.query_params)
+        options = vote_results.parse_results_options(request.query_params)
+    except ValueError as e:
+        return Response({"details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if date_range:
+        daily_results = vote_results.get_daily_results(*date_range)
+        return Response({
+            date: vote_results.apply_results_options(results, *options)
+            for date, results in daily_results.items()
         })
-    return Response(result)
+
+    results, computed_at = vote_results.get_vote_results(timezone.now().date())
+
+    age = max(0, int(time.time() - computed_at))
+    return Response(vote_results.apply_results_options(results, *options),
+                    headers={"Age": str(age)})
+
+
+@api_view(["GET"])
+def get_vote_results_by_date(request: Request,
+                             year: int, month: int, day: int) -> Response:
+    """Return results for the menus of the given date.
+
+    The results of the past days are read from the finalized daily results.
+    Accepts the same 'ordering' and 'include_empty' query parameters
+    as the 'get_vote_results'.
+    """
+    try:
+        date = datetime.date(year=year, month=month, day=day)
+    except ValueError:
+        err_msg = (f"Invalid date - '{year}-{month}-{day}'. "
+                   "Correct format is YYYY-MM-DD")
+        return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        options = vote_results.parse_results_options(request.query_params)
+    except ValueError as e:
+        return Response({"details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    results, computed_at = vote_results.get_results_for_date(date)
+
+    age = max(0, int(time.time() - computed_at))
+    return Response(vote_results.apply_results_options(results, *options),
+                    headers={"Age": str(age)})
+
+
+async def stream_vote_results(request: HttpRequest) -> HttpResponseBase:
+    """Stream results for all today's menus as Server-Sent Events.
+
+    The results are sent on connect and then each time votes land,
+    but not more often than once per 'VOTE_RESULTS_STREAM_INTERVAL' seconds.
+    """
+    if request.method != "GET":
+        msg = f"""{{"detail": "Method \\"{request.method}\\" not allowed."}}"""
+        return HttpResponseNotAllowed(content=msg, permitted_methods=("GET",))
+
+    return StreamingHttpResponse(
+        _vote_results_events(),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class _ResultsEvent:
+    """Today's results event rendered once per change for all the streams.
+
+    The streams of the process are woken up together, only the first one
+    recomputes the results, the rest wait for it and reuse the rendered event.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._date: datetime.date | None = None
+        self._rendered_at = float("-inf")
+        self._content = b""
+
+    def get(self, since: float) -> bytes:
+        """Return the event rendered after 'since' ('time.monotonic()')."""
+        with self._lock:
+            date = timezone.now().date()
+            if self._rendered_at < since or self._date != date:
+                rendered_at = time.monotonic()
+                results, _ = vote_results.get_vote_results(date)
+                self._content = (b"event: results\ndata: "
+                                 + ORJSONRenderer().render(results) + b"\n\n")
+                self._date, self._rendered_at = date, rendered_at
+            return self._content
+
+
+_results_event = _ResultsEvent()
+
+
+async def _vote_results_events() -> AsyncIterator[bytes]:
+    """Yield an event with today's results after each change of the votes."""
+    interval = getattr(settings, "VOTE_RESULTS_STREAM_INTERVAL", 1)
+    get_event = sync_to_async(_results_event.get)
+    with pubsub.hub.subscribe(vote_results.TOPIC) as subscription:
+        # The event rendered after the subscription (or the last wake up)
+        # includes all the changes the stream was notified about.
+        since = time.monotonic()
+        while True:
+            yield await get_event(since)
+            # Votes which land during the sleep are coalesced into one event.
+            await asyncio.sleep(interval)
+            while True:
+                try:
+                    async with asyncio.timeout(STREAM_KEEPALIVE):
+                        await subscription.wait()
+                    since = time.monotonic()
+                    break
+                except TimeoutError:
+                    yield b": keep-alive\n\n"
 
 
 @csrf_exempt
 @api_view(["POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def do_vote(request: Request, menu_id: int) -> Response:
     """Add for the menu.
 
     The user must be authenticated and has related employee.
+    The employee is taken from the token claims, the user isn't loaded.
     """
-    if not hasattr(request.user, "employee"):
+    employee_id = get_employee_id(request.user)
+    if employee_id is None:
         raise NotFound(detail={"details": "Employee not found"})
     menu = get_object_or_404(Menu, pk=menu_id)
 
     serializer = DoVoteSerializer(data=request.data)
 
     if serializer.is_valid():
-        emp = request.user.employee
-        vote = Vote.objects.filter(menu=menu, employee=emp).first()
-        # An employee can't vote multiple times
-        if vote:
-            status_code = status.HTTP_400_BAD_REQUEST
-            action = "liked" if vote.like else "disliked"
-            err_msg = (f"You've already {action} this menu '{menu.title}'.")
-            result = {"details": err_msg}
-        else:
-            vote = Vote.objects.create(
-                menu=menu, employee=emp, like=serializer.data["like"],  # pyright: ignore[reportArgumentType, reportCallIssue]
-            )
-            action = "liked" if vote.like else "disliked"
-            status_code = status.HTTP_200_OK
-            result = {"vote_id": vote.id, "action": action}
+        like = serializer.data["like"]  # pyright: ignore[reportArgumentType, reportCallIssue]
+        if vote_buffer.is_enabled():
+            return _buffer_vote(Vote(menu=menu, employee_id=employee_id, like=like))
+        try:
+            # The menu tally is updated in the same transaction.
+            with transaction.atomic():
+                vote = Vote.objects.create(menu=menu, employee_id=employee_id,
+                                           like=like)
+        except IntegrityError:
+            # An employee can't vote multiple times,
+            # this is guaranteed by the unique constraint.
+            vote = Vote.objects.select_related("menu").filter(
+                menu=menu, employee_id=employee_id,
+            ).first()
+            if vote is None:
+                # The employee of the token claims is deleted.
+                raise NotFound(detail={"details": "Employee not found"}) from None
+            return _already_voted(vote)
+
+        action = "liked" if vote.like else "disliked"
+        status_code = status.HTTP_200_OK
+        result = {"vote_id": vote.id, "action": action}
+        vote_results.vote_results_changed(menu.launch_date)
     else:
         status_code = status.HTTP_400_BAD_REQUEST
         result = {"details": serializer.errors}
 
     return Response(result, status=status_code)
+
+
+def _already_voted(vote: Vote) -> Response:
+    """Build the response for the repeated vote of the employee."""
+    action = "liked" if vote.like else "disliked"
+    err_msg = (f"You've already {action} this menu '{vote.menu.title}'.")
+    return Response({"details": err_msg}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _buffer_vote(vote: Vote) -> Response:
+    """Accept the vote into the write-behind buffer.
+
+    The vote is claimed in the buffer before checking the DB,
+    so a concurrent flush can't slip a duplicate between the checks.
+    The vote in the DB is a duplicate only while this vote is still pending,
+    otherwise it's this vote inserted by a flush right after the claim.
+    """
+    buffer = vote_buffer.get_buffer()
+    if pending := buffer.add(vote):
+        return _already_voted(pending)
+    existing = Vote.objects.filter(
+        menu=vote.menu, employee_id=vote.employee_id,
+    ).select_related("menu").first()
+    if existing and buffer.discard(vote):
+        return _already_voted(existing)
+
+    action = "liked" if vote.like else "disliked"
+    return Response({"vote_id": None, "action": action},
+                    status=status.HTTP_202_ACCEPTED)
+
+
+@csrf_exempt
+@api_view(["POST"])
+@authentication_classes([CachedJWTAuthentication])
+@permission_classes([IsAdminUser])
+def do_batch_vote(request: Request) -> Response:
+    """Add multiple votes on behalf of the employees.
+
+    Expects a list of '{"employee_id": int, "menu_id": int, "like": bool}'.
+    Returns the status for each entry in the same order.
+    An employee still can vote for a menu only once.
+    """
+    serializer = BatchVoteSerializer(data=request.data, many=True)
+    if not serializer.is_valid():
+        return Response({"details": serializer.errors},
+                        status=status.HTTP_400_BAD_REQUEST)
+    entries: list[dict] = serializer.validated_data  # pyright: ignore[reportAssignmentType]
+
+    menus = Menu.objects.only("id", "title", "launch_date", "restaurant").in_bulk(
+        {e["menu_id"] for e in entries},
+    )
+    employee_ids = set(Employee.objects.filter(
+        pk__in={e["employee_id"] for e in entries},
+    ).values_list("id", flat=True))
+    voted = Vote.objects.filter(menu_id__in=menus, employee_id__in=employee_ids)
+    existing = {
+        (menu_id, employee_id): like
+        for menu_id, employee_id, like in voted.values_list(
+            "menu_id", "employee_id", "like",
+        )
+    }
+
+    results: list[dict | Vote] = []
+    new_votes = []
+    for entry in entries:
+        key = (entry["menu_id"], entry["employee_id"])
+        menu = menus.get(entry["menu_id"])
+        if menu is None:
+            results.append({"status": "rejected", "details": "Menu not found"})
+        elif entry["employee_id"] not in employee_ids:
+            results.append({"status": "rejected", "details": "Employee not found"})
+        elif key in existing:
+            action = "liked" if existing[key] else "disliked"
+            err_msg = f"The employee has already {action} this menu '{menu.title}'."
+            results.append({"status": "rejected", "details": err_msg})
+        else:
+            existing[key] = entry["like"]
+            vote = Vote(menu=menu, employee_id=entry["employee_id"],
+                        like=entry["like"])
+            new_votes.append(vote)
+            results.append(vote)
+
+    created = Vote.objects.bulk_create_counted(new_votes)
+    for date in {v.menu.launch_date for v in created}:
+        vote_results.vote_results_changed(date)
+
+    return Response([_batch_vote_result(r) for r in results])
+
+
+def _batch_vote_result(result: dict | Vote) -> dict:
+    """Build the status of the batch entry."""
+    if isinstance(result, dict):
+        return result
+    if result.pk is None:
+        return {"status": "rejected",
+                "details": "The employee has already voted for this menu."}
+    action = "liked" if result.like else "disliked"
+    return {"status": "created", "vote_id": result.id, "action": action}
@@ -0,0 +1,183 @@
+"""Write-behind buffer for the votes.
+
+When it's enabled by the 'VOTE_WRITE_BEHIND' setting, 'do_vote' doesn't
+insert the votes one by one. The accepted votes are kept in the process
+memory and inserted with 'bulk_create' every 'FLUSH_INTERVAL_MS'
+milliseconds or as soon as 'MAX_BATCH_SIZE' votes are pending.
+The buffer is flushed on the interpreter shutdown, but the pending votes
+are lost if the process is killed.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from api import vote_results
+from base.models import Vote
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "FLUSH_INTERVAL_MS": 200,
+    "MAX_BATCH_SIZE": 500,
+}
+
+
+class VoteBuffer:
+    """Thread-safe buffer of the accepted, but not inserted yet votes.
+
+    An employee can have only one pending vote for a menu,
+    the vote stays pending until it's committed to the DB.
+    """
+
+    def __init__(self, flush_interval: float, max_batch_size: int) -> None:  # noqa: D107
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._pending: dict[tuple[int, int], Vote] = {}
+        self._lock = threading.Lock()
+        # Only one flush at a time, so the votes are not inserted twice.
+        self._flush_lock = threading.Lock()
+        self._wake_up = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+        self.flushes = 0
+        self.flushed_votes = 0
+        self.rejected_votes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def add(self, vote: Vote) -> Vote | None:
+        """Add the vote to the buffer.
+
+        Return the pending vote of the employee for the menu
+        if there is one, the new vote is not added in this case.
+        """
+        key = (vote.menu_id, vote.employee_id)
+        with self._lock:
+            if pending := self._pending.get(key):
+                return pending
+            self._pending[key] = vote
+            depth = len(self._pending)
+
+        self._start_flusher()
+        if depth >= self.max_batch_size:
+            self._wake_up.set()
+        return None
+
+    def discard(self, vote: Vote) -> bool:
+        """Remove the pending vote from the buffer.
+
+        Return False if the vote isn't pending, i.e. it's already flushed.
+        Waits for the running flush, so the vote being inserted isn't discarded.
+        """
+        key = (vote.menu_id, vote.employee_id)
+        with self._flush_lock, self._lock:
+            if self._pending.get(key) is vote:
+                del self._pending[key]
+                return True
+            return False
+
+    @property
+    def depth(self) -> int:
+        """Return the number of the pending votes."""
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Insert the pending votes into the DB.
+
+        Return the number of the inserted votes.
+        """
+        with self._flush_lock:
+            with self._lock:
+                votes = list(self._pending.values())
+            if not votes:
+                return 0
+
+            start = time.perf_counter()
+            created = Vote.objects.bulk_create_counted(votes)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with self._lock:
+                for vote in votes:
+                    # The key can hold another vote added after the discard.
+                    key = (vote.menu_id, vote.employee_id)
+                    if self._pending.get(key) is vote:
+                        del self._pending[key]
+                self.flushes += 1
+                self.flushed_votes += len(created)
+                self.rejected_votes += len(votes) - len(created)
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                self.total_flush_ms += elapsed_ms
+
+        for date in {v.menu.launch_date for v in created}:
+            vote_results.vote_results_changed(date)
+        return len(created)
+
+    def stats(self) -> dict:
+        """Return the counters of the buffer."""
+        with self._lock:
+            return {
+                "depth": len(self._pending),
+                "flushes": self.flushes,
+                "flushed_votes": self.flushed_votes,
+                "rejected_votes": self.rejected_votes,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "max_flush_ms": round(self.max_flush_ms, 3),
+                "avg_flush_ms": round(self.total_flush_ms / (self.flushes or 1), 3),
+            }
+
+    def _start_flusher(self) -> None:
+        """Start the background thread flushing the buffer periodically."""
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run, name="vote-buffer-flusher", daemon=True,
+            )
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wake_up.wait(self.flush_interval)
+            self._wake_up.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The votes stay pending and will be retried on the next flush.
+                logger.exception("Failed to flush %s votes", self.depth)
+            finally:
+                close_old_connections()
+
+
+_buffer: VoteBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def get_config() -> dict:
+    """Return the 'VOTE_WRITE_BEHIND' setting merged with the defaults."""
+    return DEFAULTS | getattr(settings, "VOTE_WRITE_BEHIND", {})
+
+
+def is_enabled() -> bool:
+    """Check whether the votes are written through the buffer."""
+    return get_config()["ENABLED"]
+
+
+def get_buffer() -> VoteBuffer:
+    """Return the buffer of the process, creating it on the first call."""
+    global _buffer  # noqa: PLW0603
+    with _buffer_lock:
+        if _buffer is None:
+            config = get_config()
+            _buffer = VoteBuffer(
+                flush_interval=config["FLUSH_INTERVAL_MS"] / 1000,
+                max_batch_size=config["MAX_BATCH_SIZE"],
+            )
+        return _buffer
@@ -0,0 +1,237 @@
+"""Vote results of the menus and the cache for them."""
+import datetime
+import time
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api import pubsub
+from base.models import DailyMenuResult, Menu
+
+CACHE_KEY = "vote_results:{date}:{generation}"
+# Changes when the votes of the date change, the results cached with
+# another generation are stale (even if they are stored after the change).
+GENERATION_CACHE_KEY = "vote_results:{date}:generation"
+# How long the results are cached when the max staleness isn't configured.
+CACHE_TIMEOUT = 60 * 60
+# The pub/sub topic for the vote results changes.
+TOPIC = "vote_results"
+
+# The longest date range of the historical results.
+MAX_RANGE_DAYS = 366
+
+RESULTS_ORDERING: dict[str, Callable[[dict], Any]] = {
+    "menu_id": lambda r: r["menu_id"],
+    "result": lambda r: (r["result"], r["menu_id"]),
+    "-result": lambda r: (-r["result"], r["menu_id"]),
+}
+
+
+def get_max_staleness() -> int:
+    """Return for how many seconds the cached results can be served.
+
+    0 means the results are cached until a new vote invalidates them
+    (for 'CACHE_TIMEOUT' seconds at most).
+    """
+    return getattr(settings, "VOTE_RESULTS_MAX_STALENESS", 0)
+
+
+def parse_results_options(
+        params: Mapping[str, str]) -> tuple[Callable[[dict], Any], bool]:
+    """Return the sort key and the 'include_empty' flag from the query params.
+
+    Raise ValueError with the description if the params are invalid.
+    """
+    ordering = params.get("ordering", "menu_id")
+    if ordering not in RESULTS_ORDERING:
+        err_msg = (f"Invalid ordering - '{ordering}'. "
+                   f"Allowed values are: {', '.join(RESULTS_ORDERING)}")
+        raise ValueError(err_msg)
+    include_empty = params.get("include_empty", "true").lower()
+    if include_empty not in ("true", "false"):
+        err_msg = (f"Invalid include_empty - '{include_empty}'. "
+                   "Allowed values are: true, false")
+        raise ValueError(err_msg)
+    return RESULTS_ORDERING[ordering], include_empty == "true"
+
+
+def apply_results_options(results: list[dict], sort_key: Callable[[dict], Any],
+                          include_empty: bool) -> list[dict]:  # noqa: FBT001
+    """Filter and sort the results according to the query params."""
+    if not include_empty:
+        results = [r for r in results if r["likes"] or r["dislikes"]]
+    return sorted(results, key=sort_key)
+
+
+def parse_date_range(
+        params: Mapping[str, str],
+        max_days: int = MAX_RANGE_DAYS) -> tuple[datetime.date, datetime.date] | None:
+    """Return the 'from' and 'to' dates from the query params.
+
+    Return None if the params have no dates.
+    The range can't be longer than 'max_days'.
+    Raise ValueError with the description if the dates are invalid.
+    """
+    if "from" not in params and "to" not in params:
+        return None
+    if "from" not in params or "to" not in params:
+        msg = "Both 'from' and 'to' are required for the date range"
+        raise ValueError(msg)
+
+    dates = []
+    for value in (params["from"], params["to"]):
+        try:
+            dates.append(datetime.date.fromisoformat(value))
+        except ValueError:
+            err_msg = f"Invalid date - '{value}'. Correct format is YYYY-MM-DD"
+            raise ValueError(err_msg) from None
+    first_day, last_day = dates
+    if first_day > last_day:
+        msg = "'from' can't be after 'to'"
+        raise ValueError(msg)
+    if (last_day - first_day).days >= max_days:
+        msg = f"The date range can't be longer than {max_days} days"
+        raise ValueError(msg)
+    return first_day, last_day
+
+
+def _results_queryset(date: datetime.date) -> QuerySet:
+    """Build the query for the results of the menus of the given date.
+
+    The results are read from the precomputed menu tallies,
+    so the cost depends on the number of menus, not on the number of votes.
+    """
+    return (
+        Menu.objects.filter(launch_date=date)
+        .values(
+            menu_id=F("id"),
+            likes=Coalesce("tally__likes", 0),
+            dislikes=Coalesce("tally__dislikes", 0),
+        )
+        .annotate(result=F("likes") - F("dislikes"))
+        .order_by("menu_id")
+    )
+
+
+def compute_vote_results(date: datetime.date) -> list[dict]:
+    """Read the results for the menus of the given date from the DB."""
+    return list(_results_queryset(date))
+
+
+def _cache_timeout() -> int:
+    return get_max_staleness() or CACHE_TIMEOUT
+
+
+def get_vote_results(date: datetime.date) -> tuple[list[dict], float]:
+    """Return the results for the given date and the time they were computed at.
+
+    The results are taken from the cache when possible.
+    """
+    generation = cache.get(GENERATION_CACHE_KEY.format(date=date))
+    key = CACHE_KEY.format(date=date, generation=generation)
+    entry = cache.get(key)
+    if entry is None:
+        entry = (time.time(), compute_vote_results(date))
+        cache.set(key, entry, timeout=_cache_timeout())
+
+    computed_at, results = entry
+    return results, computed_at
+
+
+async def aget_vote_results(date: datetime.date) -> tuple[list[dict], float]:
+    """Async version of the 'get_vote_results'."""
+    generation = await cache.aget(GENERATION_CACHE_KEY.format(date=date))
+    key = CACHE_KEY.format(date=date, generation=generation)
+    entry = await cache.aget(key)
+    if entry is None:
+        results = [r async for r in _results_queryset(date)]
+        entry = (time.time(), results)
+        await cache.aset(key, entry, timeout=_cache_timeout())
+
+    computed_at, results = entry
+    return results, computed_at
+
+
+def vote_results_changed(date: datetime.date) -> None:
+    """Handle new votes for the menus of the given date.
+
+    Once the transaction commits the cached results are invalidated
+    (by the new generation) and the subscribers of the 'TOPIC' are notified.
+    When the max staleness is configured the results are not invalidated,
+    they expire on their own, so the DB is queried at most once per interval.
+    """
+    def on_commit() -> None:
+        if not get_max_staleness():
+            # The generation must outlive the results cached before it.
+            cache.set(GENERATION_CACHE_KEY.format(date=date), uuid.uuid4().hex,
+                      timeout=2 * CACHE_TIMEOUT)
+        pubsub.hub.publish(TOPIC)
+
+    transaction.on_commit(on_commit)
+
+
+def _daily_results_queryset(first_day: datetime.date,
+                            last_day: datetime.date) -> QuerySet:
+    """Build the query for the finalized results of the given days.
+
+    Only the rollup table is read, so the cost doesn't depend
+    on the number of votes.
+    """
+    return (
+        DailyMenuResult.objects.filter(date__range=(first_day, last_day))
+        .values("date", "menu_id", "likes", "dislikes")
+        .annotate(result=F("likes") - F("dislikes"))
+        .order_by("date", "menu_id")
+    )
+
+
+def _group_by_date(rows: Iterable[dict]) -> dict[str, list[dict]]:
+    """Group the rows of the daily results by their dates."""
+    grouped: dict[str, list[dict]] = {}
+    for row in rows:
+        date = row.pop("date").isoformat()
+        grouped.setdefault(date, []).append(row)
+    return grouped
+
+
+def get_daily_results(first_day: datetime.date,
+                      last_day: datetime.date) -> dict[str, list[dict]]:
+    """Return the finalized results of the given days grouped by date.
+
+    The days without the finalized results are omitted.
+    """
+    return _group_by_date(_daily_results_queryset(first_day, last_day))
+
+
+async def aget_daily_results(first_day: datetime.date,
+                             last_day: datetime.date) -> dict[str, list[dict]]:
+    """Async version of the 'get_daily_results'."""
+    return _group_by_date(
+        [r async for r in _daily_results_queryset(first_day, last_day)],
+    )
+
+
+def get_results_for_date(date: datetime.date) -> tuple[list[dict], float]:
+    """Return the results for the given date and the time they were computed at.
+
+    The results of the finalized days are read from the rollup table,
+    the rest are computed from the menu tallies.
+    """
+    if date < timezone.now().date():
+        rows = list(
+            DailyMenuResult.objects.filter(date=date)
+            .values("menu_id", "likes", "dislikes", "finalized_at")
+            .annotate(result=F("likes") - F("dislikes"))
+            .order_by("menu_id"),
+        )
+        if rows:
+            finalized_at = max(row.pop("finalized_at") for row in rows)
+            return rows, finalized_at.timestamp()
+    return get_vote_results(date)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BaseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'base'
+
+    def ready(self) -> None:
+        # Connect the signal handlers.
+        from base import signals  # noqa: F401, PLC0415
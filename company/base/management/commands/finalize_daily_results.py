@@ -0,0 +1,70 @@
+"""Finalize the vote results of the past days."""
+import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from base.models import DailyMenuResult, Menu
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """Write 'DailyMenuResult' rows from the menu tallies."""
+
+    help = ("Finalize the vote results of the menus for the given days. "
+            "The already finalized results are overwritten.")
+
+    def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--date",
+            type=datetime.date.fromisoformat,
+            help="The last day to finalize (YYYY-MM-DD), yesterday by default.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="How many days up to the '--date' to finalize, 1 by default.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401, ARG002, D102
+        today = timezone.now().date()
+        last_day = options["date"] or today - datetime.timedelta(days=1)
+        if last_day >= today:
+            msg = f"The day {last_day} is not over yet"
+            raise CommandError(msg)
+        if options["days"] < 1:
+            msg = "'--days' must be a positive number"
+            raise CommandError(msg)
+        first_day = last_day - datetime.timedelta(days=options["days"] - 1)
+
+        menus = (
+            Menu.objects.filter(launch_date__range=(first_day, last_day))
+            .annotate(
+                likes=Coalesce("tally__likes", 0),
+                dislikes=Coalesce("tally__dislikes", 0),
+            )
+            .values_list("id", "launch_date", "likes", "dislikes")
+        )
+        results = [
+            DailyMenuResult(menu_id=menu_id, date=date,
+                            likes=likes, dislikes=dislikes)
+            for menu_id, date, likes, dislikes in menus.iterator()
+        ]
+        with transaction.atomic():
+            DailyMenuResult.objects.bulk_create(
+                results,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["menu"],
+                update_fields=["date", "likes", "dislikes", "finalized_at"],
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Finalized results of {len(results)} menus "
+            f"from {first_day} to {last_day}",
+        ))
@@ -0,0 +1,185 @@
+"""Import the menus from a JSONL or a CSV file."""
+import csv
+import datetime
+import itertools
+import json
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter
+from typing import IO, Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import IntegrityError
+
+from api.serializers import create_menus
+from base.models import Restaurant
+
+BATCH_SIZE = 1000
+CSV_COLUMNS = ("menu", "restaurant", "launch_date", "title", "notes",
+               "item_title", "item_description")
+
+
+def _parse_menu(record: dict) -> dict:
+    """Return the menu data of the record, raise ValueError if it's invalid."""
+    if not isinstance(record, dict):
+        msg = "The menu must be an object"
+        raise ValueError(msg)  # noqa: TRY004
+    try:
+        restaurant = int(record["restaurant"])
+        launch_date = datetime.date.fromisoformat(record["launch_date"])
+    except KeyError as e:
+        msg = f"'{e.args[0]}' is the required parameter"
+        raise ValueError(msg) from e
+    except (TypeError, ValueError) as e:
+        msg = f"Invalid restaurant or launch date - {e}"
+        raise ValueError(msg) from e
+    items = record.get("items")
+    if not items or not isinstance(items, list):
+        msg = "'items' is the required parameter. It can't be null or an empty array"
+        raise ValueError(msg)
+    for item in items:
+        if (not isinstance(item, dict)
+                or not isinstance(item.get("title"), str) or not item["title"]
+                or not isinstance(item.get("description"), str)
+                or not item["description"]):
+            msg = f"Invalid item - {item!r}, 'title' and 'description' are required"
+            raise ValueError(msg)
+    return {
+        "restaurant": restaurant,
+        "launch_date": launch_date,
+        "title": record.get("title") or "",
+        "notes": record.get("notes") or "",
+        "items": [{"title": item["title"], "description": item["description"]}
+                  for item in items],
+    }
+
+
+def read_jsonl(stream: IO[str]) -> Iterator[tuple[int, int, dict | str]]:
+    """Yield '(line number, rows, menu data or error)', a menu per line."""
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, 1, _parse_menu(json.loads(line))
+        except ValueError as e:  # 'JSONDecodeError' is 'ValueError' too.
+            yield line_num, 1, str(e)
+
+
+def read_csv(stream: IO[str]) -> Iterator[tuple[int, int, dict | str]]:
+    """Yield '(line number, rows, menu data or error)', an item link per row.
+
+    The consecutive rows with the same 'menu' (the ID of the menu in the source
+    system, it's used for the grouping only) are the items of one menu.
+    """
+    reader = csv.DictReader(stream)
+    if missing := set(CSV_COLUMNS).difference(reader.fieldnames or ()):
+        msg = f"Missing CSV columns - {', '.join(sorted(missing))}"
+        raise CommandError(msg)
+    numbered = ((reader.line_num, row) for row in reader)
+    for _, group in itertools.groupby(numbered, key=lambda pair: pair[1]["menu"]):
+        (line_num, first), *others = group
+        rows = [first, *(row for _, row in others)]
+        record = first | {"items": [
+            {"title": row["item_title"], "description": row["item_description"]}
+            for row in rows
+        ]}
+        try:
+            yield line_num, len(rows), _parse_menu(record)
+        except ValueError as e:
+            yield line_num, len(rows), str(e)
+
+
+class Command(BaseCommand):
+    """Create the menus with their items from a file in batches."""
+
+    help = ("Import the menus from a JSONL (a menu per line, the same structure as "
+            "for creating a menu plus 'restaurant') or a CSV file (a row per item "
+            f"with the columns: {', '.join(CSV_COLUMNS)}). "
+            "The items are reused by the title as when a menu is created.")
+    stealth_options = ("stdin",)
+
+    def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
+        parser.add_argument("path", help="The file to import, '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=("jsonl", "csv"),
+            help="The format of the file, by its extension by default "
+                 "('jsonl' for stdin).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"How many menus to create in one transaction, "
+                 f"{BATCH_SIZE} by default.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401, ARG002, D102
+        if options["batch_size"] < 1:
+            msg = "'--batch-size' must be a positive number"
+            raise CommandError(msg)
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        read = read_csv if fmt == "csv" else read_jsonl
+
+        if path == "-":
+            self._import(read(options.get("stdin") or sys.stdin), options)
+            return
+        try:
+            with Path(path).open(newline="", encoding="utf-8") as stream:
+                self._import(read(stream), options)
+        except OSError as e:
+            raise CommandError(e) from e
+
+    def _import(self, records: Iterator[tuple[int, int, dict | str]],
+                options: dict) -> None:
+        start = perf_counter()
+        rows = menus = skipped = 0
+        while batch := list(itertools.islice(records, options["batch_size"])):
+            restaurants = Restaurant.objects.only("id").in_bulk(
+                {data["restaurant"] for _, _, data in batch if isinstance(data, dict)},
+            )
+            valid = []
+            for line_num, count, data in batch:
+                rows += count
+                if isinstance(data, dict) and data["restaurant"] not in restaurants:
+                    data = f"Restaurant {data['restaurant']} doesn't exist"  # noqa: PLW2901
+                if isinstance(data, str):
+                    skipped += 1
+                    self.stderr.write(f"Line {line_num}: {data}")
+                else:
+                    restaurant = restaurants[data["restaurant"]]
+                    valid.append((line_num, data | {"restaurant": restaurant}))
+            failed = self._create(valid) if valid else 0
+            menus += len(valid) - failed
+            skipped += failed
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Imported {menus} menus, "
+                                  f"{rows / (perf_counter() - start):.0f} rows/sec")
+
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {menus} menus from {rows} rows in {elapsed:.1f}s "
+            f"({rows / (elapsed or 1):.0f} rows/sec), skipped {skipped} menus",
+        ))
+
+    def _create(self, valid: list[tuple[int, dict]]) -> int:
+        """Create the menus of the batch, return how many of them failed.
+
+        If the batch conflicts with the concurrent changes (e.g. a restaurant
+        is deleted after the check), it's rolled back and the menus are created
+        one by one, the failed ones are reported and skipped.
+        """
+        try:
+            create_menus([data for _, data in valid], copy=True)
+        except IntegrityError:
+            failed = 0
+            for line_num, data in valid:
+                try:
+                    create_menus([data], copy=True)
+                except IntegrityError as e:
+                    failed += 1
+                    self.stderr.write(f"Line {line_num}: {e}")
+            return failed
+        return 0
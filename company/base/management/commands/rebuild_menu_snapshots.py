@@ -0,0 +1,54 @@
+"""Build the pre-rendered snapshots of the menus."""
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from api import snapshots
+from base.models import Menu
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Fill 'Menu.snapshot' of the existing menus in batches."""
+
+    help = ("Build the snapshots of the menus without them "
+            "(or of all the menus with '--all').")
+
+    def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild the snapshots of all the menus, not only the missing ones.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"How many menus to rebuild in one transaction, "
+                 f"{BATCH_SIZE} by default.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401, ARG002, D102
+        if options["batch_size"] < 1:
+            msg = "'--batch-size' must be a positive number"
+            raise CommandError(msg)
+
+        menus = Menu.objects.all()
+        if not options["all"]:
+            menus = menus.filter(snapshot__isnull=True)
+        total = 0
+        last_id = 0
+        # The keyset pagination, the rebuilt menus don't shift the batches.
+        while ids := list(
+            menus.filter(id__gt=last_id).order_by("id")
+            .values_list("id", flat=True)[:options["batch_size"]],
+        ):
+            with transaction.atomic():
+                total += snapshots.rebuild(Menu.objects.filter(id__in=ids))
+            last_id = ids[-1]
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Rebuilt {total} snapshots")
+
+        self.stdout.write(f"Rebuilt the snapshots of {total} menus")
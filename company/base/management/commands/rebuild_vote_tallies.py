@@ -0,0 +1,91 @@
+"""Rebuild the precomputed vote tallies from the votes."""
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from base.models import (
+    MenuVoteTally,
+    RestaurantDailyVoteTally,
+    RestaurantVoteTally,
+    Vote,
+    VoteTally,
+)
+
+COUNTS = {
+    "likes": Count("id", filter=Q(like=True)),
+    "dislikes": Count("id", filter=Q(like=False)),
+}
+
+
+class Command(BaseCommand):
+    """Reconcile the tallies of the menus and restaurants with the 'Vote' table."""
+
+    help = "Recount the vote tallies and fix the ones that drifted."
+
+    def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report the drifted tallies without changing them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401, ARG002, D102
+        # The tally model and its key fields mapped to the vote lookups.
+        tallies = (
+            (MenuVoteTally, {"menu_id": "menu_id"}),
+            (RestaurantVoteTally, {"restaurant_id": "menu__restaurant"}),
+            (RestaurantDailyVoteTally, {"restaurant_id": "menu__restaurant",
+                                        "date": "menu__launch_date"}),
+        )
+        missing = drifted = 0
+        with transaction.atomic():
+            for model, key in tallies:
+                m, d = self.reconcile(model, key, check=options["check"])
+                missing += m
+                drifted += d
+
+        action = "Found" if options["check"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {missing} missing and {drifted} drifted tallies",
+        ))
+
+    @staticmethod
+    def reconcile(model: type[VoteTally], key: dict[str, str], *,
+                  check: bool) -> tuple[int, int]:
+        """Compare the tallies with the votes grouped by the tally key.
+
+        Return the number of the missing and the drifted tallies.
+        """
+        tallies = {
+            tuple(getattr(t, f) for f in key): t
+            for t in model.objects.select_for_update()
+        }
+        votes = Vote.objects.values(*key.values()).annotate(**COUNTS).order_by()
+        missing = []
+        drifted = []
+        now = timezone.now()
+        for row in votes.iterator():
+            values = {f: row[lookup] for f, lookup in key.items()}
+            tally = tallies.pop(tuple(values.values()), None)
+            if tally is None:
+                missing.append(model(likes=row["likes"], dislikes=row["dislikes"],
+                                     **values))
+            elif (tally.likes, tally.dislikes) != (row["likes"], row["dislikes"]):
+                tally.likes, tally.dislikes = row["likes"], row["dislikes"]
+                drifted.append(tally)
+        # The tallies without votes must be zeroed.
+        for tally in tallies.values():
+            if tally.likes or tally.dislikes:
+                tally.likes = tally.dislikes = 0
+                drifted.append(tally)
+
+        if not check:
+            for tally in drifted:
+                # 'bulk_update' doesn't touch 'auto_now' fields.
+                tally.updated_at = now
+            model.objects.bulk_create(missing)
+            model.objects.bulk_update(drifted, ["likes", "dislikes", "updated_at"])
+        return len(missing), len(drifted)
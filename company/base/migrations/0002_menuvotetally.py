@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_tallies(apps, schema_editor):
+    Menu = apps.get_model("base", "Menu")
+    MenuVoteTally = apps.get_model("base", "MenuVoteTally")
+
+    counts = (
+        Menu.objects.filter(votes__isnull=False)
+        .values("id")
+        .annotate(
+            likes=Count("votes", filter=Q(votes__like=True)),
+            dislikes=Count("votes", filter=Q(votes__like=False)),
+        )
+    )
+    MenuVoteTally.objects.bulk_create(
+        MenuVoteTally(menu_id=c["id"], likes=c["likes"], dislikes=c["dislikes"])
+        for c in counts.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuVoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('dislikes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('menu', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tally', to='base.menu')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(fill_tallies, migrations.RunPython.noop),
+    ]
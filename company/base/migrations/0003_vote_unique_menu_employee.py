@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:48
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+
+
+def remove_duplicated_votes(apps, schema_editor):
+    """Keep only the first vote of an employee for a menu."""
+    Vote = apps.get_model("base", "Vote")
+    MenuVoteTally = apps.get_model("base", "MenuVoteTally")
+
+    duplicates = (
+        Vote.objects.values("menu_id", "employee_id")
+        .annotate(first_id=Min("id"), n=Count("id"))
+        .filter(n__gt=1)
+    )
+    menu_ids = set()
+    for dup in duplicates.iterator():
+        Vote.objects.filter(
+            menu_id=dup["menu_id"], employee_id=dup["employee_id"],
+        ).exclude(id=dup["first_id"]).delete()
+        menu_ids.add(dup["menu_id"])
+
+    # Recount the tallies of the affected menus.
+    for menu_id in menu_ids:
+        MenuVoteTally.objects.filter(menu_id=menu_id).update(**Vote.objects.filter(
+            menu_id=menu_id,
+        ).aggregate(
+            likes=Count("id", filter=Q(like=True)),
+            dislikes=Count("id", filter=Q(like=False)),
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0002_menuvotetally'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_votes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('menu', 'employee'), name='unique_menu_employee_vote'),
+        ),
+    ]
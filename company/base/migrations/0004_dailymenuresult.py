@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_vote_unique_menu_employee'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMenuResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('likes', models.PositiveIntegerField()),
+                ('dislikes', models.PositiveIntegerField()),
+                ('finalized_at', models.DateTimeField(auto_now=True)),
+                ('menu', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='daily_result', to='base.menu')),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_tallies(apps, schema_editor):
+    Vote = apps.get_model("base", "Vote")
+    RestaurantVoteTally = apps.get_model("base", "RestaurantVoteTally")
+    RestaurantDailyVoteTally = apps.get_model("base", "RestaurantDailyVoteTally")
+
+    counts = {
+        "likes": Count("id", filter=Q(like=True)),
+        "dislikes": Count("id", filter=Q(like=False)),
+    }
+    RestaurantVoteTally.objects.bulk_create(
+        RestaurantVoteTally(restaurant_id=c["menu__restaurant"],
+                            likes=c["likes"], dislikes=c["dislikes"])
+        for c in Vote.objects.values("menu__restaurant").annotate(**counts)
+        .order_by().iterator()
+    )
+    RestaurantDailyVoteTally.objects.bulk_create(
+        RestaurantDailyVoteTally(restaurant_id=c["menu__restaurant"],
+                                 date=c["menu__launch_date"],
+                                 likes=c["likes"], dislikes=c["dislikes"])
+        for c in Vote.objects.values("menu__restaurant", "menu__launch_date")
+        .annotate(**counts).order_by().iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0004_dailymenuresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RestaurantVoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('dislikes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('restaurant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tally', to='base.restaurant')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RestaurantDailyVoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('dislikes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_tallies', to='base.restaurant')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('restaurant', 'date'), name='unique_restaurant_daily_tally')],
+            },
+        ),
+        migrations.RunPython(fill_tallies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:01
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicated_items(apps, schema_editor):
+    """Keep only the first item with the title in a restaurant.
+
+    The menus of the removed duplicates are moved to the kept item.
+    """
+    MenuItem = apps.get_model("base", "MenuItem")
+    Through = MenuItem.menu.through
+
+    duplicates = (
+        MenuItem.objects.values("restaurant_id", "title")
+        .annotate(first_id=Min("id"), n=Count("id"))
+        .filter(n__gt=1)
+    )
+    for dup in duplicates.iterator():
+        others = MenuItem.objects.filter(
+            restaurant_id=dup["restaurant_id"], title=dup["title"],
+        ).exclude(id=dup["first_id"])
+        linked = set(Through.objects.filter(
+            menuitem_id=dup["first_id"],
+        ).values_list("menu_id", flat=True))
+        menu_ids = set(Through.objects.filter(
+            menuitem__in=others,
+        ).values_list("menu_id", flat=True))
+        Through.objects.bulk_create(
+            Through(menu_id=menu_id, menuitem_id=dup["first_id"])
+            for menu_id in menu_ids - linked
+        )
+        others.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0005_restaurant_vote_tallies'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicated_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='menuitem',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'title'), name='unique_restaurant_item_title'),
+        ),
+    ]
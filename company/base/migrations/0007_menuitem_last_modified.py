@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0006_menuitem_unique_restaurant_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0007_menuitem_last_modified'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menu',
+            index=models.Index(fields=['restaurant', '-launch_date', '-id'], name='menu_restaurant_history_idx'),
+        ),
+    ]
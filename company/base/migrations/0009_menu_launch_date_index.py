@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_menu_restaurant_history_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='menu',
+            name='launch_date',
+            field=models.DateField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """Add the index on PostgreSQL only, the other DBs don't support GIN."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Compute the search vectors of the existing items."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    MenuItem = apps.get_model("base", "MenuItem")
+    MenuItem.objects.update(search_vector=(
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("description", weight="B", config="english")
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0009_menu_launch_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        AddPostgresIndex(
+            model_name='menuitem',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='menuitem_search_vector_idx'),
+        ),
+    ]
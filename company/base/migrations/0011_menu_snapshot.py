@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0010_menuitem_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menu',
+            name='snapshot',
+            field=models.JSONField(editable=False, null=True),
+        ),
+    ]
@@ -1,10 +1,16 @@
-from ast import mod
-from typing import TYPE_CHECKING  # noqa: D100
+from collections import defaultdict  # noqa: D100
+from typing import TYPE_CHECKING
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchVector, SearchVectorField
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from django_stubs_ext.db.models.manager import ManyRelatedManager, RelatedManager
 
 
@@ -67,6 +73,21 @@ class Restaurant(BaseReprAndStr, models.Model):
     date_joined = models.DateTimeField(auto_now_add=True)
 
 
+class MenuQuerySet(models.QuerySet):
+    """Custom queryset for the 'Menu' model."""
+
+    def for_read(self) -> "MenuQuerySet":
+        """Return menus with the items loaded by a single extra query.
+
+        Used by the read endpoints to serialize any number of menus
+        with the nested items without a query per menu.
+        The items are ordered by id.
+        """
+        return self.prefetch_related(
+            models.Prefetch("items", queryset=MenuItem.objects.order_by("id")),
+        )
+
+
 class Menu(BaseReprAndStr, models.Model):
     """A menu entry.
 
@@ -80,17 +101,70 @@ class Menu(BaseReprAndStr, models.Model):
     title = models.CharField(blank=True, default="")
     notes = models.TextField(blank=True, default="")
     # Date when the menu must be shown.
-    launch_date = models.DateField()
+    launch_date = models.DateField(db_index=True)
 
     date_created = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
+    # The pre-rendered representation of the menu with its items,
+    # NULL if it's not built yet or outdated (see 'api.snapshots').
+    snapshot = models.JSONField(null=True, editable=False)
+
+    objects = MenuQuerySet.as_manager()
+
+    class Meta:  # noqa: D106
+        indexes = (
+            # The keyset pagination of the restaurant menus history.
+            models.Index(fields=("restaurant", "-launch_date", "-id"),
+                         name="menu_restaurant_history_idx"),
+        )
 
     if TYPE_CHECKING:
         items: ManyRelatedManager["MenuItem"]
         votes: RelatedManager["Vote"]
+        tally: "MenuVoteTally"
         id: int
 
 
+# The text search configuration of the menu items.
+SEARCH_CONFIG = "english"
+
+
+class MenuItemQuerySet(models.QuerySet):
+    """Custom queryset for the 'MenuItem' model."""
+
+    def _is_postgres(self) -> bool:
+        return connections[self.db].vendor == "postgresql"
+
+    def update_search_vector(self) -> int:
+        """Recompute the search vectors of the items from their texts.
+
+        Must be called after the titles or the descriptions are changed
+        by the bulk operations. No-op on the DBs other than PostgreSQL.
+        """
+        if not self._is_postgres():
+            return 0
+        return self.update(search_vector=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ))
+
+    def search(self, text: str) -> "MenuItemQuerySet":
+        """Return the items with the title or the description matching the text.
+
+        PostgreSQL uses the full-text search over the indexed search vector
+        (the web search syntax). The other DBs fall back to a case-insensitive
+        substring search requiring all the words to be present.
+        """
+        if self._is_postgres():
+            return self.filter(search_vector=SearchQuery(
+                text, search_type="websearch", config=SEARCH_CONFIG,
+            ))
+        condition = Q()
+        for word in text.split():
+            condition &= Q(title__icontains=word) | Q(description__icontains=word)
+        return self.filter(condition)
+
+
 class MenuItem(BaseReprAndStr, models.Model):
     """An item for a menu.
 
@@ -111,6 +185,49 @@ class MenuItem(BaseReprAndStr, models.Model):
                                    related_name="menu_items")
     title = models.CharField()
     description = models.TextField()
+    last_modified = models.DateTimeField(auto_now=True)
+    # The full-text search document of the title and the description,
+    # it's maintained on PostgreSQL only.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = MenuItemQuerySet.as_manager()
+
+    class Meta:  # noqa: D106
+        constraints = (
+            models.UniqueConstraint(fields=("restaurant", "title"),
+                                    name="unique_restaurant_item_title"),
+        )
+        indexes = (
+            GinIndex(fields=("search_vector",), name="menuitem_search_vector_idx"),
+        )
+
+
+class VoteQuerySet(models.QuerySet):
+    """QuerySet for the votes."""
+
+    def bulk_create_counted(self, votes: list["Vote"]) -> list["Vote"]:
+        """Insert the votes with a single query and count them in the menu tallies.
+
+        Return the inserted votes, the rest of the votes are left without 'pk'.
+        """
+        try:
+            with transaction.atomic():
+                self.bulk_create(votes)
+                add_votes_to_tallies(votes)
+        except IntegrityError:
+            # Some of these votes were inserted concurrently,
+            # falling back to inserting the votes one by one.
+            created = []
+            for vote in votes:
+                vote.pk = None
+                try:
+                    with transaction.atomic():
+                        vote.save()
+                except IntegrityError:
+                    continue
+                created.append(vote)
+            return created
+        return votes
 
 
 class Vote(models.Model):
@@ -125,8 +242,19 @@ class Vote(models.Model):
     like = models.BooleanField()
     voted_at = models.DateTimeField(auto_now_add=True)
 
+    objects = VoteQuerySet.as_manager()
+
     if TYPE_CHECKING:
         id: int
+        menu_id: int
+        employee_id: int
+
+    class Meta:  # noqa: D106
+        constraints = (
+            # An employee can vote for a menu only once.
+            models.UniqueConstraint(fields=("menu", "employee"),
+                                    name="unique_menu_employee_vote"),
+        )
 
     def __repr__(self) -> str:  # noqa: D105
         return (f"<Vote: Employee={self.employee.id}, "
@@ -135,3 +263,157 @@ class Vote(models.Model):
     def __str__(self) -> str:  # noqa: D105
         action = "likes" if self.like else "dislikes"
         return f"{self.employee} {action} '{self.menu}'"
+
+
+class VoteTallyQuerySet(models.QuerySet):
+    """QuerySet with the atomic counter update for vote tallies."""
+
+    def increment(self, likes: int = 0, dislikes: int = 0, **lookup: object) -> None:
+        """Add 'likes' and 'dislikes' to the tally matching 'lookup'.
+
+        The counters are changed with a single UPDATE statement.
+        The tally row is created only when it doesn't exist yet.
+        """
+        changes = {
+            "likes": F("likes") + likes,
+            "dislikes": F("dislikes") + dislikes,
+            "updated_at": timezone.now(),
+        }
+        if self.filter(**lookup).update(**changes):
+            return
+        try:
+            # Savepoint, so a concurrent insert of the same tally
+            # doesn't break the outer transaction.
+            with transaction.atomic():
+                self.create(likes=likes, dislikes=dislikes, **lookup)
+        except IntegrityError:
+            self.filter(**lookup).update(**changes)
+
+    def decrement(self, likes: int = 0, dislikes: int = 0, **lookup: object) -> None:
+        """Subtract 'likes' and 'dislikes' from the tally matching 'lookup'."""
+        self.filter(**lookup).update(
+            likes=F("likes") - likes,
+            dislikes=F("dislikes") - dislikes,
+            updated_at=timezone.now(),
+        )
+
+
+class VoteTally(models.Model):
+    """Base class for the precomputed likes/dislikes counters."""
+
+    likes = models.PositiveIntegerField(default=0)
+    dislikes = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = VoteTallyQuerySet.as_manager()
+
+    class Meta:  # noqa: D106
+        abstract = True
+
+
+class MenuVoteTally(VoteTally):
+    """Likes/dislikes counters of a menu.
+
+    The tally is maintained on each vote write,
+    so reading the results doesn't require counting the votes.
+    """
+
+    menu = models.OneToOneField(Menu,
+                                related_name="tally",
+                                on_delete=models.CASCADE)
+
+    def __str__(self) -> str:  # noqa: D105
+        return f"'{self.menu}': {self.likes} likes, {self.dislikes} dislikes"
+
+
+class RestaurantVoteTally(VoteTally):
+    """All-time likes/dislikes counters of a restaurant."""
+
+    restaurant = models.OneToOneField(Restaurant,
+                                      related_name="tally",
+                                      on_delete=models.CASCADE)
+
+    def __str__(self) -> str:  # noqa: D105
+        return f"'{self.restaurant}': {self.likes} likes, {self.dislikes} dislikes"
+
+
+class RestaurantDailyVoteTally(VoteTally):
+    """Likes/dislikes counters of a restaurant for the menus of a day."""
+
+    restaurant = models.ForeignKey(Restaurant,
+                                   related_name="daily_tallies",
+                                   on_delete=models.CASCADE)
+    # The launch date of the voted menus.
+    date = models.DateField(db_index=True)
+
+    class Meta:  # noqa: D106
+        constraints = (
+            models.UniqueConstraint(fields=("restaurant", "date"),
+                                    name="unique_restaurant_daily_tally"),
+        )
+
+    def __str__(self) -> str:  # noqa: D105
+        return (f"{self.date} '{self.restaurant}': "
+                f"{self.likes} likes, {self.dislikes} dislikes")
+
+
+def _count_votes(votes: "Iterable[Vote]") -> tuple[dict, dict, dict]:
+    """Count likes/dislikes of the votes per menu, restaurant and restaurant day."""
+    menus: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    restaurants: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    restaurant_days: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    for vote in votes:
+        i = 0 if vote.like else 1
+        menus[vote.menu_id][i] += 1
+        restaurants[vote.menu.restaurant_id][i] += 1
+        restaurant_days[(vote.menu.restaurant_id, vote.menu.launch_date)][i] += 1
+    return menus, restaurants, restaurant_days
+
+
+def add_votes_to_tallies(votes: "Iterable[Vote]") -> None:
+    """Count the new votes in the tallies of their menus and restaurants."""
+    menus, restaurants, restaurant_days = _count_votes(votes)
+    for menu_id, (likes, dislikes) in menus.items():
+        MenuVoteTally.objects.increment(likes, dislikes, menu_id=menu_id)
+    for restaurant_id, (likes, dislikes) in restaurants.items():
+        RestaurantVoteTally.objects.increment(likes, dislikes,
+                                              restaurant_id=restaurant_id)
+    for (restaurant_id, date), (likes, dislikes) in restaurant_days.items():
+        RestaurantDailyVoteTally.objects.increment(
+            likes, dislikes, restaurant_id=restaurant_id, date=date,
+        )
+
+
+def remove_votes_from_tallies(votes: "Iterable[Vote]") -> None:
+    """Discount the deleted votes from the tallies of their menus and restaurants."""
+    menus, restaurants, restaurant_days = _count_votes(votes)
+    for menu_id, (likes, dislikes) in menus.items():
+        MenuVoteTally.objects.decrement(likes, dislikes, menu_id=menu_id)
+    for restaurant_id, (likes, dislikes) in restaurants.items():
+        RestaurantVoteTally.objects.decrement(likes, dislikes,
+                                              restaurant_id=restaurant_id)
+    for (restaurant_id, date), (likes, dislikes) in restaurant_days.items():
+        RestaurantDailyVoteTally.objects.decrement(
+            likes, dislikes, restaurant_id=restaurant_id, date=date,
+        )
+
+
+class DailyMenuResult(models.Model):
+    """Finalized vote results of a menu for its launch date.
+
+    The rows are written by the 'finalize_daily_results' command,
+    so the historical results are read without scanning the votes.
+    """
+
+    menu = models.OneToOneField(Menu,
+                                related_name="daily_result",
+                                on_delete=models.CASCADE)
+    # The copy of the 'Menu.launch_date' for the range queries without join.
+    date = models.DateField(db_index=True)
+    likes = models.PositiveIntegerField()
+    dislikes = models.PositiveIntegerField()
+    finalized_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # noqa: D105
+        return (f"{self.date} '{self.menu}': "
+                f"{self.likes} likes, {self.dislikes} dislikes")
@@ -0,0 +1,96 @@
+"""Signal handlers keeping the denormalized data in sync.
+
+The vote tallies follow the votes, the search vectors follow the menu items.
+The menu snapshots are cleared when the menus or their items change,
+'api.serializers.create_menus' rebuilds them with the bulk queries itself.
+"""
+from typing import Any
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from base.models import (
+    Menu,
+    MenuItem,
+    Vote,
+    add_votes_to_tallies,
+    remove_votes_from_tallies,
+)
+
+
+@receiver(pre_save, sender=Vote)
+def remember_previous_vote(sender: type[Vote], instance: Vote,
+                           update_fields: frozenset[str] | None,
+                           **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Keep the stored state of the updated vote to fix the tallies after saving."""
+    if instance._state.adding or (  # noqa: SLF001
+            update_fields is not None and not {"like", "menu"} & update_fields):
+        return
+    instance._previous_vote = (  # pyright: ignore[reportAttributeAccessIssue]  # noqa: SLF001
+        sender.objects.select_related("menu").filter(pk=instance.pk).first()
+    )
+
+
+@receiver(post_save, sender=Vote)
+def add_vote_to_tally(sender: type[Vote], instance: Vote,  # noqa: ARG001
+                      created: bool, **kwargs: Any) -> None:  # noqa: ANN401, ARG001, FBT001
+    """Count the new vote in the tallies, move the updated one."""
+    if created:
+        add_votes_to_tallies([instance])
+        return
+    previous = instance.__dict__.pop("_previous_vote", None)
+    if previous is not None and (
+            (previous.like, previous.menu_id) != (instance.like, instance.menu_id)):
+        remove_votes_from_tallies([previous])
+        add_votes_to_tallies([instance])
+
+
+@receiver(post_delete, sender=Vote)
+def remove_vote_from_tally(sender: type[Vote], instance: Vote,  # noqa: ARG001
+                           **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Discount the deleted vote from the tallies."""
+    remove_votes_from_tallies([instance])
+
+
+@receiver(post_save, sender=MenuItem)
+def update_item_search_vector(sender: type[MenuItem], instance: MenuItem,
+                              **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Recompute the search vector of the saved item."""
+    sender.objects.filter(pk=instance.pk).update_search_vector()
+    Menu.objects.filter(items=instance).update(snapshot=None)
+
+
+@receiver(pre_delete, sender=MenuItem)
+def clear_item_menus_snapshots(sender: type[MenuItem], instance: MenuItem,  # noqa: ARG001
+                               **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Clear the snapshots of the menus of the deleted item."""
+    Menu.objects.filter(items=instance).update(snapshot=None)
+
+
+@receiver(post_save, sender=Menu)
+def clear_menu_snapshot(sender: type[Menu], instance: Menu,
+                        created: bool, **kwargs: Any) -> None:  # noqa: ANN401, ARG001, FBT001
+    """Clear the snapshot of the updated menu."""
+    if not created:
+        sender.objects.filter(pk=instance.pk).update(snapshot=None)
+
+
+@receiver(m2m_changed, sender=MenuItem.menu.through)
+def clear_linked_menus_snapshots(sender: type, instance: Menu | MenuItem,  # noqa: ARG001
+                                 action: str, pk_set: set[int] | None,
+                                 **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+    """Clear the snapshots of the menus which items were added or removed."""
+    if action == "pre_clear" and isinstance(instance, MenuItem):
+        # The menus of the item are unknown after the clearing.
+        Menu.objects.filter(items=instance).update(snapshot=None)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if isinstance(instance, Menu):
+            Menu.objects.filter(pk=instance.pk).update(snapshot=None)
+        elif pk_set:
+            Menu.objects.filter(pk__in=pk_set).update(snapshot=None)
@@ -0,0 +1,5 @@
+"""Benchmarks of the API.
+
+Run them from the directory with the 'manage.py', e.g.:
+    python -m benchmarks.async_views
+"""
@@ -0,0 +1,92 @@
+"""Compare the sync and the async read endpoints under the ASGI application.
+
+Usage (from the directory with the 'manage.py'):
+    python -m benchmarks.async_views [--requests N] [--concurrency 1 10 50]
+
+The requests are sent to the ASGI application in-process, so the numbers
+show the cost of the views and the DB access, not of the network.
+"""
+import argparse
+import asyncio
+import importlib
+
+from benchmarks.utils import load, setup_django, test_database
+
+ENDPOINTS = (
+    "/api/menu/1/",
+    "/api/menu/{today}/",
+    "/api/restaurant/1/",
+    "/api/employee/1/",
+    "/api/vote/results/",
+)
+
+
+def populate(menus: int) -> dict:
+    """Fill the DB and return the auth header of the admin."""
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from base.models import Employee, Menu, Restaurant, Vote
+
+    admin = User.objects.create_superuser("admin", "admin@mail.com", "password")
+    employee = Employee.objects.create(
+        user=User.objects.create(username="employee"),
+        first_name="John", last_name="Doe",
+    )
+    today = timezone.now().date()
+    for i in range(menus):
+        restaurant = Restaurant.objects.create(
+            user=User.objects.create(username=f"restaurant{i}"),
+            name=f"Restaurant#{i}",
+        )
+        menu = Menu.objects.create(restaurant=restaurant, launch_date=today)
+        for j in range(5):
+            menu.items.create(restaurant=restaurant, title=f"Item#{i}_{j}",
+                              description="Description")
+        Vote.objects.create(menu=menu, employee=employee, like=i % 2 == 0)
+
+    access = str(RefreshToken.for_user(admin).access_token)
+    return {"today": today.isoformat(), "auth": ("Bearer " + access).encode()}
+
+
+def get_application(async_views: bool) -> object:  # noqa: FBT001
+    """Build the ASGI application with the sync or the async read views."""
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+    from django.urls import clear_url_caches
+
+    settings.API_ASYNC_VIEWS = async_views
+    importlib.reload(importlib.import_module("api.urls"))
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+    return get_asgi_application()
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--menus", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        data = populate(args.menus)
+        headers = [(b"authorization", data["auth"])]
+        print(f"{'endpoint':<26}{'views':>6}{'conc.':>6}"
+              f"{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+        for path in ENDPOINTS:
+            path = path.format(today=data["today"])  # noqa: PLW2901
+            for async_views in (False, True):
+                app = get_application(async_views)
+                for concurrency in args.concurrency:
+                    r = asyncio.run(load(app, path, concurrency, args.requests,
+                                         headers))
+                    views = "async" if async_views else "sync"
+                    print(f"{path:<26}{views:>6}{concurrency:>6}"
+                          f"{r['rps']:>10.0f}{r['p50']:>9.2f}{r['p99']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
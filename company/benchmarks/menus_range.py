@@ -0,0 +1,94 @@
+"""Compare loading a week of menus day by day and by the date range request.
+
+Usage (from the directory with the 'manage.py'):
+    python -m benchmarks.menus_range [--restaurants N] [--repeat N]
+
+The cache is cleared before each request, so the numbers show the cost
+of the cold (not cached) requests.
+"""
+import argparse
+import datetime
+from time import perf_counter
+
+from benchmarks.utils import setup_django, test_database
+
+DAYS = 7
+
+
+def populate(restaurants: int, first_day: datetime.date) -> None:
+    """Refill the DB with a week of menus for each restaurant."""
+    from django.contrib.auth.models import User
+
+    from base.models import Menu, MenuItem, Restaurant
+
+    User.objects.all().delete()
+    for i in range(restaurants):
+        restaurant = Restaurant.objects.create(
+            user=User.objects.create(username=f"restaurant{i}"),
+            name=f"Restaurant#{i}",
+        )
+        items = MenuItem.objects.bulk_create(
+            MenuItem(restaurant=restaurant, title=f"Item#{i}_{j}",
+                     description="Description")
+            for j in range(5)
+        )
+        menus = Menu.objects.bulk_create(
+            Menu(restaurant=restaurant,
+                 launch_date=first_day + datetime.timedelta(days=day))
+            for day in range(DAYS)
+        )
+        for item in items:
+            item.menu.add(*menus)
+
+
+def measure(paths: list[str], repeat: int) -> dict:
+    """Return the requests, the queries and the time of loading the paths."""
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    elapsed = 0.0
+    queries = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            for path in paths:
+                cache.clear()
+                start = perf_counter()
+                response = client.get(path)
+                elapsed += perf_counter() - start
+                if response.status_code != 200:  # noqa: PLR2004
+                    msg = f"{path} responded with {response.status_code}"
+                    raise RuntimeError(msg)
+        queries = len(ctx.captured_queries)
+    return {"requests": len(paths), "queries": queries,
+            "ms": elapsed / repeat * 1000}
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--restaurants", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    first_day = datetime.date(2025, 10, 13)
+    last_day = first_day + datetime.timedelta(days=DAYS - 1)
+    print(f"{'restaurants':<12}{'mode':<8}{'requests':>9}{'queries':>9}{'ms':>9}")
+    modes = {
+        "by day": [f"/api/menu/{first_day + datetime.timedelta(days=day)}/"
+                   for day in range(DAYS)],
+        "range": [f"/api/menu/?from={first_day}&to={last_day}"],
+    }
+    with test_database():
+        for restaurants in args.restaurants:
+            populate(restaurants, first_day)
+            for mode, paths in modes.items():
+                r = measure(paths, args.repeat)
+                print(f"{restaurants:<12}{mode:<8}{r['requests']:>9}"
+                      f"{r['queries']:>9}{r['ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
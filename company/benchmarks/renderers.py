@@ -0,0 +1,72 @@
+"""Compare the DRF JSON renderer and parser with the 'orjson' based ones.
+
+Usage (from the directory with the 'manage.py'):
+    python -m benchmarks.renderers [--menus N] [--number N]
+
+The payload is the response of the menus endpoint with N menus.
+"""
+import argparse
+import io
+
+from benchmarks.utils import setup_django, test_database, timeit
+
+
+def build_payload(menus: int) -> list[dict]:
+    """Create the menus with 5 items each and return their representation."""
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from api.fast_serializers import menu_serializer
+    from base.models import Menu, MenuItem, Restaurant
+
+    today = timezone.now().date()
+    for i in range(menus):
+        restaurant = Restaurant.objects.create(
+            user=User.objects.create(username=f"restaurant{i}"),
+            name=f"Restaurant#{i}",
+        )
+        menu = Menu.objects.create(restaurant=restaurant, launch_date=today,
+                                   title=f"Menu#{i}", notes="Notes")
+        menu.items.add(*MenuItem.objects.bulk_create(
+            MenuItem(restaurant=restaurant, title=f"Item#{i}_{j}",
+                     description="Description of the item")
+            for j in range(5)
+        ))
+    return menu_serializer.serialize(Menu.objects.all())
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--menus", type=int, default=500)
+    parser.add_argument("--number", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import ORJSONParser
+    from api.renderers import ORJSONRenderer, orjson
+
+    if orjson is None:
+        print("'orjson' is not installed, both implementations are the same")
+    with test_database():
+        payload = build_payload(args.menus)
+    body = JSONRenderer().render(payload)
+    print(f"The payload of {args.menus} menus - {len(body) / 1024:.0f} KiB")
+    print(f"{'':<8}{'DRF ops/s':>12}{'orjson ops/s':>15}{'speedup':>9}")
+    cases = {
+        "render": (lambda: JSONRenderer().render(payload),
+                   lambda: ORJSONRenderer().render(payload)),
+        "parse": (lambda: JSONParser().parse(io.BytesIO(body)),
+                  lambda: ORJSONParser().parse(io.BytesIO(body))),
+    }
+    for name, (drf, fast) in cases.items():
+        drf_rate = timeit(drf, args.number)
+        fast_rate = timeit(fast, args.number)
+        print(f"{name:<8}{drf_rate:>12.0f}{fast_rate:>15.0f}"
+              f"{fast_rate / drf_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare the model serializers with the fast row serializers.
+
+Usage (from the directory with the 'manage.py'):
+    python -m benchmarks.serializers [--menus N] [--number N]
+
+Both implementations load the objects from the DB and build the data,
+the numbers are serialized objects per second.
+"""
+import argparse
+
+from benchmarks.utils import setup_django, test_database, timeit
+
+
+def populate(menus: int) -> None:
+    """Fill the DB with the menus with 5 items each."""
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from base.models import Employee, Menu, MenuItem, Restaurant
+
+    today = timezone.now().date()
+    for i in range(menus):
+        restaurant = Restaurant.objects.create(
+            user=User.objects.create(username=f"restaurant{i}"),
+            name=f"Restaurant#{i}",
+        )
+        Employee.objects.create(user=User.objects.create(username=f"employee{i}"),
+                                first_name="John", last_name="Doe")
+        menu = Menu.objects.create(restaurant=restaurant, launch_date=today)
+        menu.items.add(*MenuItem.objects.bulk_create(
+            MenuItem(restaurant=restaurant, title=f"Item#{i}_{j}",
+                     description="Description")
+            for j in range(5)
+        ))
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--menus", type=int, default=500)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from api import fast_serializers, serializers
+    from base.models import Employee, Menu, Restaurant
+
+    cases = {
+        "Menu": (
+            lambda: serializers.MenuSerializer(Menu.objects.for_read(), many=True).data,
+            lambda: fast_serializers.menu_serializer.serialize(Menu.objects.all()),
+        ),
+        "Restaurant": (
+            lambda: serializers.RestaurantSerializer(Restaurant.objects.all(),
+                                                     many=True).data,
+            lambda: fast_serializers.restaurant_serializer.serialize(
+                Restaurant.objects.all(),
+            ),
+        ),
+        "Employee": (
+            lambda: serializers.EmployeeSerializer(Employee.objects.all(),
+                                                   many=True).data,
+            lambda: fast_serializers.employee_serializer.serialize(
+                Employee.objects.all(),
+            ),
+        ),
+    }
+    with test_database():
+        populate(args.menus)
+        print(f"{'model':<12}{'serializer obj/s':>18}{'fast obj/s':>14}{'speedup':>9}")
+        for model, (slow, fast) in cases.items():
+            slow_rate = timeit(slow, args.number) * args.menus
+            fast_rate = timeit(fast, args.number) * args.menus
+            print(f"{model:<12}{slow_rate:>18.0f}{fast_rate:>14.0f}"
+                  f"{fast_rate / slow_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
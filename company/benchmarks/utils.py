@@ -0,0 +1,106 @@
+"""Helpers shared by the benchmarks."""
+import asyncio
+import os
+import statistics
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+import django
+
+
+def setup_django() -> None:
+    """Configure Django with the test settings by default."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "company.settings_tests")
+    django.setup()
+
+
+@contextmanager
+def test_database() -> Iterator[None]:
+    """Create an empty test DB for the duration of the benchmark."""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+async def asgi_get(app: object, path: str,
+                   headers: list[tuple[bytes, bytes]] | None = None) -> int:
+    """Send a GET request to the ASGI application and return the status code."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), *(headers or [])],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    request_sent = False
+    response_status = 0
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects, the handler cancels this wait.
+        await asyncio.Future()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+
+    await app(scope, receive, send)  # pyright: ignore[reportCallIssue]
+    return response_status
+
+
+async def load(app: object, path: str, concurrency: int, requests: int,
+               headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    """Send 'requests' GET requests with 'concurrency' in-flight at a time."""
+    latencies: list[float] = []
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in queue:
+            start = perf_counter()
+            status = await asgi_get(app, path, headers)
+            latencies.append(perf_counter() - start)
+            if status != 200:  # noqa: PLR2004
+                msg = f"{path} responded with {status}"
+                raise RuntimeError(msg)
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def timeit(func: object, number: int) -> float:
+    """Return how many times per second the function can be called."""
+    start = perf_counter()
+    for _ in range(number):
+        func()  # pyright: ignore[reportCallIssue]
+    return number / (perf_counter() - start)
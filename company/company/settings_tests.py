@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.postgres',
 
     'base',
+    'api',
     'rest_framework',
     'rest_framework_simplejwt',
 ]
@@ -117,15 +118,67 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    # 'orjson' is used if it's installed, otherwise the stdlib 'json'.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=5),
+    # The tokens carry the role claims ('employee_id', 'restaurant_id', 'is_staff'),
+    # the revoked tokens are kept in the cache deny-list (see 'api.authentication').
+    "TOKEN_OBTAIN_SERIALIZER": "api.authentication.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.authentication.RoleTokenRefreshSerializer",
 }
 
+# How long the access tokens with the role claims live. The revocation
+# of the claims reaches only the processes sharing the cache, so the stale
+# claims are accepted by the rest until the token expires.
+AUTH_ROLE_ACCESS_TOKEN_LIFETIME = timedelta(minutes=5)
+
+# For how many seconds the authenticated user (with its employee/restaurant)
+# is cached by the user ID and the token 'jti'. 0 disables the cache.
+AUTH_USER_CACHE_TIMEOUT = 60
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+# For how many seconds the cached vote results can be served.
+# 0 - the results are cached until a new vote invalidates them.
+# N - the results are not invalidated by votes, they are refreshed
+#     at most once per N seconds.
+VOTE_RESULTS_MAX_STALENESS = 0
+
+# The minimal interval (seconds) between two events
+# of the vote results stream.
+VOTE_RESULTS_STREAM_INTERVAL = 1
+
+# Write-behind mode for the votes: the accepted votes are kept in memory
+# and inserted in batches every FLUSH_INTERVAL_MS milliseconds
+# or as soon as MAX_BATCH_SIZE votes are pending.
+VOTE_WRITE_BEHIND = {
+    "ENABLED": False,
+    "FLUSH_INTERVAL_MS": 200,
+    "MAX_BATCH_SIZE": 500,
+}
+
+# Serve the read endpoints (employee, restaurant, menus and vote results)
+# with the async views. Makes sense only under an ASGI server.
+API_ASYNC_VIEWS = False
+
 # =========================================================================
 # =          These are settings for testing purposes only!                =
 # =========================================================================
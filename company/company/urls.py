@@ -18,9 +18,12 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from api.views.token import revoke_tokens
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name="token_obtain"),
     path('api/token/refresh/', TokenRefreshView.as_view(), name="token_refresh"),
+    path('api/token/revoke/', revoke_tokens, name="token_revoke"),
 ]